@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class AuthVersion(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_constraint=False,
+        related_name="+",
+        verbose_name="Usuário",
+    )
+    version = models.BigIntegerField(verbose_name="Versão")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Versão de Autenticação"
+        verbose_name_plural = "Versões de Autenticação"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.version}"
@@ -0,0 +1,22 @@
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from parking_service.authentication import AUTH_VERSION_CLAIM, issue_auth_version
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        try:
+            customer_id = user.customer.id
+        except ObjectDoesNotExist:
+            customer_id = None
+
+        token["username"] = user.get_username()
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token["customer_id"] = customer_id
+        token["perms"] = [] if user.is_superuser else sorted(user.get_all_permissions())
+        token[AUTH_VERSION_CLAIM] = issue_auth_version(user.pk)
+        return token
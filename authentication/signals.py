@@ -0,0 +1,66 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from customers.models import Customer
+from parking_service.authentication import bump_auth_version
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields == frozenset({"last_login"}):
+        return
+    bump_auth_version(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    bump_auth_version(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        bump_auth_version(instance.pk)
+    elif action == "pre_clear":
+        bump_auth_version(*instance.user_set.values_list("pk", flat=True))
+    else:
+        bump_auth_version(*pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    groups = [instance.pk] if not reverse else pk_set
+    if reverse and action == "pre_clear":
+        groups = instance.group_set.values_list("pk", flat=True)
+    bump_auth_version(
+        *User.objects.filter(groups__in=groups).values_list("pk", flat=True).distinct()
+    )
+
+
+@receiver(pre_save, sender=Customer)
+def remember_customer_user(sender, instance, **kwargs):
+    instance._previous_user_id = (
+        Customer.objects.filter(pk=instance.pk)
+        .values_list("user_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Customer)
+def customer_saved(sender, instance, **kwargs):
+    previous_user_id = getattr(instance, "_previous_user_id", None)
+    if previous_user_id != instance.user_id:
+        bump_auth_version(previous_user_id, instance.user_id)
+
+
+@receiver(post_delete, sender=Customer)
+def customer_deleted(sender, instance, **kwargs):
+    bump_auth_version(instance.user_id)
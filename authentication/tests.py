@@ -0,0 +1,222 @@
+import pytest
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import AuthVersion
+from customers.models import Customer
+from parking_service.authentication import ClaimsUser
+from vehicles.models import Vehicle
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def customer_user():
+    user = User.objects.create_user(username="cliente", password="password")
+    user.user_permissions.add(Permission.objects.get(codename="add_vehicle"))
+    customer = Customer.objects.create(name="Cliente", user=user)
+    return user, customer
+
+
+def obtain_token(username="cliente", password="password"):
+    response = APIClient().post(
+        "/api/v1/authentication/token/",
+        {"username": username, "password": password},
+        format="json",
+    )
+    assert response.status_code == 200
+    return response.data["access"]
+
+
+def bearer(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.mark.django_db
+def test_token_carries_authorization_claims(customer_user):
+    user, customer = customer_user
+
+    token = AccessToken(obtain_token())
+
+    assert token["user_id"] == str(user.id)
+    assert token["is_staff"] is False
+    assert token["customer_id"] == customer.id
+    assert token["perms"] == ["vehicles.add_vehicle"]
+    assert token["auth_version"]
+
+    claims_user = ClaimsUser(token)
+    assert claims_user.has_perms(["vehicles.add_vehicle"])
+    assert not claims_user.has_perm("vehicles.delete_vehicle")
+
+
+@pytest.mark.django_db
+def test_claims_token_skips_user_query(customer_user):
+    user, customer = customer_user
+    other = Customer.objects.create(name="Outro")
+    Vehicle.objects.create(license_plate="OWN1234", owner=customer)
+    Vehicle.objects.create(license_plate="OTH1234", owner=other)
+    client = bearer(obtain_token())
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/v1/vehicles/")
+
+    assert response.status_code == 200
+    assert [v["license_plate"] for v in response.data["results"]] == ["OWN1234"]
+    assert len(queries) == 1
+    assert "auth_user" not in queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_claims_permissions_gate_writes(customer_user):
+    client = bearer(obtain_token())
+
+    response = client.post(
+        "/api/v1/vehicles/", {"license_plate": "NEW1234"}, format="json"
+    )
+    assert response.status_code == 201
+
+    response = client.delete(f"/api/v1/vehicles/{response.data['id']}/")
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda user: user.user_permissions.clear(),
+        lambda user: Group.objects.create(name="Operadores").user_set.add(user),
+        lambda user: setattr(user, "is_active", False) or user.save(),
+        lambda user: user.set_password("nova-senha") or user.save(),
+    ],
+)
+def test_user_changes_revoke_tokens(customer_user, change):
+    user, _ = customer_user
+    client = bearer(obtain_token())
+    assert client.get("/api/v1/vehicles/").status_code == 200
+
+    change(user)
+
+    response = client.get("/api/v1/vehicles/")
+    assert response.status_code == 403
+    assert response.data["detail"].code == "token_revoked"
+
+
+@pytest.mark.django_db
+def test_group_permission_change_revokes_members(customer_user):
+    user, _ = customer_user
+    group = Group.objects.create(name="Operadores")
+    user.groups.add(group)
+    client = bearer(obtain_token())
+
+    group.permissions.add(Permission.objects.get(codename="delete_vehicle"))
+
+    assert client.get("/api/v1/vehicles/").status_code == 403
+    token = AccessToken(obtain_token())
+    assert "vehicles.delete_vehicle" in token["perms"]
+
+
+@pytest.mark.django_db
+def test_login_does_not_revoke_tokens(customer_user):
+    client = bearer(obtain_token())
+    APIClient().login(username="cliente", password="password")
+    assert client.get("/api/v1/vehicles/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_auth_version_survives_cache_loss(customer_user):
+    client = bearer(obtain_token())
+    cache.clear()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/v1/vehicles/")
+
+    assert response.status_code == 200
+    assert not any("auth_user" in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+def test_revocation_from_another_worker_is_seen_after_cache_expiry(customer_user):
+    user, _ = customer_user
+    client = bearer(obtain_token())
+    assert client.get("/api/v1/vehicles/").status_code == 200
+
+    AuthVersion.objects.filter(user=user).update(version=F("version") + 1)
+    cache.clear()
+
+    response = client.get("/api/v1/vehicles/")
+    assert response.status_code == 403
+    assert response.data["detail"].code == "token_revoked"
+
+
+@pytest.mark.django_db
+def test_missing_auth_version_falls_back_to_database_user(customer_user):
+    client = bearer(obtain_token())
+    AuthVersion.objects.all().delete()
+    cache.clear()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/v1/vehicles/")
+
+    assert response.status_code == 200
+    assert any("auth_user" in query["sql"] for query in queries)
+
+
+@pytest.fixture
+def session_client(customer_user):
+    client = APIClient()
+    client.login(username="cliente", password="password")
+    return client
+
+
+def permission_queries(queries):
+    return [query for query in queries if "auth_permission" in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_model_permissions_are_cached_per_user(customer_user, session_client):
+    assert (
+        session_client.post(
+            "/api/v1/vehicles/", {"license_plate": "PRM1234"}, format="json"
+        ).status_code
+        == 201
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = session_client.post(
+            "/api/v1/vehicles/", {"license_plate": "PRM5678"}, format="json"
+        )
+
+    assert response.status_code == 201
+    assert permission_queries(queries) == []
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("through_group", [False, True])
+def test_permission_changes_invalidate_cached_permissions(
+    customer_user, session_client, through_group
+):
+    user, customer = customer_user
+    vehicle = Vehicle.objects.create(license_plate="DEL1234", owner=customer)
+    assert session_client.delete(f"/api/v1/vehicles/{vehicle.id}/").status_code == 403
+
+    permission = Permission.objects.get(codename="delete_vehicle")
+    if through_group:
+        group = Group.objects.create(name="Operadores")
+        group.permissions.add(permission)
+        user.groups.add(group)
+    else:
+        user.user_permissions.add(permission)
+
+    assert session_client.delete(f"/api/v1/vehicles/{vehicle.id}/").status_code == 204
@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+
+import django
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Gera dados de carga e executa cenários de entrada/saída.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Gera a massa de dados.")
+    generate.add_argument("--spots", type=int, default=500)
+    generate.add_argument("--customers", type=int, default=1000)
+    generate.add_argument("--vehicles", type=int, default=2000)
+    generate.add_argument("--years", type=float, default=1)
+    generate.add_argument("--visits-per-day", type=int, default=200)
+    generate.add_argument("--occupancy", type=float, default=0.3)
+    generate.add_argument("--prefix", default="BM")
+    generate.add_argument("--seed", type=int, default=42)
+
+    run = subparsers.add_parser("run", help="Executa o cenário de portaria.")
+    run.add_argument("--transport", choices=["client", "http"], default="client")
+    run.add_argument("--base-url", default="http://127.0.0.1:8000")
+    run.add_argument("--token", help="Token JWT de acesso (padrão: usuário benchmark).")
+    run.add_argument("--operations", type=int, default=1000)
+    run.add_argument("--concurrency", type=int, default=1)
+    run.add_argument("--check-in", type=float, default=0.35)
+    run.add_argument("--check-out", type=float, default=0.35)
+    run.add_argument("--plate-lookup", type=float, default=0.3)
+    run.add_argument("--prefix", default="BM")
+    run.add_argument("--seed", type=int)
+    run.add_argument("--output", help="Arquivo onde gravar o relatório JSON.")
+    return parser
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "parking_service.settings")
+    django.setup()
+
+    if options.command == "generate":
+        from .data import generate_dataset
+
+        result = generate_dataset(
+            spots=options.spots,
+            customers=options.customers,
+            vehicles=options.vehicles,
+            years=options.years,
+            visits_per_day=options.visits_per_day,
+            occupancy=options.occupancy,
+            prefix=options.prefix,
+            seed=options.seed,
+        )
+    else:
+        from .runner import run
+
+        result = run(
+            transport=options.transport,
+            operations=options.operations,
+            concurrency=options.concurrency,
+            base_url=options.base_url,
+            token=options.token,
+            prefix=options.prefix,
+            mix={
+                "check_in": options.check_in,
+                "check_out": options.check_out,
+                "plate_lookup": options.plate_lookup,
+            },
+            seed=options.seed,
+        )
+
+    output = json.dumps(result, indent=2)
+    if getattr(options, "output", None):
+        with open(options.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from customers.models import Customer
+from parking.models import ParkingRecord, ParkingSpot
+from parking.occupancy import spot_occupancy
+from parking.pricing import duration_seconds
+from parking.reports import rebuild_hourly_stats
+from vehicles.models import Vehicle, VehicleType
+from vehicles.plates import normalize_plate
+
+BATCH_SIZE = 5000
+VEHICLE_TYPES = ["Carro", "Moto", "Caminhonete", "Utilitário"]
+
+
+def _bulk_insert(model, objects):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+
+def _history(rng, vehicle_ids, spot_ids, years, visits_per_day, now):
+    days = int(365 * years)
+    for day in range(days, 0, -1):
+        day_start = (now - timedelta(days=day)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        for _ in range(visits_per_day):
+            entry_time = day_start + timedelta(seconds=rng.randint(6 * 3600, 22 * 3600))
+            dwell = timedelta(seconds=rng.randint(10 * 60, 8 * 3600))
+            exit_time = min(entry_time + dwell, now)
+            yield ParkingRecord(
+                vehicle_id=rng.choice(vehicle_ids),
+                parking_spot_id=rng.choice(spot_ids),
+                entry_time=entry_time,
+                exit_time=exit_time,
+                duration_seconds=duration_seconds(entry_time, exit_time),
+            )
+
+
+def generate_dataset(
+    spots: int = 500,
+    customers: int = 1000,
+    vehicles: int = 2000,
+    years: float = 1,
+    visits_per_day: int = 200,
+    occupancy: float = 0.3,
+    prefix: str = "BM",
+    seed: int = 42,
+) -> dict:
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    with transaction.atomic():
+        vehicle_types = [
+            VehicleType.objects.get_or_create(name=name)[0] for name in VEHICLE_TYPES
+        ]
+
+        _bulk_insert(
+            ParkingSpot,
+            (ParkingSpot(spot_number=f"{prefix}{n:05d}") for n in range(spots)),
+        )
+        _bulk_insert(
+            Customer,
+            (Customer(name=f"Cliente {prefix} {n}") for n in range(customers)),
+        )
+        spot_ids = list(
+            ParkingSpot.objects.filter(spot_number__startswith=prefix).values_list(
+                "id", flat=True
+            )
+        )
+        customer_ids = list(
+            Customer.objects.filter(name__startswith=f"Cliente {prefix} ").values_list(
+                "id", flat=True
+            )
+        )
+
+        _bulk_insert(
+            Vehicle,
+            (
+                Vehicle(
+                    license_plate=f"{prefix}{n:06d}",
+                    plate_normalized=normalize_plate(f"{prefix}{n:06d}"),
+                    vehicle_type=rng.choice(vehicle_types),
+                    owner_id=rng.choice(customer_ids) if customer_ids else None,
+                    brand="Marca",
+                    model="Modelo",
+                    color="Prata",
+                )
+                for n in range(vehicles)
+            ),
+        )
+        vehicle_ids = list(
+            Vehicle.objects.filter(license_plate__startswith=prefix).values_list(
+                "id", flat=True
+            )
+        )
+
+        _bulk_insert(
+            ParkingRecord,
+            _history(rng, vehicle_ids, spot_ids, years, visits_per_day, now),
+        )
+
+        parked = min(int(spots * occupancy), len(vehicle_ids))
+        occupied_spots = rng.sample(spot_ids, parked)
+        parked_vehicles = rng.sample(vehicle_ids, parked)
+        _bulk_insert(
+            ParkingRecord,
+            (
+                ParkingRecord(
+                    vehicle_id=vehicle_id,
+                    parking_spot_id=spot_id,
+                    entry_time=now - timedelta(minutes=rng.randint(5, 600)),
+                )
+                for spot_id, vehicle_id in zip(
+                    occupied_spots, parked_vehicles, strict=True
+                )
+            ),
+        )
+        ParkingSpot.objects.filter(pk__in=occupied_spots).update(is_occupied=True)
+
+    rebuild_hourly_stats()
+    spot_occupancy.rebuild()
+
+    return {
+        "spots": len(spot_ids),
+        "customers": len(customer_ids),
+        "vehicles": len(vehicle_ids),
+        "records": ParkingRecord.objects.filter(
+            vehicle__license_plate__startswith=prefix
+        ).count(),
+        "open_records": parked,
+    }
@@ -0,0 +1,106 @@
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from .stats import summarize
+
+SCENARIOS = {
+    "spot_availability": (
+        "/api/v1/parking/spots/availability/",
+        "/api/v1/async/parking/spots/availability/",
+    ),
+    "plate_lookup": (
+        "/api/v1/vehicles/?license_plate={plate}",
+        "/api/v1/async/vehicles/by-plate/{plate}/",
+    ),
+    "record_detail": (
+        "/api/v1/parking/records/{record_id}/",
+        "/api/v1/async/parking/records/{record_id}/",
+    ),
+}
+
+
+def _request(url, token, timeout):
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+    except (urllib.error.URLError, TimeoutError):
+        return None
+    return time.perf_counter() - started
+
+
+def run_load(url, token, requests, concurrency, timeout=10):
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for latency in executor.map(
+            lambda _: _request(url, token, timeout), range(requests)
+        ):
+            if latency is None:
+                errors += 1
+            else:
+                latencies.append(latency)
+    return summarize(latencies, time.perf_counter() - started, errors=errors)
+
+
+def run(options):
+    params = {"plate": options.plate, "record_id": options.record_id}
+    results = {}
+    for name in options.scenarios:
+        sync_path, async_path = SCENARIOS[name]
+        results[name] = {
+            "sync": run_load(
+                options.sync_base_url.rstrip("/") + sync_path.format(**params),
+                options.token,
+                options.requests,
+                options.concurrency,
+            ),
+            "async": run_load(
+                options.async_base_url.rstrip("/") + async_path.format(**params),
+                options.token,
+                options.requests,
+                options.concurrency,
+            ),
+        }
+    return {
+        "sync_base_url": options.sync_base_url,
+        "async_base_url": options.async_base_url,
+        "concurrency": options.concurrency,
+        "requests_per_endpoint": options.requests,
+        "results": results,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Compara vazão e latência p99 dos endpoints síncronos e assíncronos."
+    )
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--sync-base-url")
+    parser.add_argument("--async-base-url")
+    parser.add_argument("--token", required=True, help="Token JWT de acesso.")
+    parser.add_argument("--plate", required=True)
+    parser.add_argument("--record-id", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS)
+    )
+    return parser
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    options.sync_base_url = options.sync_base_url or options.base_url
+    options.async_base_url = options.async_base_url or options.base_url
+    print(json.dumps(run(options), indent=2))
+
+
+if __name__ == "__main__":
+    main()
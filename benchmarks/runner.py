@@ -0,0 +1,251 @@
+import json
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from authentication.serializers import ClaimsTokenObtainPairSerializer
+from parking.models import ParkingRecord
+from vehicles.models import Vehicle
+
+from .stats import summarize
+
+API_PREFIX = "/api/v1"
+DEFAULT_MIX = {"check_in": 0.35, "check_out": 0.35, "plate_lookup": 0.3}
+
+
+class TestClientTransport:
+    name = "client"
+
+    def __init__(self, token):
+        host = next(
+            (h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")),
+            "localhost",
+        )
+        self._client = Client(HTTP_HOST=host, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def request(self, method, path, payload=None):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self._client.generic(
+                method,
+                API_PREFIX + path,
+                json.dumps(payload) if payload is not None else "",
+                content_type="application/json",
+            )
+            elapsed = time.perf_counter() - started
+        body = json.loads(response.content) if response.content else None
+        return response.status_code, body, elapsed, len(queries)
+
+
+class HttpTransport:
+    name = "http"
+
+    def __init__(self, base_url, token, timeout=10):
+        self._base_url = base_url.rstrip("/") + API_PREFIX
+        self._token = token
+        self._timeout = timeout
+
+    def request(self, method, path, payload=None):
+        request = urllib.request.Request(
+            self._base_url + path,
+            data=json.dumps(payload).encode() if payload is not None else None,
+            method=method,
+            headers={
+                "Authorization": f"Bearer {self._token}",
+                "Content-Type": "application/json",
+            },
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, content = e.code, e.read()
+        except (urllib.error.URLError, TimeoutError):
+            return None, None, time.perf_counter() - started, None
+        elapsed = time.perf_counter() - started
+        try:
+            body = json.loads(content) if content else None
+        except ValueError:
+            body = None
+        return status, body, elapsed, None
+
+
+class GateWorkflow:
+    def __init__(self, transport, prefix="BM", mix=None, seed=None):
+        self.transport = transport
+        self.mix = mix or DEFAULT_MIX
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        vehicles = dict(
+            Vehicle.objects.filter(license_plate__startswith=prefix).values_list(
+                "id", "license_plate"
+            )
+        )
+        self.parked = dict(
+            ParkingRecord.objects.filter(
+                exit_time__isnull=True, vehicle_id__in=vehicles
+            ).values_list("id", "vehicle_id")
+        )
+        parked_vehicles = set(self.parked.values())
+        self.idle = [pk for pk in vehicles if pk not in parked_vehicles]
+        self.plates = list(vehicles.values())
+        if not self.plates:
+            raise ValueError(
+                f"Nenhum veículo com o prefixo '{prefix}'. Gere os dados primeiro."
+            )
+
+    def _pick(self, items):
+        return items.pop(self._rng.randrange(len(items)))
+
+    def _next_operation(self):
+        with self._lock:
+            operation = self._rng.choices(
+                list(self.mix), weights=list(self.mix.values())
+            )[0]
+            if operation == "check_in" and not self.idle:
+                operation = "check_out"
+            if operation == "check_out" and not self.parked:
+                operation = "check_in" if self.idle else "plate_lookup"
+
+            if operation == "check_in":
+                return operation, self._pick(self.idle)
+            if operation == "check_out":
+                record_id = self._rng.choice(list(self.parked))
+                return operation, (record_id, self.parked.pop(record_id))
+            return operation, self._rng.choice(self.plates)
+
+    def step(self):
+        operation, target = self._next_operation()
+        if operation == "check_in":
+            result = self.transport.request(
+                "POST", "/parking/records/check-in/", {"vehicle": target}
+            )
+            status, body = result[:2]
+            with self._lock:
+                if status == 201:
+                    self.parked[body["id"]] = target
+                else:
+                    self.idle.append(target)
+        elif operation == "check_out":
+            record_id, vehicle_id = target
+            result = self.transport.request(
+                "POST", f"/parking/records/{record_id}/check-out/"
+            )
+            with self._lock:
+                self.idle.append(vehicle_id)
+        else:
+            result = self.transport.request(
+                "POST", "/vehicles/get-by-plate/", {"license_plate": target}
+            )
+        return operation, result
+
+
+def _endpoint_report(samples, elapsed):
+    latencies = [sample[2] for sample in samples if sample[0] is not None]
+    errors = sum(1 for sample in samples if sample[0] is None or sample[0] >= 400)
+    queries = [sample[3] for sample in samples if sample[3] is not None]
+    statuses = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample[0])] += 1
+
+    report = summarize(latencies, elapsed, errors=errors)
+    report["requests"] = len(samples)
+    report["status_codes"] = dict(statuses)
+    report["queries"] = {
+        "mean": round(sum(queries) / len(queries), 2) if queries else None,
+        "max": max(queries, default=None),
+        "total": sum(queries) if queries else None,
+    }
+    return report
+
+
+def run_scenario(workflow, operations, concurrency=1):
+    samples = defaultdict(list)
+    started = time.perf_counter()
+    if concurrency <= 1:
+        for _ in range(operations):
+            operation, result = workflow.step()
+            samples[operation].append(result)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for operation, result in executor.map(
+                lambda _: workflow.step(), range(operations)
+            ):
+                samples[operation].append(result)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "endpoints": {
+            operation: _endpoint_report(results, elapsed)
+            for operation, results in sorted(samples.items())
+        },
+        "total": _endpoint_report(
+            [result for results in samples.values() for result in results], elapsed
+        ),
+    }
+
+
+def benchmark_token(username="benchmark"):
+    user, created = User.objects.get_or_create(
+        username=username, defaults={"is_staff": True, "is_superuser": True}
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=["password"])
+    return str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    transport="client",
+    operations=1000,
+    concurrency=1,
+    base_url="http://127.0.0.1:8000",
+    token=None,
+    prefix="BM",
+    mix=None,
+    seed=None,
+):
+    token = token or benchmark_token()
+    if transport == "client":
+        client = TestClientTransport(token)
+        concurrency = 1
+    else:
+        client = HttpTransport(base_url, token)
+
+    workflow = GateWorkflow(client, prefix=prefix, mix=mix, seed=seed)
+    report = run_scenario(workflow, operations, concurrency=concurrency)
+    return {
+        "revision": git_revision(),
+        "transport": client.name,
+        "base_url": base_url if client.name == "http" else None,
+        "operations": operations,
+        "concurrency": concurrency,
+        "mix": workflow.mix,
+        **report,
+    }
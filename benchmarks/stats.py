@@ -0,0 +1,31 @@
+import math
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    latencies_ms = [latency * 1000 for latency in latencies]
+    completed = len(latencies_ms)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(completed / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": round(sum(latencies_ms) / completed, 3) if completed else None,
+            "p50": _round(percentile(latencies_ms, 0.50)),
+            "p95": _round(percentile(latencies_ms, 0.95)),
+            "p99": _round(percentile(latencies_ms, 0.99)),
+            "max": _round(max(latencies_ms, default=None)),
+        },
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
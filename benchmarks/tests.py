@@ -0,0 +1,64 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+
+from benchmarks.data import generate_dataset
+from benchmarks.runner import run
+from parking.models import ParkingHourlyStats, ParkingRecord, ParkingSpot
+from parking.occupancy import spot_occupancy
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    cache.clear()
+    yield
+    cache.clear()
+    spot_occupancy.invalidate()
+
+
+@pytest.fixture
+def committed_dataset(transactional_db):
+    yield
+    # The scenario commits its dataset, and autovacuum may analyze it before the
+    # flush. Re-analyzing the emptied tables keeps those planner statistics from
+    # leaking into the EXPLAIN checks of other apps.
+    call_command("flush", interactive=False, verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+@pytest.mark.django_db
+def test_generate_dataset_builds_history_and_open_records():
+    result = generate_dataset(
+        spots=10, customers=5, vehicles=20, years=0.02, visits_per_day=4, occupancy=0.5
+    )
+
+    assert result["spots"] == 10
+    assert result["vehicles"] == 20
+    assert result["open_records"] == 5
+    assert result["records"] == 7 * 4 + 5
+    assert ParkingSpot.objects.filter(is_occupied=True).count() == 5
+    assert ParkingRecord.objects.filter(exit_time__isnull=True).count() == 5
+    assert ParkingHourlyStats.objects.exists()
+    oldest = ParkingRecord.objects.order_by("entry_time").first()
+    newest = ParkingRecord.objects.order_by("-entry_time").first()
+    assert (newest.entry_time - oldest.entry_time).days >= 5
+
+
+def test_run_reports_latency_and_query_counts_per_endpoint(committed_dataset):
+    generate_dataset(
+        spots=10, customers=5, vehicles=20, years=0.01, visits_per_day=2, occupancy=0.5
+    )
+
+    report = run(operations=30, seed=7)
+
+    assert report["transport"] == "client"
+    assert set(report["endpoints"]) == {"check_in", "check_out", "plate_lookup"}
+    assert report["total"]["requests"] == 30
+    assert report["total"]["errors"] == 0
+    for endpoint in report["endpoints"].values():
+        assert endpoint["latency_ms"]["p99"] is not None
+        assert endpoint["queries"]["max"] >= 1
+    open_records = ParkingRecord.objects.filter(exit_time__isnull=True).count()
+    assert open_records == ParkingSpot.objects.filter(is_occupied=True).count()
@@ -1,7 +1,21 @@
-from dj_rql.filter_cls import AutoRQLFilterClass
+from parking_service.filters import EXACT_LOOKUPS, IndexedRQLFilterClass
 
 from .models import Customer
 
 
-class CustomerFilterClass(AutoRQLFilterClass):
+class CustomerFilterClass(IndexedRQLFilterClass):
     MODEL = Customer
+    FILTERS = (
+        {"filter": "id", "lookups": EXACT_LOOKUPS},
+        {"filter": "user", "source": "user__id", "lookups": EXACT_LOOKUPS},
+    )
+
+
+class CustomerOpsFilterClass(CustomerFilterClass):
+    FILTERS = (
+        *CustomerFilterClass.FILTERS,
+        {"filter": "name", "ordering": True},
+        "cpf",
+        "phone",
+        {"filter": "created_at", "ordering": True},
+    )
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
@@ -33,7 +35,7 @@ def test_customer_api_list(admin_client):
     Customer.objects.create(name="Cliente Teste 1")
     response = admin_client.get("/api/v1/customers/")
     assert response.status_code == 200
-    assert response.data[0]["name"] == "Cliente Teste 1"
+    assert response.data["results"][0]["name"] == "Cliente Teste 1"
 
 
 @pytest.mark.django_db
@@ -70,4 +72,42 @@ def test_staff_can_see_all_customers(admin_client):
     Customer.objects.create(name="Cliente B")
     response = admin_client.get("/api/v1/customers/")
     assert response.status_code == 200
-    assert len(response.data) == 2
+    assert len(response.data["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_customer_api_list_streams_ndjson(admin_client):
+    Customer.objects.create(name="Cliente A")
+    Customer.objects.create(name="Cliente B")
+    response = admin_client.get("/api/v1/customers/?stream=ndjson")
+    assert response.status_code == 200
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["Cliente A", "Cliente B"]
+
+
+@pytest.mark.django_db
+def test_customer_api_pages_follow_primary_key(admin_client):
+    customers = [Customer.objects.create(name=f"Cliente {n}") for n in range(3)]
+
+    response = admin_client.get("/api/v1/customers/?page_size=2")
+
+    assert [row["id"] for row in response.data["results"]] == [
+        customer.id for customer in customers[:2]
+    ]
+    assert response.data["next"]
+
+    response = admin_client.get(response.data["next"])
+    assert [row["id"] for row in response.data["results"]] == [customers[2].id]
+
+
+@pytest.mark.django_db
+def test_customer_api_query_counts(admin_client, django_assert_max_num_queries):
+    customers = [Customer.objects.create(name=f"Cliente {n}") for n in range(5)]
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get("/api/v1/customers/")
+    assert response.status_code == 200
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get(f"/api/v1/customers/{customers[0].id}/")
+    assert response.status_code == 200
@@ -1,13 +1,20 @@
 from rest_framework import viewsets
-from rest_framework.permissions import DjangoModelPermissions, IsAdminUser
+from rest_framework.permissions import IsAdminUser
 
-from .filters import CustomerFilterClass
+from parking_service.filters import OpsRQLFilterMixin
+from parking_service.permissions import CachedDjangoModelPermissions
+from parking_service.streaming import NDJSONStreamingListMixin
+
+from .filters import CustomerFilterClass, CustomerOpsFilterClass
 from .models import Customer
 from .serializers import CustomerSerializer
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(
+    OpsRQLFilterMixin, NDJSONStreamingListMixin, viewsets.ModelViewSet
+):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     rql_filter_class = CustomerFilterClass
-    permission_classes = [DjangoModelPermissions, IsAdminUser]
+    ops_rql_filter_class = CustomerOpsFilterClass
+    permission_classes = [CachedDjangoModelPermissions, IsAdminUser]
@@ -7,10 +7,34 @@ while ! nc -z db 5432; do
 done
 echo "PostgreSQL started"
 
+SERVER_MODE="${SERVER_MODE:-wsgi}"
+
+if [ "$SERVER_MODE" = "gate-worker" ]; then
+  echo "Waiting for the web service to apply migrations..."
+  until python manage.py migrate --check > /dev/null 2>&1; do
+    sleep 2
+  done
+  echo "Starting gate event worker..."
+  exec python manage.py process_gate_events --loop
+fi
+
 echo "Running database migrations..."
 python manage.py migrate --noinput
 
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
-exec gunicorn parking_service.wsgi:application --bind 0.0.0.0:8000
+WEB_CONCURRENCY="${WEB_CONCURRENCY:-1}"
+
+if [ "$SERVER_MODE" = "asgi" ]; then
+  echo "Starting ASGI server (uvicorn workers)..."
+  exec gunicorn parking_service.asgi:application \
+    --worker-class uvicorn_worker.UvicornWorker \
+    --workers "$WEB_CONCURRENCY" \
+    --bind 0.0.0.0:8000
+fi
+
+echo "Starting WSGI server..."
+exec gunicorn parking_service.wsgi:application \
+  --workers "$WEB_CONCURRENCY" \
+  --bind 0.0.0.0:8000
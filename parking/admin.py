@@ -1,13 +1,42 @@
 from django.contrib import admin
 
-from .models import ParkingRecord, ParkingSpot
+from .models import (
+    ArchivedParkingRecord,
+    GateEvent,
+    MonthlyStatement,
+    ParkingRecord,
+    ParkingSpot,
+    ParkingZone,
+    Tariff,
+    TariffBand,
+)
+from .services import apply_record_changes
+
+
+@admin.register(ParkingZone)
+class ParkingZoneAdmin(admin.ModelAdmin):
+    list_display = ["level", "name"]
+    search_fields = ["level", "name"]
+
+
+class TariffBandInline(admin.TabularInline):
+    model = TariffBand
+    extra = 1
+
+
+@admin.register(Tariff)
+class TariffAdmin(admin.ModelAdmin):
+    list_display = ["name", "vehicle_type", "grace_minutes", "daily_cap"]
+    list_select_related = ["vehicle_type"]
+    inlines = [TariffBandInline]
 
 
 @admin.register(ParkingSpot)
 class ParkingSpotAdmin(admin.ModelAdmin):
-    list_display = ["spot_number", "is_occupied", "created_at"]
+    list_display = ["spot_number", "zone", "is_occupied", "created_at"]
+    list_select_related = ["zone"]
     search_fields = ["spot_number"]
-    list_filter = ["is_occupied"]
+    list_filter = ["is_occupied", "zone"]
 
 
 class ExitStatusFilter(admin.SimpleListFilter):
@@ -26,7 +55,7 @@ class ExitStatusFilter(admin.SimpleListFilter):
 
 @admin.register(ParkingRecord)
 class ParkingRecordAdmin(admin.ModelAdmin):
-    list_display = ["vehicle", "parking_spot", "entry_time", "exit_time"]
+    list_display = ["vehicle", "parking_spot", "entry_time", "exit_time", "amount"]
     search_fields = ["vehicle__license_plate", "parking_spot__spot_number"]
     list_filter = [ExitStatusFilter]
 
@@ -37,3 +66,56 @@ class ParkingRecordAdmin(admin.ModelAdmin):
         ):
             kwargs["queryset"] = ParkingSpot.objects.filter(is_occupied=False)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def save_model(self, request, obj, form, change):
+        previous_spot_id, was_open, previous_times = None, False, None
+        if change:
+            previous_spot_id, entry_time, exit_time = ParkingRecord.objects.values_list(
+                "parking_spot_id", "entry_time", "exit_time"
+            ).get(pk=obj.pk)
+            was_open = exit_time is None
+            previous_times = (entry_time, exit_time)
+        super().save_model(request, obj, form, change)
+        apply_record_changes(obj, previous_spot_id, was_open, previous_times)
+
+
+@admin.register(ArchivedParkingRecord)
+class ArchivedParkingRecordAdmin(admin.ModelAdmin):
+    list_display = ["vehicle", "parking_spot", "entry_time", "exit_time", "amount"]
+    list_select_related = ["vehicle", "parking_spot"]
+    raw_id_fields = ["vehicle", "parking_spot"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MonthlyStatement)
+class MonthlyStatementAdmin(admin.ModelAdmin):
+    list_display = ["customer", "period", "records", "amount", "generated_at"]
+    list_select_related = ["customer"]
+    list_filter = ["period"]
+    raw_id_fields = ["customer"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(GateEvent)
+class GateEventAdmin(admin.ModelAdmin):
+    list_display = [
+        "idempotency_key",
+        "event_type",
+        "license_plate",
+        "occurred_at",
+        "status",
+        "processed_at",
+    ]
+    search_fields = ["idempotency_key", "license_plate"]
+    list_filter = ["status", "event_type"]
+    raw_id_fields = ["record"]
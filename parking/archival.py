@@ -0,0 +1,60 @@
+import time
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ArchivedParkingRecord, GateEvent, ParkingRecord
+
+COLUMNS = (
+    "id",
+    "vehicle_id",
+    "parking_spot_id",
+    "entry_time",
+    "exit_time",
+    "duration_seconds",
+    "amount",
+    "created_at",
+    "updated_at",
+)
+
+
+def _move_sql() -> str:
+    hot = connection.ops.quote_name(ParkingRecord._meta.db_table)
+    archive = connection.ops.quote_name(ArchivedParkingRecord._meta.db_table)
+    columns = ", ".join(COLUMNS)
+    return f"""
+        WITH moved AS (
+            DELETE FROM {hot} WHERE id = ANY(%s) RETURNING {columns}
+        )
+        INSERT INTO {archive} ({columns}, archived_at)
+        SELECT {columns}, %s FROM moved
+    """
+
+
+def archive_batch(before, batch_size: int = 5000) -> int:
+    with transaction.atomic():
+        ids = list(
+            ParkingRecord.objects.filter(exit_time__lt=before)
+            .order_by("exit_time")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        GateEvent.objects.filter(record_id__in=ids).update(record=None)
+        with connection.cursor() as cursor:
+            cursor.execute(_move_sql(), [ids, timezone.now()])
+            return cursor.rowcount
+
+
+def archive_closed_records(
+    older_than_days: int, batch_size: int = 5000, pause: float = 0
+) -> int:
+    before = timezone.now() - timedelta(days=older_than_days)
+    archived = 0
+    while moved := archive_batch(before, batch_size):
+        archived += moved
+        if pause:
+            time.sleep(pause)
+    return archived
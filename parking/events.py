@@ -0,0 +1,118 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "parking_spot_events"
+
+
+class SpotEventBroker:
+    def __init__(self, max_queue_size: int = 100):
+        self._max_queue_size = max_queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self._max_queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, event: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+class PostgresSpotEventListener(threading.Thread):
+    poll_timeout = 5
+
+    def __init__(self, broker: SpotEventBroker, alias: str = "default"):
+        super().__init__(name="parking-spot-events", daemon=True)
+        self._broker = broker
+        self._alias = alias
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Falha ao escutar eventos de vagas; reconectando.")
+                time.sleep(1)
+
+    def _listen(self):
+        wrapper = connections.create_connection(self._alias)
+        raw = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            raw.autocommit = True
+            with raw.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            while not self._stopped.is_set():
+                if select.select([raw], [], [], self.poll_timeout) == ([], [], []):
+                    continue
+                raw.poll()
+                while raw.notifies:
+                    notify = raw.notifies.pop(0)
+                    self._broker.publish(json.loads(notify.payload))
+        finally:
+            raw.close()
+
+
+spot_events = SpotEventBroker()
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _uses_postgres_notify() -> bool:
+    return getattr(settings, "PARKING_EVENTS_BACKEND", "local") == "postgres"
+
+
+def ensure_event_listener() -> None:
+    global _listener
+    if not _uses_postgres_notify() or _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = PostgresSpotEventListener(spot_events)
+            _listener.start()
+
+
+def publish_spot_event(spot_id: int, is_occupied: bool) -> None:
+    event = {"id": spot_id, "is_occupied": is_occupied}
+    if _uses_postgres_notify():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, json.dumps(event)]
+            )
+    else:
+        transaction.on_commit(lambda: spot_events.publish(event))
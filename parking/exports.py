@@ -0,0 +1,143 @@
+import csv
+import io
+from itertools import islice
+
+EXPORT_COLUMNS = (
+    ("record_id", "id"),
+    ("entry_time", "entry_time"),
+    ("exit_time", "exit_time"),
+    ("duration_seconds", "duration_seconds"),
+    ("amount", "amount"),
+    ("archived", "archived"),
+    ("spot_number", "parking_spot__spot_number"),
+    ("license_plate", "vehicle__license_plate"),
+    ("vehicle_type", "vehicle__vehicle_type__name"),
+    ("brand", "vehicle__brand"),
+    ("model", "vehicle__model"),
+    ("color", "vehicle__color"),
+    ("customer_id", "vehicle__owner_id"),
+    ("customer_name", "vehicle__owner__name"),
+    ("customer_cpf", "vehicle__owner__cpf"),
+)
+EXPORT_HEADER = [name for name, _ in EXPORT_COLUMNS]
+EXPORT_CHUNK_SIZE = 10000
+
+
+class ExportFormatUnavailable(Exception):
+    pass
+
+
+def export_queryset(queryset, start=None, end=None):
+    if start is not None:
+        queryset = queryset.filter(entry_time__gte=start)
+    if end is not None:
+        queryset = queryset.filter(entry_time__lt=end)
+    return queryset.order_by("entry_time", "id").values_list(
+        *(path for _, path in EXPORT_COLUMNS)
+    )
+
+
+def _chunks(rows, chunk_size):
+    iterator = rows.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def iter_csv(rows, chunk_size: int = EXPORT_CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_HEADER)
+    for chunk in _chunks(rows, chunk_size):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _ChunkedSink(io.RawIOBase):
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema(pa):
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("record_id", pa.int64()),
+            ("entry_time", timestamp),
+            ("exit_time", timestamp),
+            ("duration_seconds", pa.int64()),
+            ("amount", pa.decimal128(10, 2)),
+            ("archived", pa.bool_()),
+            ("spot_number", pa.string()),
+            ("license_plate", pa.string()),
+            ("vehicle_type", pa.string()),
+            ("brand", pa.string()),
+            ("model", pa.string()),
+            ("color", pa.string()),
+            ("customer_id", pa.int64()),
+            ("customer_name", pa.string()),
+            ("customer_cpf", pa.string()),
+        ]
+    )
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ExportFormatUnavailable(
+            "A exportação em Parquet requer o pacote pyarrow."
+        ) from e
+    return pa, pq
+
+
+def iter_parquet(rows, chunk_size: int = EXPORT_CHUNK_SIZE):
+    pa, pq = _import_pyarrow()
+    schema = _parquet_schema(pa)
+    sink = _ChunkedSink()
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for chunk in _chunks(rows, chunk_size):
+            columns = list(zip(*chunk, strict=True))
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(
+                    [
+                        pa.array(column, type=field.type)
+                        for column, field in zip(columns, schema, strict=True)
+                    ],
+                    schema=schema,
+                )
+            )
+            yield sink.drain()
+    yield sink.drain()
+
+
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv; charset=utf-8"),
+    "parquet": (iter_parquet, "application/vnd.apache.parquet"),
+}
+
+
+def check_export_format(output_format: str) -> None:
+    if output_format == "parquet":
+        _import_pyarrow()
@@ -1,17 +1,72 @@
-from dj_rql.filter_cls import AutoRQLFilterClass
+from py_rql.constants import FilterLookups
 
-from .models import ParkingRecord, ParkingSpot
+from parking_service.filters import (
+    EXACT_LOOKUPS,
+    RANGE_LOOKUPS,
+    IndexedRQLFilterClass,
+)
 
+from .models import MonthlyStatement, ParkingRecord, ParkingSpot
 
-class ParkingSpotFilterClass(AutoRQLFilterClass):
+
+class ParkingSpotFilterClass(IndexedRQLFilterClass):
     MODEL = ParkingSpot
+    FILTERS = (
+        {"filter": "id", "lookups": EXACT_LOOKUPS},
+        {"filter": "spot_number", "lookups": EXACT_LOOKUPS, "ordering": True},
+        {"filter": "is_occupied", "lookups": {FilterLookups.EQ}},
+        {"filter": "zone", "source": "zone__id", "lookups": EXACT_LOOKUPS},
+    )
 
 
-class ParkingRecordFilterClass(AutoRQLFilterClass):
+class ParkingSpotOpsFilterClass(ParkingSpotFilterClass):
+    FILTERS = (
+        *ParkingSpotFilterClass.FILTERS,
+        {"filter": "created_at", "ordering": True},
+        {"filter": "updated_at", "ordering": True},
+    )
+
+
+class ParkingRecordFilterClass(IndexedRQLFilterClass):
     MODEL = ParkingRecord
     FILTERS = (
+        {"filter": "id", "lookups": EXACT_LOOKUPS},
+        {"filter": "entry_time", "lookups": RANGE_LOOKUPS, "ordering": True},
+        {
+            "filter": "exit_time",
+            "lookups": RANGE_LOOKUPS | {FilterLookups.NULL},
+        },
+        {"filter": "vehicle", "source": "vehicle__id", "lookups": EXACT_LOOKUPS},
+        {
+            "filter": "parking_spot",
+            "source": "parking_spot__id",
+            "lookups": EXACT_LOOKUPS,
+        },
         {
             "filter": "license_plate",
             "source": "vehicle__license_plate",
+            "lookups": EXACT_LOOKUPS,
         },
     )
+
+
+class ParkingRecordOpsFilterClass(IndexedRQLFilterClass):
+    MODEL = ParkingRecord
+    FILTERS = (
+        *ParkingRecordFilterClass.FILTERS[:-1],
+        {"filter": "license_plate", "source": "vehicle__license_plate"},
+        {"filter": "created_at", "ordering": True},
+        {"filter": "updated_at", "ordering": True},
+    )
+
+
+class MonthlyStatementFilterClass(IndexedRQLFilterClass):
+    MODEL = MonthlyStatement
+    FILTERS = ({"filter": "period", "lookups": RANGE_LOOKUPS, "ordering": True},)
+
+
+class MonthlyStatementOpsFilterClass(MonthlyStatementFilterClass):
+    FILTERS = (
+        *MonthlyStatementFilterClass.FILTERS,
+        {"filter": "customer", "source": "customer__id", "lookups": EXACT_LOOKUPS},
+    )
@@ -0,0 +1,206 @@
+from collections import deque
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from parking_service.cache import bump_model_cache_version
+from vehicles.services import get_or_create_vehicles_by_plates
+
+from .events import publish_spot_event
+from .models import GateEvent, ParkingRecord, ParkingSpot
+from .occupancy import spot_occupancy
+from .pricing import PRICED_FIELDS, price_records
+from .reports import records_closed
+from .zones import refresh_zone_counters
+
+
+class GateEventRejected(Exception):
+    pass
+
+
+def enqueue_gate_events(events: list[dict]) -> dict:
+    events = list({event["idempotency_key"]: event for event in events}.values())
+    keys = [event["idempotency_key"] for event in events]
+    existing = set(
+        GateEvent.objects.filter(idempotency_key__in=keys).values_list(
+            "idempotency_key", flat=True
+        )
+    )
+    GateEvent.objects.bulk_create(
+        [
+            GateEvent(**event)
+            for event in events
+            if event["idempotency_key"] not in existing
+        ],
+        ignore_conflicts=True,
+    )
+    return {"accepted": len(events) - len(existing), "duplicates": len(existing)}
+
+
+class _SpotPool:
+    def __init__(self, events):
+        requested = {
+            event.parking_spot
+            for event in events
+            if event.event_type == GateEvent.EventType.CHECK_IN and event.parking_spot
+        }
+        automatic = sum(
+            1
+            for event in events
+            if event.event_type == GateEvent.EventType.CHECK_IN
+            and not event.parking_spot
+        )
+        free = ParkingSpot.objects.filter(is_occupied=False).select_for_update(
+            skip_locked=True
+        )
+        self._queue = deque(
+            free.exclude(pk__in=requested)
+            .order_by("spot_number")
+            .values_list("pk", flat=True)[:automatic]
+        )
+        self._available = set(self._queue) | set(
+            free.filter(pk__in=requested).values_list("pk", flat=True)
+        )
+
+    def take(self, spot_id=None):
+        if spot_id:
+            if spot_id not in self._available:
+                raise GateEventRejected("A vaga informada não está disponível.")
+            self._available.discard(spot_id)
+            return spot_id
+        while self._queue:
+            spot_id = self._queue.popleft()
+            if spot_id in self._available:
+                self._available.discard(spot_id)
+                return spot_id
+        raise GateEventRejected("Nenhuma vaga disponível no momento.")
+
+    def release(self, spot_id):
+        self._available.add(spot_id)
+        self._queue.append(spot_id)
+
+
+def _apply_events(events) -> set:
+    vehicles = {
+        vehicle.license_plate: vehicle.pk
+        for vehicle in get_or_create_vehicles_by_plates(
+            [event.license_plate for event in events]
+        )
+    }
+    open_records = {
+        record.vehicle_id: record
+        for record in ParkingRecord.objects.filter(
+            vehicle_id__in=vehicles.values(), exit_time__isnull=True
+        )
+    }
+    spots = _SpotPool(events)
+    now = timezone.now()
+    created, updated, touched = [], [], set()
+
+    for event in events:
+        event.status, event.error, event.record = GateEvent.Status.PROCESSED, "", None
+        vehicle_id = vehicles[event.license_plate]
+        try:
+            if event.event_type == GateEvent.EventType.CHECK_IN:
+                if vehicle_id in open_records:
+                    raise GateEventRejected(
+                        "O veículo já possui um registro em aberto."
+                    )
+                record = ParkingRecord(
+                    vehicle_id=vehicle_id,
+                    parking_spot_id=spots.take(event.parking_spot),
+                    entry_time=event.occurred_at,
+                )
+                open_records[vehicle_id] = record
+                created.append(record)
+            else:
+                record = open_records.pop(vehicle_id, None)
+                if record is None:
+                    raise GateEventRejected(
+                        "Nenhum registro em aberto para este veículo."
+                    )
+                record.exit_time = max(event.occurred_at, record.entry_time)
+                record.updated_at = now
+                spots.release(record.parking_spot_id)
+                if record.pk is not None:
+                    updated.append(record)
+        except GateEventRejected as e:
+            event.status, event.error = GateEvent.Status.FAILED, str(e)
+            continue
+        event.record = record
+        touched.add(record.parking_spot_id)
+
+    price_records([*created, *updated])
+    ParkingRecord.objects.bulk_create(created)
+    ParkingRecord.objects.bulk_update(
+        updated, ["exit_time", "updated_at", *PRICED_FIELDS]
+    )
+    records_closed(
+        record for record in [*created, *updated] if record.exit_time is not None
+    )
+    return touched
+
+
+def _sync_spots(spot_ids) -> None:
+    if not spot_ids:
+        return
+    ParkingSpot.objects.filter(pk__in=spot_ids).update(
+        is_occupied=Exists(
+            ParkingRecord.objects.filter(
+                parking_spot=OuterRef("pk"), exit_time__isnull=True
+            )
+        ),
+        updated_at=timezone.now(),
+    )
+    states = list(
+        ParkingSpot.objects.filter(pk__in=spot_ids).values_list(
+            "pk", "is_occupied", "zone_id"
+        )
+    )
+    refresh_zone_counters(zone_id for _, _, zone_id in states)
+    bump_model_cache_version(ParkingSpot)
+    for spot_id, is_occupied, _ in states:
+        publish_spot_event(spot_id, is_occupied)
+
+    def update_occupancy():
+        for spot_id, is_occupied, _ in states:
+            spot_occupancy.set_spot(spot_id, is_occupied)
+
+    transaction.on_commit(update_occupancy)
+
+
+def process_gate_events(batch_size: int = 500) -> dict:
+    with transaction.atomic():
+        events = list(
+            GateEvent.objects.filter(status=GateEvent.Status.PENDING)
+            .order_by("occurred_at", "id")
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not events:
+            return {"processed": 0, "failed": 0}
+
+        try:
+            with transaction.atomic():
+                touched = _apply_events(events)
+        except IntegrityError:
+            touched = set()
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        touched |= _apply_events([event])
+                except IntegrityError:
+                    event.status = GateEvent.Status.FAILED
+                    event.error = "Conflito com um registro em aberto."
+                    event.record = None
+
+        processed_at = timezone.now()
+        for event in events:
+            event.processed_at = processed_at
+        GateEvent.objects.bulk_update(
+            events, ["status", "error", "record", "processed_at"]
+        )
+        _sync_spots(touched)
+
+    failed = sum(1 for event in events if event.status == GateEvent.Status.FAILED)
+    return {"processed": len(events) - failed, "failed": failed}
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from parking.archival import archive_closed_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Move registros encerrados há mais de N dias para a tabela de arquivo, "
+        "em lotes curtos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.PARKING_ARCHIVE_AFTER_DAYS,
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Segundos de espera entre lotes.",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_closed_records(
+            options["older_than_days"],
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{archived} registros arquivados."))
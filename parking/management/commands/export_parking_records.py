@@ -0,0 +1,70 @@
+import sys
+from contextlib import nullcontext
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from py_rql.exceptions import RQLFilterError
+
+from parking.exports import (
+    EXPORT_FORMATS,
+    ExportFormatUnavailable,
+    check_export_format,
+    export_queryset,
+)
+from parking.filters import ParkingRecordOpsFilterClass
+from parking.models import ParkingRecordHistory
+
+
+def parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"Data inválida: {value}")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta o histórico de registros (com veículo, vaga e cliente) em CSV "
+        "ou Parquet, em fluxo e com memória limitada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=parse_moment)
+        parser.add_argument("--end", type=parse_moment)
+        parser.add_argument("--filter", default="", help="Expressão RQL.")
+        parser.add_argument(
+            "--format", dest="output_format", choices=EXPORT_FORMATS, default="csv"
+        )
+        parser.add_argument(
+            "--output", help="Arquivo de destino (padrão: saída padrão)."
+        )
+
+    def handle(self, *args, **options):
+        output_format = options["output_format"]
+        try:
+            check_export_format(output_format)
+        except ExportFormatUnavailable as e:
+            raise CommandError(str(e)) from e
+
+        queryset = ParkingRecordHistory.objects.all()
+        if options["filter"]:
+            try:
+                _, queryset = ParkingRecordOpsFilterClass(queryset).apply_filters(
+                    options["filter"]
+                )
+            except RQLFilterError as e:
+                raise CommandError(f"Filtro inválido: {e.details}") from e
+        rows = export_queryset(queryset, start=options["start"], end=options["end"])
+
+        stream, _ = EXPORT_FORMATS[output_format]
+        path = options["output"]
+        with open(path, "wb") if path else nullcontext(sys.stdout.buffer) as file:
+            for chunk in stream(rows):
+                file.write(chunk.encode() if isinstance(chunk, str) else chunk)
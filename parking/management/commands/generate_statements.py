@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from parking.statements import generate_statements, previous_month
+
+
+def parse_month(value):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError as e:
+        raise CommandError(f"Mês inválido (use AAAA-MM): {value}") from e
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera os extratos mensais por cliente, agregando os registros encerrados "
+        "no mês (padrão: mês anterior)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", type=parse_month)
+        parser.add_argument(
+            "--workers", type=int, default=settings.PARKING_STATEMENT_WORKERS
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Extratos gravados por lote."
+        )
+
+    def handle(self, *args, **options):
+        period = options["month"] or previous_month()
+        generated = generate_statements(
+            period, workers=options["workers"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"{generated} extratos gerados para {period:%m/%Y}.")
+        )
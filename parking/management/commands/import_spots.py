@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from parking.provisioning import (
+    SpotLayoutError,
+    SpotNumberConflictError,
+    parse_spot_layout,
+    provision_spots,
+    spots_from_ranges,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Cadastra vagas em massa a partir de intervalos (ex.: A001-A500) "
+        "ou de um layout CSV com as colunas spot_number, level e zone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("ranges", nargs="*")
+        parser.add_argument("--csv", dest="layout")
+        parser.add_argument("--level", default="")
+        parser.add_argument("--zone", default="")
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help="Atualiza a zona das vagas que já existem em vez de falhar.",
+        )
+
+    def handle(self, *args, **options):
+        if bool(options["ranges"]) == bool(options["layout"]):
+            raise CommandError("Informe intervalos ou --csv, mas não ambos.")
+
+        try:
+            if options["layout"]:
+                with open(options["layout"], newline="", encoding="utf-8-sig") as file:
+                    spots = parse_spot_layout(file)
+            else:
+                spots = spots_from_ranges(
+                    options["ranges"], options["level"], options["zone"]
+                )
+            result = provision_spots(spots, upsert=options["upsert"])
+        except SpotNumberConflictError as e:
+            raise CommandError(
+                f"{e} Use --upsert para atualizá-las: {', '.join(e.spot_numbers[:20])}"
+            ) from e
+        except SpotLayoutError as e:
+            details = "; ".join(
+                f"linha {error['row']}: {error['error']}" for error in e.errors[:20]
+            )
+            raise CommandError(f"{e} {details}") from e
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['created']} vagas criadas, {result['updated']} atualizadas."
+            )
+        )
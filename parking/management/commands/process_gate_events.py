@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from parking.ingestion import process_gate_events
+
+
+class Command(BaseCommand):
+    help = "Processa em lotes a fila de eventos de entrada e saída das portarias."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Continua aguardando novos eventos em vez de encerrar.",
+        )
+        parser.add_argument("--interval", type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        while True:
+            result = process_gate_events(batch_size=options["batch_size"])
+            drained = result["processed"] + result["failed"]
+            if drained:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{result['processed']} eventos processados, "
+                        f"{result['failed']} rejeitados."
+                    )
+                )
+            if drained == options["batch_size"]:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from parking.reports import rebuild_hourly_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcula as estatísticas horárias a partir dos registros encerrados."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        buckets = rebuild_hourly_stats(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{buckets} intervalos horários recalculados.")
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from parking.zones import refresh_zone_counters
+
+
+class Command(BaseCommand):
+    help = "Recalcula os contadores de vagas livres e totais por zona."
+
+    def handle(self, *args, **options):
+        zones = refresh_zone_counters()
+        self.stdout.write(self.style.SUCCESS(f"{zones} zonas recalculadas."))
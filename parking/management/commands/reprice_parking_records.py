@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from parking.management.commands.export_parking_records import parse_moment
+from parking.pricing import reprice_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula a permanência e o valor dos registros encerrados (inclusive "
+        "arquivados) com as tarifas atuais, em lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=parse_moment,
+            help="Reprecifica apenas saídas a partir desta data.",
+        )
+        parser.add_argument("--vehicle-type", type=int, dest="vehicle_type_id")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        repriced = reprice_records(
+            batch_size=options["batch_size"],
+            since=options["since"],
+            vehicle_type_id=options["vehicle_type_id"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{repriced} registros reprecificados."))
@@ -0,0 +1,137 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# Older duplicates are closed at the entry of the next record for the same spot
+# or vehicle, leaving only the latest one open. Spots left without an open record
+# are freed in the same statement; the outer query still sees the rows as they
+# were before the update, so the records just closed are excluded explicitly.
+CLOSE_DUPLICATE_OPEN_RECORDS_SQL = """
+    WITH closed AS (
+        UPDATE parking_parkingrecord AS record
+        SET exit_time = duplicate.closed_at
+        FROM (
+            SELECT
+                id,
+                lead(entry_time) OVER (PARTITION BY {column} ORDER BY entry_time, id)
+                    AS closed_at
+            FROM parking_parkingrecord
+            WHERE exit_time IS NULL
+        ) AS duplicate
+        WHERE record.id = duplicate.id AND duplicate.closed_at IS NOT NULL
+        RETURNING record.id, record.parking_spot_id
+    )
+    UPDATE parking_parkingspot AS spot
+    SET is_occupied = false
+    WHERE spot.id IN (SELECT parking_spot_id FROM closed)
+        AND NOT EXISTS (
+            SELECT 1
+            FROM parking_parkingrecord AS open_record
+            WHERE open_record.parking_spot_id = spot.id
+                AND open_record.exit_time IS NULL
+                AND open_record.id NOT IN (SELECT id FROM closed)
+        )
+"""
+
+
+def add_open_record_constraint(column, name, message):
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.RunSQL(
+                CLOSE_DUPLICATE_OPEN_RECORDS_SQL.format(column=column),
+                migrations.RunSQL.noop,
+            ),
+            migrations.RunSQL(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON parking_parkingrecord ({column}) WHERE exit_time IS NULL",
+                f"DROP INDEX CONCURRENTLY IF EXISTS {name}",
+            ),
+        ],
+        state_operations=[
+            migrations.AddConstraint(
+                model_name="parkingrecord",
+                constraint=models.UniqueConstraint(
+                    condition=models.Q(("exit_time__isnull", True)),
+                    fields=(column.removesuffix("_id"),),
+                    name=name,
+                    violation_error_message=message,
+                ),
+            ),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("parking", "0002_alter_parkingrecord_parking_spot"),
+        ("vehicles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="parkingrecord",
+            name="parking_spot",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="parking_records",
+                to="parking.parkingspot",
+                verbose_name="Vaga",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="parkingrecord",
+            name="vehicle",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="parking_records",
+                to="vehicles.vehicle",
+                verbose_name="Veículo",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="parkingrecord",
+            index=models.Index(
+                fields=["entry_time", "id"], name="parking_rec_entry_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="parkingrecord",
+            index=models.Index(fields=["exit_time"], name="parking_rec_exit_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="parkingrecord",
+            index=models.Index(
+                fields=["vehicle", "entry_time"], name="parking_rec_vehicle_entry_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="parkingrecord",
+            index=models.Index(
+                fields=["parking_spot", "entry_time"], name="parking_rec_spot_entry_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="parkingspot",
+            index=models.Index(
+                condition=models.Q(("is_occupied", False)),
+                fields=["spot_number"],
+                name="parking_spot_free_idx",
+            ),
+        ),
+        add_open_record_constraint(
+            "parking_spot_id",
+            "unique_open_record_per_spot",
+            "A vaga já possui um registro em aberto.",
+        ),
+        add_open_record_constraint(
+            "vehicle_id",
+            "unique_open_record_per_vehicle",
+            "O veículo já possui um registro em aberto.",
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("parking", "0003_parkingrecord_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ParkingHourlyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField(unique=True, verbose_name="Hora")),
+                (
+                    "entries",
+                    models.PositiveIntegerField(default=0, verbose_name="Entradas"),
+                ),
+                (
+                    "exits",
+                    models.PositiveIntegerField(default=0, verbose_name="Saídas"),
+                ),
+                (
+                    "dwell_seconds",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Permanência Total (s)"
+                    ),
+                ),
+                (
+                    "occupied_seconds",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Ocupação Total (s)"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Atualizado em"),
+                ),
+            ],
+            options={
+                "verbose_name": "Estatística Horária",
+                "verbose_name_plural": "Estatísticas Horárias",
+                "ordering": ["bucket"],
+            },
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("parking", "0004_parkinghourlystats"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="parkingrecord",
+            name="entry_time",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Horário de Entrada",
+            ),
+        ),
+        migrations.CreateModel(
+            name="GateEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "idempotency_key",
+                    models.CharField(
+                        max_length=64, unique=True, verbose_name="Chave de Idempotência"
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[("check_in", "Entrada"), ("check_out", "Saída")],
+                        max_length=10,
+                        verbose_name="Tipo",
+                    ),
+                ),
+                (
+                    "license_plate",
+                    models.CharField(max_length=10, verbose_name="Placa"),
+                ),
+                (
+                    "parking_spot",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Vaga"
+                    ),
+                ),
+                (
+                    "occurred_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Ocorrido em"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendente"),
+                            ("processed", "Processado"),
+                            ("failed", "Falhou"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Situação",
+                    ),
+                ),
+                (
+                    "error",
+                    models.CharField(blank=True, max_length=255, verbose_name="Erro"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Criado em"),
+                ),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Processado em"
+                    ),
+                ),
+                (
+                    "record",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="gate_events",
+                        to="parking.parkingrecord",
+                        verbose_name="Registro",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Evento de Portaria",
+                "verbose_name_plural": "Eventos de Portaria",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["occurred_at", "id"],
+                        name="gate_event_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
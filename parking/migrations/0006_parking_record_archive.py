@@ -0,0 +1,122 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+HISTORY_VIEW_SQL = """
+CREATE VIEW parking_parkingrecord_history AS
+SELECT id, vehicle_id, parking_spot_id, entry_time, exit_time, created_at,
+       updated_at, false AS archived
+FROM parking_parkingrecord
+UNION ALL
+SELECT id, vehicle_id, parking_spot_id, entry_time, exit_time, created_at,
+       updated_at, true AS archived
+FROM parking_archivedparkingrecord
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("parking", "0005_gateevent"),
+        ("vehicles", "0003_vehicle_plate_trigram_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ParkingRecordHistory",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("entry_time", models.DateTimeField(verbose_name="Horário de Entrada")),
+                (
+                    "exit_time",
+                    models.DateTimeField(null=True, verbose_name="Horário de Saída"),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Criado em")),
+                ("updated_at", models.DateTimeField(verbose_name="Atualizado em")),
+                ("archived", models.BooleanField(verbose_name="Arquivado")),
+            ],
+            options={
+                "verbose_name": "Histórico de Registros",
+                "verbose_name_plural": "Históricos de Registros",
+                "db_table": "parking_parkingrecord_history",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedParkingRecord",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("entry_time", models.DateTimeField(verbose_name="Horário de Entrada")),
+                ("exit_time", models.DateTimeField(verbose_name="Horário de Saída")),
+                ("created_at", models.DateTimeField(verbose_name="Criado em")),
+                ("updated_at", models.DateTimeField(verbose_name="Atualizado em")),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Arquivado em"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Registro Arquivado",
+                "verbose_name_plural": "Registros Arquivados",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="gateevent",
+            index=models.Index(
+                condition=models.Q(("record__isnull", False)),
+                fields=["record"],
+                name="gate_event_record_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedparkingrecord",
+            name="parking_spot",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="archived_parking_records",
+                to="parking.parkingspot",
+                verbose_name="Vaga",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedparkingrecord",
+            name="vehicle",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="archived_parking_records",
+                to="vehicles.vehicle",
+                verbose_name="Veículo",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedparkingrecord",
+            index=models.Index(
+                fields=["entry_time", "id"], name="archived_rec_entry_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedparkingrecord",
+            index=models.Index(fields=["exit_time"], name="archived_rec_exit_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedparkingrecord",
+            index=models.Index(
+                fields=["vehicle", "entry_time"], name="archived_rec_vehicle_entry_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedparkingrecord",
+            index=models.Index(
+                fields=["parking_spot", "entry_time"],
+                name="archived_rec_spot_entry_idx",
+            ),
+        ),
+        migrations.RunSQL(
+            HISTORY_VIEW_SQL,
+            "DROP VIEW IF EXISTS parking_parkingrecord_history",
+        ),
+    ]
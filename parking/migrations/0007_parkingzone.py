@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("parking", "0006_parking_record_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ParkingZone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("level", models.CharField(max_length=20, verbose_name="Nível")),
+                ("name", models.CharField(max_length=50, verbose_name="Zona")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Criado em"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Atualizado em"),
+                ),
+            ],
+            options={
+                "verbose_name": "Zona",
+                "verbose_name_plural": "Zonas",
+                "ordering": ["level", "name"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("level", "name"), name="unique_zone_per_level"
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="parkingspot",
+            name="zone",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="spots",
+                to="parking.parkingzone",
+                verbose_name="Zona",
+            ),
+        ),
+    ]
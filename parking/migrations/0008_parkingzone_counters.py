@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:54
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_zone_spots(apps, schema_editor):
+    ParkingSpot = apps.get_model("parking", "ParkingSpot")
+    ParkingZone = apps.get_model("parking", "ParkingZone")
+
+    def count(spots):
+        return Coalesce(
+            Subquery(
+                spots.order_by()
+                .values("zone")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+
+    spots = ParkingSpot.objects.filter(zone=OuterRef("pk"))
+    ParkingZone.objects.update(
+        total_spots=count(spots), free_spots=count(spots.filter(is_occupied=False))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("parking", "0007_parkingzone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="parkingzone",
+            name="free_spots",
+            field=models.PositiveIntegerField(default=0, verbose_name="Vagas Livres"),
+        ),
+        migrations.AddField(
+            model_name="parkingzone",
+            name="total_spots",
+            field=models.PositiveIntegerField(default=0, verbose_name="Total de Vagas"),
+        ),
+        migrations.RunPython(count_zone_spots, migrations.RunPython.noop),
+    ]
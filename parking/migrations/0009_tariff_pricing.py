@@ -0,0 +1,221 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+HISTORY_VIEW_SQL = """
+CREATE VIEW parking_parkingrecord_history AS
+SELECT id, vehicle_id, parking_spot_id, entry_time, exit_time, {pricing}created_at,
+       updated_at, false AS archived
+FROM parking_parkingrecord
+UNION ALL
+SELECT id, vehicle_id, parking_spot_id, entry_time, exit_time, {pricing}created_at,
+       updated_at, true AS archived
+FROM parking_archivedparkingrecord
+"""
+DROP_HISTORY_VIEW_SQL = "DROP VIEW IF EXISTS parking_parkingrecord_history"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("parking", "0008_parkingzone_counters"),
+        ("vehicles", "0003_vehicle_plate_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedparkingrecord",
+            name="amount",
+            field=models.DecimalField(
+                decimal_places=2, max_digits=10, null=True, verbose_name="Valor"
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedparkingrecord",
+            name="duration_seconds",
+            field=models.PositiveIntegerField(
+                null=True, verbose_name="Permanência (s)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="parkingrecord",
+            name="amount",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                max_digits=10,
+                null=True,
+                verbose_name="Valor",
+            ),
+        ),
+        migrations.AddField(
+            model_name="parkingrecord",
+            name="duration_seconds",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Permanência (s)"
+            ),
+        ),
+        migrations.CreateModel(
+            name="Tariff",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, verbose_name="Nome")),
+                (
+                    "grace_minutes",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Tolerância (min)"
+                    ),
+                ),
+                (
+                    "daily_cap",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Teto Diário",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Criado em"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Atualizado em"),
+                ),
+                (
+                    "vehicle_type",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="tariffs",
+                        to="vehicles.vehicletype",
+                        verbose_name="Tipo do Veículo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tarifa",
+                "verbose_name_plural": "Tarifas",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TariffBand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "start_minute",
+                    models.PositiveIntegerField(verbose_name="A partir de (min)"),
+                ),
+                (
+                    "end_minute",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Até (min)"
+                    ),
+                ),
+                (
+                    "block_minutes",
+                    models.PositiveIntegerField(
+                        default=60, verbose_name="Fração (min)"
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Valor por Fração"
+                    ),
+                ),
+                (
+                    "tariff",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bands",
+                        to="parking.tariff",
+                        verbose_name="Tarifa",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Faixa de Tarifa",
+                "verbose_name_plural": "Faixas de Tarifa",
+                "ordering": ["tariff", "start_minute"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="tariff",
+            constraint=models.UniqueConstraint(
+                fields=("vehicle_type",),
+                name="unique_tariff_per_vehicle_type",
+                nulls_distinct=False,
+                violation_error_message="Já existe uma tarifa para este tipo.",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="tariffband",
+            constraint=models.UniqueConstraint(
+                fields=("tariff", "start_minute"), name="unique_band_start"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="tariffband",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("block_minutes__gte", 1)),
+                name="tariff_band_block_positive",
+                violation_error_message="A fração deve ter ao menos 1 minuto.",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="tariffband",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("end_minute__isnull", True),
+                    ("end_minute__gt", models.F("start_minute")),
+                    _connector="OR",
+                ),
+                name="tariff_band_end_after_start",
+                violation_error_message="O fim da faixa deve ser após o início.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="parkingrecordhistory",
+            name="duration_seconds",
+            field=models.PositiveIntegerField(
+                null=True, verbose_name="Permanência (s)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="parkingrecordhistory",
+            name="amount",
+            field=models.DecimalField(
+                decimal_places=2, max_digits=10, null=True, verbose_name="Valor"
+            ),
+        ),
+        migrations.RunSQL(
+            [
+                DROP_HISTORY_VIEW_SQL,
+                HISTORY_VIEW_SQL.format(pricing="duration_seconds, amount, "),
+            ],
+            [DROP_HISTORY_VIEW_SQL, HISTORY_VIEW_SQL.format(pricing="")],
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("customers", "0001_initial"),
+        ("parking", "0009_tariff_pricing"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyStatement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period", models.DateField(verbose_name="Competência")),
+                (
+                    "records",
+                    models.PositiveIntegerField(default=0, verbose_name="Registros"),
+                ),
+                (
+                    "duration_seconds",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Permanência Total (s)"
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Valor Total",
+                    ),
+                ),
+                (
+                    "generated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Gerado em"),
+                ),
+                (
+                    "customer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="statements",
+                        to="customers.customer",
+                        verbose_name="Cliente",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Extrato Mensal",
+                "verbose_name_plural": "Extratos Mensais",
+                "ordering": ["-period", "customer"],
+                "indexes": [
+                    models.Index(
+                        fields=["period", "customer"], name="statement_period_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("customer", "period"),
+                        name="unique_statement_per_period",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import migrations
+
+HOUR = timedelta(hours=1)
+
+
+def _hour_floor(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def backfill_hourly_stats(apps, schema_editor):
+    # Records closed before the hourly rollup existed were never counted, so the
+    # table is rebuilt from the hot and archived records, like
+    # rebuild_parking_stats does.
+    ParkingHourlyStats = apps.get_model("parking", "ParkingHourlyStats")
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    for model_name in ("ParkingRecord", "ArchivedParkingRecord"):
+        records = (
+            apps.get_model("parking", model_name)
+            .objects.filter(exit_time__isnull=False)
+            .values_list("entry_time", "exit_time")
+        )
+        for entry_time, exit_time in records.iterator(chunk_size=5000):
+            totals[_hour_floor(entry_time)][0] += 1
+            exit_bucket = _hour_floor(exit_time)
+            totals[exit_bucket][1] += 1
+            totals[exit_bucket][2] += int((exit_time - entry_time).total_seconds())
+            cursor = entry_time
+            while cursor < exit_time:
+                bucket = _hour_floor(cursor)
+                bucket_end = min(bucket + HOUR, exit_time)
+                totals[bucket][3] += int((bucket_end - cursor).total_seconds())
+                cursor = bucket_end
+
+    ParkingHourlyStats.objects.all().delete()
+    ParkingHourlyStats.objects.bulk_create(
+        [
+            ParkingHourlyStats(
+                bucket=bucket,
+                entries=entries,
+                exits=exits,
+                dwell_seconds=dwell_seconds,
+                occupied_seconds=occupied_seconds,
+            )
+            for bucket, (entries, exits, dwell_seconds, occupied_seconds) in sorted(
+                totals.items()
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("parking", "0010_monthlystatement"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_hourly_stats, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,30 @@
 from django.db import models
+from django.utils import timezone
 
-from vehicles.models import Vehicle
+from customers.models import Customer
+from vehicles.models import Vehicle, VehicleType
+
+
+class ParkingZone(models.Model):
+    level = models.CharField(max_length=20, verbose_name="Nível")
+    name = models.CharField(max_length=50, verbose_name="Zona")
+    total_spots = models.PositiveIntegerField(default=0, verbose_name="Total de Vagas")
+    free_spots = models.PositiveIntegerField(default=0, verbose_name="Vagas Livres")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Zona"
+        verbose_name_plural = "Zonas"
+        ordering = ["level", "name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["level", "name"], name="unique_zone_per_level"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Nível {self.level} - Zona {self.name}"
 
 
 class ParkingSpot(models.Model):
@@ -9,6 +33,14 @@ class ParkingSpot(models.Model):
         unique=True,
         verbose_name="Número da Vaga",
     )
+    zone = models.ForeignKey(
+        ParkingZone,
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+        related_name="spots",
+        verbose_name="Zona",
+    )
     is_occupied = models.BooleanField(
         default=False,
         verbose_name="Ocupado",
@@ -19,6 +51,13 @@ class ParkingSpot(models.Model):
     class Meta:
         verbose_name = "Vaga"
         verbose_name_plural = "Vagas"
+        indexes = [
+            models.Index(
+                fields=["spot_number"],
+                condition=models.Q(is_occupied=False),
+                name="parking_spot_free_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.spot_number
@@ -29,26 +68,348 @@ class ParkingRecord(models.Model):
         Vehicle,
         on_delete=models.PROTECT,
         related_name="parking_records",
+        db_index=False,
         verbose_name="Veículo",
     )
     parking_spot = models.ForeignKey(
         ParkingSpot,
         on_delete=models.PROTECT,
         related_name="parking_records",
+        db_index=False,
         verbose_name="Vaga",
     )
     entry_time = models.DateTimeField(
-        auto_now_add=True, verbose_name="Horário de Entrada"
+        default=timezone.now, editable=False, verbose_name="Horário de Entrada"
     )
     exit_time = models.DateTimeField(
         blank=True, null=True, verbose_name="Horário de Saída"
     )
+    duration_seconds = models.PositiveIntegerField(
+        blank=True, null=True, editable=False, verbose_name="Permanência (s)"
+    )
+    amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Valor",
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
     class Meta:
         verbose_name = "Registro"
         verbose_name_plural = "Registros"
+        indexes = [
+            models.Index(fields=["entry_time", "id"], name="parking_rec_entry_idx"),
+            models.Index(fields=["exit_time"], name="parking_rec_exit_idx"),
+            models.Index(
+                fields=["vehicle", "entry_time"], name="parking_rec_vehicle_entry_idx"
+            ),
+            models.Index(
+                fields=["parking_spot", "entry_time"], name="parking_rec_spot_entry_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["parking_spot"],
+                condition=models.Q(exit_time__isnull=True),
+                name="unique_open_record_per_spot",
+                violation_error_message="A vaga já possui um registro em aberto.",
+            ),
+            models.UniqueConstraint(
+                fields=["vehicle"],
+                condition=models.Q(exit_time__isnull=True),
+                name="unique_open_record_per_vehicle",
+                violation_error_message="O veículo já possui um registro em aberto.",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.vehicle} - {self.parking_spot} - {self.entry_time}"
+
+
+class ArchivedParkingRecord(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    vehicle = models.ForeignKey(
+        Vehicle,
+        on_delete=models.PROTECT,
+        related_name="archived_parking_records",
+        db_index=False,
+        verbose_name="Veículo",
+    )
+    parking_spot = models.ForeignKey(
+        ParkingSpot,
+        on_delete=models.PROTECT,
+        related_name="archived_parking_records",
+        db_index=False,
+        verbose_name="Vaga",
+    )
+    entry_time = models.DateTimeField(verbose_name="Horário de Entrada")
+    exit_time = models.DateTimeField(verbose_name="Horário de Saída")
+    duration_seconds = models.PositiveIntegerField(
+        null=True, verbose_name="Permanência (s)"
+    )
+    amount = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, verbose_name="Valor"
+    )
+    created_at = models.DateTimeField(verbose_name="Criado em")
+    updated_at = models.DateTimeField(verbose_name="Atualizado em")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arquivado em")
+
+    class Meta:
+        verbose_name = "Registro Arquivado"
+        verbose_name_plural = "Registros Arquivados"
+        indexes = [
+            models.Index(fields=["entry_time", "id"], name="archived_rec_entry_idx"),
+            models.Index(fields=["exit_time"], name="archived_rec_exit_idx"),
+            models.Index(
+                fields=["vehicle", "entry_time"], name="archived_rec_vehicle_entry_idx"
+            ),
+            models.Index(
+                fields=["parking_spot", "entry_time"],
+                name="archived_rec_spot_entry_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.vehicle} - {self.parking_spot} - {self.entry_time}"
+
+
+class ParkingRecordHistory(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    vehicle = models.ForeignKey(
+        Vehicle,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+        db_constraint=False,
+        verbose_name="Veículo",
+    )
+    parking_spot = models.ForeignKey(
+        ParkingSpot,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+        db_constraint=False,
+        verbose_name="Vaga",
+    )
+    entry_time = models.DateTimeField(verbose_name="Horário de Entrada")
+    exit_time = models.DateTimeField(null=True, verbose_name="Horário de Saída")
+    duration_seconds = models.PositiveIntegerField(
+        null=True, verbose_name="Permanência (s)"
+    )
+    amount = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, verbose_name="Valor"
+    )
+    created_at = models.DateTimeField(verbose_name="Criado em")
+    updated_at = models.DateTimeField(verbose_name="Atualizado em")
+    archived = models.BooleanField(verbose_name="Arquivado")
+
+    class Meta:
+        managed = False
+        db_table = "parking_parkingrecord_history"
+        verbose_name = "Histórico de Registros"
+        verbose_name_plural = "Históricos de Registros"
 
     def __str__(self):
         return f"{self.vehicle} - {self.parking_spot} - {self.entry_time}"
+
+
+class Tariff(models.Model):
+    vehicle_type = models.ForeignKey(
+        VehicleType,
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+        related_name="tariffs",
+        db_index=False,
+        verbose_name="Tipo do Veículo",
+    )
+    name = models.CharField(max_length=50, verbose_name="Nome")
+    grace_minutes = models.PositiveIntegerField(
+        default=0, verbose_name="Tolerância (min)"
+    )
+    daily_cap = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        blank=True,
+        null=True,
+        verbose_name="Teto Diário",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Tarifa"
+        verbose_name_plural = "Tarifas"
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vehicle_type"],
+                nulls_distinct=False,
+                name="unique_tariff_per_vehicle_type",
+                violation_error_message="Já existe uma tarifa para este tipo.",
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class TariffBand(models.Model):
+    tariff = models.ForeignKey(
+        Tariff,
+        on_delete=models.CASCADE,
+        related_name="bands",
+        verbose_name="Tarifa",
+    )
+    start_minute = models.PositiveIntegerField(verbose_name="A partir de (min)")
+    end_minute = models.PositiveIntegerField(
+        blank=True, null=True, verbose_name="Até (min)"
+    )
+    block_minutes = models.PositiveIntegerField(default=60, verbose_name="Fração (min)")
+    price = models.DecimalField(
+        max_digits=10, decimal_places=2, verbose_name="Valor por Fração"
+    )
+
+    class Meta:
+        verbose_name = "Faixa de Tarifa"
+        verbose_name_plural = "Faixas de Tarifa"
+        ordering = ["tariff", "start_minute"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tariff", "start_minute"], name="unique_band_start"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(block_minutes__gte=1),
+                name="tariff_band_block_positive",
+                violation_error_message="A fração deve ter ao menos 1 minuto.",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(end_minute__isnull=True)
+                | models.Q(end_minute__gt=models.F("start_minute")),
+                name="tariff_band_end_after_start",
+                violation_error_message="O fim da faixa deve ser após o início.",
+            ),
+        ]
+
+    def __str__(self):
+        end = self.end_minute if self.end_minute is not None else "∞"
+        return f"{self.tariff} ({self.start_minute}-{end} min)"
+
+
+class MonthlyStatement(models.Model):
+    customer = models.ForeignKey(
+        Customer,
+        on_delete=models.PROTECT,
+        related_name="statements",
+        verbose_name="Cliente",
+    )
+    period = models.DateField(verbose_name="Competência")
+    records = models.PositiveIntegerField(default=0, verbose_name="Registros")
+    duration_seconds = models.BigIntegerField(
+        default=0, verbose_name="Permanência Total (s)"
+    )
+    amount = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Valor Total"
+    )
+    generated_at = models.DateTimeField(auto_now=True, verbose_name="Gerado em")
+
+    class Meta:
+        verbose_name = "Extrato Mensal"
+        verbose_name_plural = "Extratos Mensais"
+        ordering = ["-period", "customer"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["customer", "period"], name="unique_statement_per_period"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["period", "customer"], name="statement_period_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.customer} - {self.period:%m/%Y}"
+
+
+class ParkingHourlyStats(models.Model):
+    bucket = models.DateTimeField(unique=True, verbose_name="Hora")
+    entries = models.PositiveIntegerField(default=0, verbose_name="Entradas")
+    exits = models.PositiveIntegerField(default=0, verbose_name="Saídas")
+    dwell_seconds = models.BigIntegerField(
+        default=0, verbose_name="Permanência Total (s)"
+    )
+    occupied_seconds = models.BigIntegerField(
+        default=0, verbose_name="Ocupação Total (s)"
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Estatística Horária"
+        verbose_name_plural = "Estatísticas Horárias"
+        ordering = ["bucket"]
+
+    def __str__(self):
+        return f"{self.bucket:%Y-%m-%d %H:%M}"
+
+
+class GateEvent(models.Model):
+    class EventType(models.TextChoices):
+        CHECK_IN = "check_in", "Entrada"
+        CHECK_OUT = "check_out", "Saída"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pendente"
+        PROCESSED = "processed", "Processado"
+        FAILED = "failed", "Falhou"
+
+    idempotency_key = models.CharField(
+        max_length=64, unique=True, verbose_name="Chave de Idempotência"
+    )
+    event_type = models.CharField(
+        max_length=10, choices=EventType.choices, verbose_name="Tipo"
+    )
+    license_plate = models.CharField(max_length=10, verbose_name="Placa")
+    parking_spot = models.PositiveIntegerField(
+        blank=True, null=True, verbose_name="Vaga"
+    )
+    occurred_at = models.DateTimeField(default=timezone.now, verbose_name="Ocorrido em")
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Situação",
+    )
+    error = models.CharField(max_length=255, blank=True, verbose_name="Erro")
+    record = models.ForeignKey(
+        ParkingRecord,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="gate_events",
+        db_index=False,
+        verbose_name="Registro",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    processed_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Processado em"
+    )
+
+    class Meta:
+        verbose_name = "Evento de Portaria"
+        verbose_name_plural = "Eventos de Portaria"
+        indexes = [
+            models.Index(
+                fields=["occurred_at", "id"],
+                condition=models.Q(status="pending"),
+                name="gate_event_pending_idx",
+            ),
+            models.Index(
+                fields=["record"],
+                condition=models.Q(record__isnull=False),
+                name="gate_event_record_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_event_type_display()} {self.license_plate}"
@@ -0,0 +1,151 @@
+import time
+from array import array
+from threading import RLock
+
+from django.conf import settings
+
+from .models import ParkingSpot
+
+
+class SpotOccupancy:
+    def __init__(self, resync_seconds=None):
+        self._lock = RLock()
+        self._resync_seconds = resync_seconds
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._slots = {}
+        self._spot_ids = array("q")
+        self._occupied = bytearray()
+        self._free = array("q")
+        self._free_pos = array("q")
+        self._removed = 0
+
+    @property
+    def resync_seconds(self):
+        if self._resync_seconds is not None:
+            return self._resync_seconds
+        return getattr(settings, "PARKING_OCCUPANCY_RESYNC_SECONDS", 300)
+
+    def load(self, spots):
+        with self._lock:
+            self._reset()
+            for spot_id, is_occupied in spots:
+                self._add_slot(spot_id, is_occupied)
+            self._loaded_at = time.monotonic()
+
+    def rebuild(self):
+        spots = ParkingSpot.objects.order_by("id").values_list("id", "is_occupied")
+        self.load(spots.iterator(chunk_size=5000))
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _is_stale(self, allow_resync=False):
+        return self._loaded_at is None or bool(
+            allow_resync
+            and self.resync_seconds
+            and time.monotonic() - self._loaded_at > self.resync_seconds
+        )
+
+    def _ensure_loaded(self, allow_resync=False):
+        with self._lock:
+            if self._is_stale(allow_resync):
+                self.rebuild()
+
+    def _add_slot(self, spot_id, is_occupied):
+        slot = len(self._spot_ids)
+        self._slots[spot_id] = slot
+        self._spot_ids.append(spot_id)
+        self._occupied.append(1 if is_occupied else 0)
+        self._free_pos.append(-1)
+        if not is_occupied:
+            self._push_free(slot)
+
+    def _push_free(self, slot):
+        self._free_pos[slot] = len(self._free)
+        self._free.append(slot)
+
+    def _remove_free(self, slot):
+        position = self._free_pos[slot]
+        last = self._free.pop()
+        if last != slot:
+            self._free[position] = last
+            self._free_pos[last] = position
+        self._free_pos[slot] = -1
+
+    def allocate_spot(self):
+        with self._lock:
+            self._ensure_loaded(allow_resync=True)
+            if not self._free:
+                return None
+            slot = self._free.pop()
+            self._free_pos[slot] = -1
+            self._occupied[slot] = 1
+            return self._spot_ids[slot]
+
+    def mark_occupied(self, spot_id):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            slot = self._slots.get(spot_id)
+            if slot is None or self._occupied[slot]:
+                return
+            self._remove_free(slot)
+            self._occupied[slot] = 1
+
+    def release_spot(self, spot_id):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            slot = self._slots.get(spot_id)
+            if slot is None or not self._occupied[slot]:
+                return
+            self._occupied[slot] = 0
+            self._push_free(slot)
+
+    def set_spot(self, spot_id, is_occupied):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if spot_id not in self._slots:
+                self._add_slot(spot_id, is_occupied)
+            elif is_occupied:
+                self.mark_occupied(spot_id)
+            else:
+                self.release_spot(spot_id)
+
+    def remove_spot(self, spot_id):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            slot = self._slots.pop(spot_id, None)
+            if slot is None:
+                return
+            if not self._occupied[slot]:
+                self._remove_free(slot)
+            self._occupied[slot] = 1
+            self._removed += 1
+
+    def summary(self):
+        with self._lock:
+            self._ensure_loaded(allow_resync=True)
+            return self._summary()
+
+    def snapshot(self):
+        # Never touches the database, so async views can call it in the event
+        # loop; returns None when the map must be (re)built through summary().
+        with self._lock:
+            if self._is_stale(allow_resync=True):
+                return None
+            return self._summary()
+
+    def _summary(self):
+        total = len(self._spot_ids) - self._removed
+        free = len(self._free)
+        return {"total": total, "free": free, "occupied": total - free}
+
+
+spot_occupancy = SpotOccupancy()
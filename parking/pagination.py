@@ -0,0 +1,9 @@
+from parking_service.pagination import DefaultCursorPagination
+
+
+class ParkingRecordCursorPagination(DefaultCursorPagination):
+    ordering = ("entry_time", "id")
+
+
+class MonthlyStatementCursorPagination(DefaultCursorPagination):
+    ordering = ("-period", "id")
@@ -0,0 +1,154 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.cache import cache
+from django.db import connection
+
+from parking_service.cache import get_model_cache_version, model_cache_key
+from vehicles.models import Vehicle
+
+from .models import ArchivedParkingRecord, ParkingRecord, Tariff, TariffBand
+
+DAY_SECONDS = 86400
+CENTS = Decimal("0.01")
+PRICED_FIELDS = ["duration_seconds", "amount"]
+
+
+def duration_seconds(entry_time, exit_time) -> int:
+    return max(int((exit_time - entry_time).total_seconds()), 0)
+
+
+class TariffPlan:
+    def __init__(self, grace_minutes: int, daily_cap, bands):
+        self.grace_seconds = grace_minutes * 60
+        self.daily_cap = daily_cap
+        self.bands = sorted(
+            (
+                start * 60,
+                None if end is None else end * 60,
+                block * 60,
+                price,
+            )
+            for start, end, block, price in bands
+        )
+
+    @classmethod
+    def from_tariff(cls, tariff: Tariff) -> "TariffPlan":
+        return cls(
+            tariff.grace_minutes,
+            tariff.daily_cap,
+            [
+                (band.start_minute, band.end_minute, band.block_minutes, band.price)
+                for band in tariff.bands.all()
+            ],
+        )
+
+    def _bands_amount(self, seconds: int) -> Decimal:
+        total = Decimal(0)
+        for start, end, block, price in self.bands:
+            billed = (seconds if end is None else min(seconds, end)) - start
+            if billed > 0:
+                total += -(-billed // block) * price
+        return total
+
+    def _capped(self, seconds: int) -> Decimal:
+        amount = self._bands_amount(seconds)
+        return amount if self.daily_cap is None else min(amount, self.daily_cap)
+
+    def amount(self, seconds: int) -> Decimal:
+        if seconds <= self.grace_seconds:
+            return Decimal("0.00")
+        if self.daily_cap is None:
+            total = self._bands_amount(seconds)
+        else:
+            days, rest = divmod(seconds, DAY_SECONDS)
+            total = days * self._capped(DAY_SECONDS) + self._capped(rest)
+        return total.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def tariff_plans() -> dict:
+    key = model_cache_key(Tariff, "plans", get_model_cache_version(TariffBand))
+    plans = cache.get(key)
+    if plans is None:
+        plans = {
+            tariff.vehicle_type_id: TariffPlan.from_tariff(tariff)
+            for tariff in Tariff.objects.prefetch_related("bands")
+        }
+        cache.set(key, plans, timeout=None)
+    return plans
+
+
+def _plan_for(plans: dict, vehicle_type_id):
+    return plans.get(vehicle_type_id, plans.get(None))
+
+
+def price_record(record) -> None:
+    price_records([record])
+
+
+def price_records(records) -> None:
+    closed = [record for record in records if record.exit_time is not None]
+    if not closed:
+        return
+    plans = tariff_plans()
+    vehicle_types = {}
+    if set(plans) - {None}:
+        vehicle_types = dict(
+            Vehicle.objects.filter(
+                pk__in={record.vehicle_id for record in closed}
+            ).values_list("pk", "vehicle_type_id")
+        )
+    for record in closed:
+        record.duration_seconds = duration_seconds(record.entry_time, record.exit_time)
+        plan = _plan_for(plans, vehicle_types.get(record.vehicle_id))
+        record.amount = plan.amount(record.duration_seconds) if plan else None
+
+
+def _reprice_sql(model, rows: int) -> str:
+    table = connection.ops.quote_name(model._meta.db_table)
+    values = ", ".join(["(%s::bigint, %s::integer, %s::numeric)"] * rows)
+    return f"""
+        UPDATE {table} AS record
+        SET duration_seconds = priced.duration_seconds, amount = priced.amount
+        FROM (VALUES {values}) AS priced (id, duration_seconds, amount)
+        WHERE record.id = priced.id
+    """
+
+
+def reprice_batch(model, queryset, after_id: int, batch_size: int, plans: dict):
+    rows = list(
+        queryset.filter(pk__gt=after_id)
+        .order_by("pk")
+        .values_list("pk", "entry_time", "exit_time", "vehicle__vehicle_type_id")[
+            :batch_size
+        ]
+    )
+    if not rows:
+        return None, 0
+
+    params = []
+    for pk, entry_time, exit_time, vehicle_type_id in rows:
+        seconds = duration_seconds(entry_time, exit_time)
+        plan = _plan_for(plans, vehicle_type_id)
+        params.extend([pk, seconds, plan.amount(seconds) if plan else None])
+    with connection.cursor() as cursor:
+        cursor.execute(_reprice_sql(model, len(rows)), params)
+    return rows[-1][0], len(rows)
+
+
+def reprice_records(batch_size: int = 5000, since=None, vehicle_type_id=None) -> int:
+    plans = tariff_plans()
+    repriced = 0
+    for model in (ParkingRecord, ArchivedParkingRecord):
+        queryset = model.objects.filter(exit_time__isnull=False)
+        if since is not None:
+            queryset = queryset.filter(exit_time__gte=since)
+        if vehicle_type_id is not None:
+            queryset = queryset.filter(vehicle__vehicle_type_id=vehicle_type_id)
+
+        last_id = 0
+        while True:
+            last_id, count = reprice_batch(model, queryset, last_id, batch_size, plans)
+            if not count:
+                break
+            repriced += count
+    return repriced
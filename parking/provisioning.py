@@ -0,0 +1,172 @@
+import csv
+import io
+import re
+
+from django.db import transaction
+
+from parking_service.cache import bump_model_cache_version
+
+from .models import ParkingSpot, ParkingZone
+from .occupancy import spot_occupancy
+from .zones import refresh_zone_counters
+
+MAX_SPOTS_PER_IMPORT = 20000
+SPOT_NUMBER_MAX_LENGTH = ParkingSpot._meta.get_field("spot_number").max_length
+LEVEL_MAX_LENGTH = ParkingZone._meta.get_field("level").max_length
+ZONE_MAX_LENGTH = ParkingZone._meta.get_field("name").max_length
+
+_RANGE_PATTERN = re.compile(
+    r"^(?P<prefix>[A-Z]*)(?P<start>\d+)-(?:(?P=prefix))?(?P<end>\d+)$"
+)
+
+
+class SpotNumberConflictError(Exception):
+    def __init__(self, spot_numbers):
+        super().__init__("Algumas vagas informadas já existem.")
+        self.spot_numbers = spot_numbers
+
+
+class SpotLayoutError(ValueError):
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} linha(s) do layout são inválidas.")
+        self.errors = errors
+
+
+def expand_spot_range(pattern: str) -> list[str]:
+    match = _RANGE_PATTERN.match(pattern.strip().upper())
+    if match is None:
+        raise ValueError(f"Intervalo inválido: {pattern}. Use o formato A001-A500.")
+    prefix, start = match["prefix"], match["start"]
+    first, last = int(start), int(match["end"])
+    if first > last:
+        raise ValueError(f"Intervalo inválido: {pattern}. O início excede o fim.")
+    if last - first + 1 > MAX_SPOTS_PER_IMPORT:
+        raise ValueError(
+            f"Cada importação aceita no máximo {MAX_SPOTS_PER_IMPORT} vagas."
+        )
+    return [f"{prefix}{number:0{len(start)}d}" for number in range(first, last + 1)]
+
+
+def spots_from_ranges(patterns, level="", zone="") -> list[dict]:
+    return [
+        {"spot_number": spot_number, "level": level, "zone": zone}
+        for pattern in patterns
+        for spot_number in expand_spot_range(pattern)
+    ]
+
+
+def parse_spot_layout(file) -> list[dict]:
+    if isinstance(file, bytes):
+        file = io.StringIO(file.decode("utf-8-sig"))
+    reader = csv.DictReader(file)
+    if "spot_number" not in (reader.fieldnames or []):
+        raise ValueError("O layout deve ter a coluna spot_number.")
+    return [
+        {
+            "spot_number": (row["spot_number"] or "").strip().upper(),
+            "level": (row.get("level") or "").strip(),
+            "zone": (row.get("zone") or "").strip(),
+        }
+        for row in reader
+    ]
+
+
+def _validate(spots):
+    if not spots:
+        raise ValueError("Informe ao menos uma vaga.")
+    if len(spots) > MAX_SPOTS_PER_IMPORT:
+        raise ValueError(
+            f"Cada importação aceita no máximo {MAX_SPOTS_PER_IMPORT} vagas."
+        )
+    errors = []
+    seen = set()
+    for row, spot in enumerate(spots, start=1):
+        error = _spot_error(spot, seen)
+        if error:
+            errors.append(
+                {"row": row, "spot_number": spot["spot_number"], "error": error}
+            )
+        seen.add(spot["spot_number"])
+    if errors:
+        raise SpotLayoutError(errors)
+
+
+def _spot_error(spot, seen):
+    spot_number = spot["spot_number"]
+    if not spot_number or len(spot_number) > SPOT_NUMBER_MAX_LENGTH:
+        return f"Número de vaga inválido: {spot_number!r}."
+    if spot_number in seen:
+        return f"A vaga {spot_number} aparece mais de uma vez."
+    if bool(spot["level"]) != bool(spot["zone"]):
+        return f"Informe nível e zona da vaga {spot_number}."
+    if len(spot["level"]) > LEVEL_MAX_LENGTH:
+        return f"O nível deve ter no máximo {LEVEL_MAX_LENGTH} caracteres."
+    if len(spot["zone"]) > ZONE_MAX_LENGTH:
+        return f"A zona deve ter no máximo {ZONE_MAX_LENGTH} caracteres."
+    return None
+
+
+def _resolve_zones(spots) -> dict:
+    keys = {(spot["level"], spot["zone"]) for spot in spots if spot["zone"]}
+    if not keys:
+        return {}
+    ParkingZone.objects.bulk_create(
+        [ParkingZone(level=level, name=name) for level, name in keys],
+        ignore_conflicts=True,
+    )
+    levels = {level for level, _ in keys}
+    return {
+        (zone.level, zone.name): zone.pk
+        for zone in ParkingZone.objects.filter(level__in=levels)
+        if (zone.level, zone.name) in keys
+    }
+
+
+def provision_spots(spots: list[dict], upsert: bool = False) -> dict:
+    _validate(spots)
+    spot_numbers = [spot["spot_number"] for spot in spots]
+
+    with transaction.atomic():
+        previous_zones = dict(
+            ParkingSpot.objects.filter(spot_number__in=spot_numbers).values_list(
+                "spot_number", "zone_id"
+            )
+        )
+        existing = set(previous_zones)
+        if existing and not upsert:
+            raise SpotNumberConflictError(sorted(existing))
+
+        zones = _resolve_zones(spots)
+        created = []
+        for update_fields, batch in (
+            (["zone", "updated_at"], [spot for spot in spots if spot["zone"]]),
+            (["updated_at"], [spot for spot in spots if not spot["zone"]]),
+        ):
+            created += ParkingSpot.objects.bulk_create(
+                [
+                    ParkingSpot(
+                        spot_number=spot["spot_number"],
+                        zone_id=zones.get((spot["level"], spot["zone"])),
+                    )
+                    for spot in batch
+                ],
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["spot_number"],
+                update_fields=update_fields,
+            )
+        refresh_zone_counters({*zones.values(), *previous_zones.values()})
+        bump_model_cache_version(ParkingSpot)
+        new_spots = [
+            (spot.pk, spot.is_occupied)
+            for spot in created
+            if spot.spot_number not in existing
+        ]
+
+        def track_new_spots():
+            for spot_id, is_occupied in new_spots:
+                spot_occupancy.set_spot(spot_id, is_occupied)
+
+        transaction.on_commit(track_new_spots)
+
+    return {"created": len(new_spots), "updated": len(existing)}
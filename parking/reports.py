@@ -0,0 +1,217 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, FloatField, Sum, Window
+from django.db.models.functions import Cast, NullIf, Rank, Trunc
+from django.utils import timezone
+
+from .models import ParkingHourlyStats, ParkingRecord, ParkingRecordHistory
+
+HOUR = timedelta(hours=1)
+INTERVAL_SECONDS = {"hour": 3600, "day": 86400}
+
+
+def _hour_floor(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _add_record(totals, entry_time, exit_time, sign=1):
+    totals[_hour_floor(entry_time)][0] += sign
+    exit_bucket = _hour_floor(exit_time)
+    totals[exit_bucket][1] += sign
+    totals[exit_bucket][2] += sign * int((exit_time - entry_time).total_seconds())
+
+    cursor = entry_time
+    while cursor < exit_time:
+        bucket = _hour_floor(cursor)
+        bucket_end = min(bucket + HOUR, exit_time)
+        totals[bucket][3] += sign * int((bucket_end - cursor).total_seconds())
+        cursor = bucket_end
+
+
+def _new_totals():
+    return defaultdict(lambda: [0, 0, 0, 0])
+
+
+def record_closed(record: ParkingRecord) -> None:
+    records_closed([record])
+
+
+def records_closed(records) -> None:
+    totals = _new_totals()
+    for record in records:
+        if record.exit_time is not None:
+            _add_record(totals, record.entry_time, record.exit_time)
+    _apply_totals_on_commit(totals)
+
+
+# Moves a record's contribution when a closed record is edited or reopened. Both
+# arguments are (entry_time, exit_time) pairs, or None when the record is not
+# counted in the hourly stats.
+def record_times_changed(previous_times, current_times) -> None:
+    totals = _new_totals()
+    if previous_times is not None:
+        _add_record(totals, *previous_times, sign=-1)
+    if current_times is not None:
+        _add_record(totals, *current_times)
+    _apply_totals_on_commit(totals)
+
+
+def _apply_totals_on_commit(totals) -> None:
+    # The upsert runs after the surrounding transaction commits, so the busy
+    # hourly rows are not kept locked for the whole check-out.
+    rows = sorted((bucket, row) for bucket, row in totals.items() if any(row))
+    if rows:
+        transaction.on_commit(lambda: _apply_totals(rows))
+
+
+def _apply_totals(rows) -> None:
+    table = connection.ops.quote_name(ParkingHourlyStats._meta.db_table)
+    increments = [(bucket, row) for bucket, row in rows if min(row) >= 0]
+    decrements = [(bucket, row) for bucket, row in rows if min(row) < 0]
+
+    with connection.cursor() as cursor:
+        if increments:
+            now = timezone.now()
+            params = []
+            for bucket, row in increments:
+                params.extend([bucket, *row, now])
+            values = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(increments))
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (
+                    bucket, entries, exits, dwell_seconds, occupied_seconds,
+                    updated_at
+                )
+                VALUES {values}
+                ON CONFLICT (bucket) DO UPDATE SET
+                    entries = {table}.entries + EXCLUDED.entries,
+                    exits = {table}.exits + EXCLUDED.exits,
+                    dwell_seconds = {table}.dwell_seconds + EXCLUDED.dwell_seconds,
+                    occupied_seconds =
+                        {table}.occupied_seconds + EXCLUDED.occupied_seconds,
+                    updated_at = EXCLUDED.updated_at
+                """,
+                params,
+            )
+        if decrements:
+            # Negative deltas only touch buckets the record was counted in; an
+            # upsert would try to insert them first and fail the >= 0 checks.
+            # GREATEST keeps a bucket that lost a contribution from going below
+            # zero until rebuild_parking_stats recomputes it.
+            params = [value for bucket, row in decrements for value in (bucket, *row)]
+            values = ", ".join(
+                ["(%s::timestamptz, %s::integer, %s::integer, %s::bigint, %s::bigint)"]
+                * len(decrements)
+            )
+            cursor.execute(
+                f"""
+                UPDATE {table} AS stats SET
+                    entries = GREATEST(stats.entries + delta.entries, 0),
+                    exits = GREATEST(stats.exits + delta.exits, 0),
+                    dwell_seconds = GREATEST(
+                        stats.dwell_seconds + delta.dwell_seconds, 0
+                    ),
+                    occupied_seconds = GREATEST(
+                        stats.occupied_seconds + delta.occupied_seconds, 0
+                    ),
+                    updated_at = now()
+                FROM (VALUES {values}) AS delta (
+                    bucket, entries, exits, dwell_seconds, occupied_seconds
+                )
+                WHERE stats.bucket = delta.bucket
+                """,
+                params,
+            )
+
+
+def rebuild_hourly_stats(chunk_size: int = 5000) -> int:
+    totals = _new_totals()
+    records = ParkingRecordHistory.objects.filter(exit_time__isnull=False).values_list(
+        "entry_time", "exit_time"
+    )
+    for entry_time, exit_time in records.iterator(chunk_size=chunk_size):
+        _add_record(totals, entry_time, exit_time)
+
+    with transaction.atomic():
+        ParkingHourlyStats.objects.all().delete()
+        ParkingHourlyStats.objects.bulk_create(
+            [
+                ParkingHourlyStats(
+                    bucket=bucket,
+                    entries=entries,
+                    exits=exits,
+                    dwell_seconds=dwell_seconds,
+                    occupied_seconds=occupied_seconds,
+                )
+                for bucket, (
+                    entries,
+                    exits,
+                    dwell_seconds,
+                    occupied_seconds,
+                ) in sorted(totals.items())
+            ],
+            batch_size=1000,
+        )
+    return len(totals)
+
+
+def _average_dwell():
+    return Cast(Sum("dwell_seconds"), FloatField()) / NullIf(Sum("exits"), 0)
+
+
+def occupancy_report(start, end, interval: str = "hour", total_spots: int = 0):
+    period_capacity = INTERVAL_SECONDS[interval] * total_spots
+    buckets = (
+        ParkingHourlyStats.objects.filter(bucket__gte=start, bucket__lt=end)
+        .annotate(period=Trunc("bucket", interval))
+        .values("period")
+        .annotate(
+            average_dwell_seconds=_average_dwell(),
+            entries=Sum("entries"),
+            exits=Sum("exits"),
+            occupied_seconds=Sum("occupied_seconds"),
+        )
+        .order_by("period")
+    )
+    for bucket in buckets:
+        bucket["occupancy_rate"] = (
+            bucket["occupied_seconds"] / period_capacity if period_capacity else None
+        )
+        yield bucket
+
+
+def summary_report(start, end, total_spots: int = 0) -> dict:
+    summary = ParkingHourlyStats.objects.filter(
+        bucket__gte=start, bucket__lt=end
+    ).aggregate(
+        entries=Sum("entries"),
+        sessions=Sum("exits"),
+        average_dwell_seconds=_average_dwell(),
+    )
+    sessions = summary["sessions"] or 0
+    return {
+        "entries": summary["entries"] or 0,
+        "sessions": sessions,
+        "average_dwell_seconds": summary["average_dwell_seconds"],
+        "total_spots": total_spots,
+        "turnover_per_spot": sessions / total_spots if total_spots else None,
+    }
+
+
+def spot_turnover_report(start, end, limit: int = 50):
+    spots = (
+        ParkingRecordHistory.objects.filter(exit_time__gte=start, exit_time__lt=end)
+        .values("parking_spot", spot_number=F("parking_spot__spot_number"))
+        .annotate(
+            sessions=Count("id"),
+            average_dwell=Avg(F("exit_time") - F("entry_time")),
+            rank=Window(Rank(), order_by=F("sessions").desc()),
+        )
+        .order_by("rank", "spot_number")[:limit]
+    )
+    for spot in spots:
+        average_dwell = spot.pop("average_dwell")
+        spot["average_dwell_seconds"] = average_dwell.total_seconds()
+        yield spot
@@ -1,6 +1,11 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 
-from .models import ParkingRecord, ParkingSpot
+from vehicles.models import Vehicle
+
+from .models import GateEvent, MonthlyStatement, ParkingRecord, ParkingSpot
 
 
 class ParkingSpotSerializer(serializers.ModelSerializer):
@@ -13,3 +18,86 @@ class ParkingRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = ParkingRecord
         fields = "__all__"
+
+
+class MonthlyStatementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MonthlyStatement
+        fields = "__all__"
+
+
+class SpotLayoutSerializer(serializers.Serializer):
+    spot_number = serializers.CharField(max_length=10)
+    level = serializers.CharField(max_length=20, required=False, default="")
+    zone = serializers.CharField(max_length=50, required=False, default="")
+
+    def validate_spot_number(self, value):
+        return value.strip().upper()
+
+
+class BulkSpotProvisioningSerializer(serializers.Serializer):
+    ranges = serializers.ListField(
+        child=serializers.CharField(max_length=30), required=False
+    )
+    level = serializers.CharField(max_length=20, required=False, default="")
+    zone = serializers.CharField(max_length=50, required=False, default="")
+    spots = SpotLayoutSerializer(many=True, required=False)
+    layout = serializers.FileField(required=False)
+    upsert = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        sources = [name for name in ("ranges", "spots", "layout") if attrs.get(name)]
+        if len(sources) != 1:
+            raise serializers.ValidationError(
+                "Informe exatamente uma origem: ranges, spots ou layout."
+            )
+        return attrs
+
+
+class CheckInSerializer(serializers.Serializer):
+    vehicle = serializers.PrimaryKeyRelatedField(queryset=Vehicle.objects.all())
+    parking_spot = serializers.IntegerField(min_value=1, required=False)
+
+
+class GateEventSerializer(serializers.ModelSerializer):
+    idempotency_key = serializers.CharField(max_length=64)
+    parking_spot = serializers.IntegerField(min_value=1, required=False)
+
+    class Meta:
+        model = GateEvent
+        fields = [
+            "idempotency_key",
+            "event_type",
+            "license_plate",
+            "parking_spot",
+            "occurred_at",
+        ]
+
+
+class ReportQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    interval = serializers.ChoiceField(choices=["hour", "day"], default="hour")
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=50)
+
+    def validate(self, attrs):
+        attrs.setdefault("end", timezone.now())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=1))
+        if attrs["start"] >= attrs["end"]:
+            raise serializers.ValidationError(
+                "A data inicial deve ser anterior à data final."
+            )
+        return attrs
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    output = serializers.ChoiceField(choices=["csv", "parquet"], default="csv")
+
+    def validate(self, attrs):
+        if "start" in attrs and "end" in attrs and attrs["start"] >= attrs["end"]:
+            raise serializers.ValidationError(
+                "A data inicial deve ser anterior à data final."
+            )
+        return attrs
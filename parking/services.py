@@ -0,0 +1,146 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from parking_service.cache import bump_model_cache_version
+
+from .events import publish_spot_event
+from .models import ParkingRecord, ParkingSpot
+from .occupancy import spot_occupancy
+from .pricing import PRICED_FIELDS, price_record
+from .reports import record_closed, record_times_changed
+from .zones import adjust_zone_free_spots
+
+
+class ParkingSpotUnavailableError(Exception):
+    pass
+
+
+class VehicleAlreadyParkedError(Exception):
+    pass
+
+
+class RecordAlreadyClosedError(Exception):
+    pass
+
+
+def occupy_spot(parking_spot_id: int) -> None:
+    updated = ParkingSpot.objects.filter(pk=parking_spot_id, is_occupied=False).update(
+        is_occupied=True, updated_at=timezone.now()
+    )
+    if not updated:
+        spot_occupancy.mark_occupied(parking_spot_id)
+        raise ParkingSpotUnavailableError("A vaga informada não está disponível.")
+    transaction.on_commit(lambda: spot_occupancy.mark_occupied(parking_spot_id))
+    adjust_zone_free_spots(parking_spot_id, -1)
+    bump_model_cache_version(ParkingSpot)
+    publish_spot_event(parking_spot_id, True)
+
+
+def occupy_free_spot() -> int:
+    stale = False
+    while True:
+        parking_spot_id = spot_occupancy.allocate_spot()
+        if parking_spot_id is None:
+            raise ParkingSpotUnavailableError("Não há vagas disponíveis.")
+        try:
+            occupy_spot(parking_spot_id)
+            return parking_spot_id
+        except ParkingSpotUnavailableError:
+            if not stale:
+                stale = True
+                spot_occupancy.rebuild()
+
+
+def release_spot(parking_spot_id: int) -> None:
+    released = ParkingSpot.objects.filter(pk=parking_spot_id, is_occupied=True).update(
+        is_occupied=False, updated_at=timezone.now()
+    )
+    if not released:
+        spot_occupancy.release_spot(parking_spot_id)
+    else:
+        transaction.on_commit(lambda: spot_occupancy.release_spot(parking_spot_id))
+        adjust_zone_free_spots(parking_spot_id, 1)
+        bump_model_cache_version(ParkingSpot)
+        publish_spot_event(parking_spot_id, False)
+
+
+def check_in(vehicle_id: int, parking_spot_id: int = None) -> ParkingRecord:
+    if not vehicle_id:
+        raise ValueError("O veículo é obrigatório.")
+
+    occupied_spot_id = None
+    try:
+        with transaction.atomic():
+            if parking_spot_id:
+                occupy_spot(parking_spot_id)
+                occupied_spot_id = parking_spot_id
+            else:
+                occupied_spot_id = occupy_free_spot()
+            return ParkingRecord.objects.create(
+                vehicle_id=vehicle_id, parking_spot_id=occupied_spot_id
+            )
+    except IntegrityError as e:
+        constraint = getattr(
+            getattr(e.__cause__, "diag", None), "constraint_name", None
+        )
+        if constraint == "unique_open_record_per_spot":
+            # The flag said free but the spot still has an open record, so the
+            # allocator must not hand it out again.
+            spot_occupancy.mark_occupied(occupied_spot_id)
+            raise ParkingSpotUnavailableError(
+                "A vaga informada não está disponível."
+            ) from e
+        spot_occupancy.release_spot(occupied_spot_id)
+        if constraint == "unique_open_record_per_vehicle":
+            raise VehicleAlreadyParkedError(
+                "O veículo já possui um registro em aberto."
+            ) from e
+        raise
+
+
+def check_out(record: ParkingRecord) -> ParkingRecord:
+    with transaction.atomic():
+        record = (
+            ParkingRecord.objects.select_for_update()
+            .filter(pk=record.pk, exit_time__isnull=True)
+            .first()
+        )
+        if record is None:
+            raise RecordAlreadyClosedError("Este registro já possui saída registrada.")
+        record.exit_time = timezone.now()
+        price_record(record)
+        record.save(update_fields=["exit_time", "updated_at", *PRICED_FIELDS])
+        release_spot(record.parking_spot_id)
+        record_closed(record)
+
+    return record
+
+
+def apply_record_changes(
+    record: ParkingRecord,
+    previous_spot_id: int = None,
+    was_open: bool = False,
+    previous_times: tuple = None,
+    deleted: bool = False,
+) -> None:
+    is_open = record.exit_time is None and not deleted
+    spot_changed = previous_spot_id != record.parking_spot_id
+
+    if was_open and (not is_open or spot_changed):
+        release_spot(previous_spot_id)
+    if is_open and (not was_open or spot_changed):
+        occupy_spot(record.parking_spot_id)
+    if not is_open and not deleted:
+        price_record(record)
+        ParkingRecord.objects.filter(pk=record.pk).update(
+            **{field: getattr(record, field) for field in PRICED_FIELDS}
+        )
+
+    counted_times = None if was_open else previous_times
+    current_times = (
+        None if is_open or deleted else (record.entry_time, record.exit_time)
+    )
+    if was_open and current_times is not None:
+        record_closed(record)
+    elif counted_times != current_times:
+        record_times_changed(counted_times, current_times)
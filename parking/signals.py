@@ -1,11 +1,47 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import ParkingRecord
+from parking_service.cache import connect_cache_invalidation
 
+from .events import publish_spot_event
+from .models import ParkingRecord, ParkingSpot, Tariff, TariffBand
+from .occupancy import spot_occupancy
+from .services import apply_record_changes
+from .zones import refresh_zone_counters
 
-@receiver(post_save, sender=ParkingRecord)
-def update_parking_spot_status(sender, instance, created, **kwargs):
-    parking_spot = instance.parking_spot
-    parking_spot.is_occupied = instance.exit_time is None
-    parking_spot.save()
+connect_cache_invalidation(ParkingSpot, Tariff, TariffBand)
+
+
+@receiver(pre_save, sender=ParkingSpot)
+def remember_parking_spot_zone(sender, instance, **kwargs):
+    instance._previous_zone_id = (
+        ParkingSpot.objects.filter(pk=instance.pk)
+        .values_list("zone_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=ParkingSpot)
+def track_parking_spot_state(sender, instance, **kwargs):
+    spot_occupancy.set_spot(instance.pk, instance.is_occupied)
+    publish_spot_event(instance.pk, instance.is_occupied)
+    refresh_zone_counters({instance.zone_id, instance._previous_zone_id})
+
+
+@receiver(post_delete, sender=ParkingSpot)
+def untrack_parking_spot(sender, instance, **kwargs):
+    spot_occupancy.remove_spot(instance.pk)
+    refresh_zone_counters({instance.zone_id})
+
+
+@receiver(post_delete, sender=ParkingRecord)
+def unapply_deleted_parking_record(sender, instance, **kwargs):
+    apply_record_changes(
+        instance,
+        previous_spot_id=instance.parking_spot_id,
+        was_open=instance.exit_time is None,
+        previous_times=(instance.entry_time, instance.exit_time),
+        deleted=True,
+    )
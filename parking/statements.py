@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import MonthlyStatement, ParkingRecordHistory
+
+STATEMENT_FIELDS = ["records", "duration_seconds", "amount"]
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def previous_month(today: date = None) -> date:
+    today = today or timezone.localdate()
+    return month_start(month_start(today) - timedelta(days=1))
+
+
+def month_bounds(period: date) -> tuple[datetime, datetime]:
+    period = month_start(period)
+    following = (period + timedelta(days=32)).replace(day=1)
+    return (
+        timezone.make_aware(datetime.combine(period, time.min)),
+        timezone.make_aware(datetime.combine(following, time.min)),
+    )
+
+
+def statement_totals(period: date):
+    start, end = month_bounds(period)
+    return (
+        ParkingRecordHistory.objects.filter(
+            exit_time__gte=start,
+            exit_time__lt=end,
+            vehicle__owner__isnull=False,
+        )
+        .values("vehicle__owner_id")
+        .annotate(
+            records=Count("id"),
+            duration_seconds=Sum("duration_seconds", default=0),
+            amount=Sum("amount", default=0),
+        )
+        .order_by("vehicle__owner_id")
+    )
+
+
+def save_statements(statements) -> int:
+    MonthlyStatement.objects.bulk_create(
+        statements,
+        update_conflicts=True,
+        unique_fields=["customer", "period"],
+        update_fields=[*STATEMENT_FIELDS, "generated_at"],
+    )
+    return len(statements)
+
+
+def _save_in_worker(statements) -> int:
+    try:
+        return save_statements(statements)
+    finally:
+        connection.close()
+
+
+def generate_statements(period: date, workers: int = 4, batch_size: int = 1000) -> int:
+    # The month is aggregated in a single grouped scan of the history view; only
+    # the upserts are split into batches and fanned out to the workers.
+    period = month_start(period)
+    started = timezone.now()
+    statements = [
+        MonthlyStatement(
+            customer_id=row["vehicle__owner_id"],
+            period=period,
+            **{field: row[field] for field in STATEMENT_FIELDS},
+        )
+        for row in statement_totals(period).iterator(chunk_size=batch_size)
+    ]
+    batches = [
+        statements[offset : offset + batch_size]
+        for offset in range(0, len(statements), batch_size)
+    ]
+    if workers <= 1:
+        generated = sum(save_statements(batch) for batch in batches)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            generated = sum(executor.map(_save_in_worker, batches))
+
+    # Every statement of this run was just upserted, so older rows belong to
+    # customers without closed records in the month.
+    MonthlyStatement.objects.filter(period=period, generated_at__lt=started).delete()
+    return generated
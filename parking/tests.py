@@ -1,11 +1,65 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
+from types import SimpleNamespace
+
 import pytest
-from django.contrib.auth.models import User
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.db.models import Q, Sum
+from django.test import AsyncClient
 from django.utils import timezone
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-from vehicles.models import Vehicle
+from customers.models import Customer
+from parking_service.filters import IndexedRQLFilterBackend, IndexedRQLFilterClass
+from parking_service.idempotency import idempotency_key
+from parking_service.instrumentation import request_metrics
+from parking_service.models import IdempotencyKey
+from vehicles.models import Vehicle, VehicleType
+from vehicles.plates import PlateOCRKey
 
-from .models import ParkingRecord, ParkingSpot
+from .events import (
+    PostgresSpotEventListener,
+    SpotEventBroker,
+    publish_spot_event,
+    spot_events,
+)
+from .ingestion import enqueue_gate_events, process_gate_events
+from .models import (
+    ArchivedParkingRecord,
+    GateEvent,
+    MonthlyStatement,
+    ParkingHourlyStats,
+    ParkingRecord,
+    ParkingRecordHistory,
+    ParkingSpot,
+    ParkingZone,
+    Tariff,
+)
+from .occupancy import SpotOccupancy, spot_occupancy
+from .pricing import TariffPlan
+from .provisioning import provision_spots
+from .reports import record_closed
+from .services import (
+    ParkingSpotUnavailableError,
+    RecordAlreadyClosedError,
+    check_in,
+    check_out,
+    occupy_spot,
+)
+from .statements import generate_statements
+from .views import _spot_event_messages
 
 
 @pytest.fixture
@@ -18,6 +72,30 @@ def admin_client():
     return client
 
 
+@pytest.fixture
+def regular_user_client():
+    user = User.objects.create_user(username="user", password="password")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, user
+
+
+@pytest.fixture
+def owned_records():
+    def build(user, count=5):
+        owner = Customer.objects.create(name="Dono", user=user)
+        records = []
+        for number in range(count):
+            spot = ParkingSpot.objects.create(spot_number=f"Q{number}")
+            vehicle = Vehicle.objects.create(license_plate=f"OWN{number}", owner=owner)
+            records.append(
+                ParkingRecord.objects.create(parking_spot=spot, vehicle=vehicle)
+            )
+        return records
+
+    return build
+
+
 @pytest.mark.django_db
 def test_parking_spot_model_str():
     spot = ParkingSpot.objects.create(spot_number="A1")
@@ -29,8 +107,8 @@ def test_parking_spot_api_list(admin_client):
     ParkingSpot.objects.create(spot_number="B2")
     response = admin_client.get("/api/v1/parking/spots/")
     assert response.status_code == 200
-    assert len(response.data) > 0
-    assert response.data[0]["spot_number"] == "B2"
+    assert len(response.data["results"]) > 0
+    assert response.data["results"][0]["spot_number"] == "B2"
 
 
 @pytest.mark.django_db
@@ -44,14 +122,1857 @@ def test_parking_record_api_create(admin_client):
 
 
 @pytest.mark.django_db
-def test_parking_spot_is_occupied_signal():
+def test_parking_record_api_create_occupies_spot(admin_client):
     spot = ParkingSpot.objects.create(spot_number="A1")
     vehicle = Vehicle.objects.create(license_plate="SIGNAL12")
+    response = admin_client.post(
+        "/api/v1/parking/records/",
+        {"parking_spot": spot.id, "vehicle": vehicle.id},
+        format="json",
+    )
+    assert response.status_code == 201
+    spot.refresh_from_db()
+    assert spot.is_occupied is True
+
+    response = admin_client.patch(
+        f"/api/v1/parking/records/{response.data['id']}/",
+        {"exit_time": timezone.now().isoformat()},
+        format="json",
+    )
+    assert response.status_code == 200
+    spot.refresh_from_db()
     assert spot.is_occupied is False
-    parking_record = ParkingRecord.objects.create(parking_spot=spot, vehicle=vehicle)
+
+
+@pytest.mark.django_db
+def test_parking_record_api_create_rejects_occupied_spot(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="A2", is_occupied=True)
+    vehicle = Vehicle.objects.create(license_plate="BUSY123")
+    response = admin_client.post(
+        "/api/v1/parking/records/",
+        {"parking_spot": spot.id, "vehicle": vehicle.id},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert "parking_spot" in response.data
+    assert ParkingRecord.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_service_check_in_and_check_out():
+    spot = ParkingSpot.objects.create(spot_number="S1")
+    vehicle = Vehicle.objects.create(license_plate="SERV123")
+
+    record = check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
     spot.refresh_from_db()
     assert spot.is_occupied is True
-    parking_record.exit_time = timezone.now()
-    parking_record.save()
+    assert record.exit_time is None
+
+    check_out(record)
+    record.refresh_from_db()
+    spot.refresh_from_db()
+    assert record.exit_time is not None
+    assert spot.is_occupied is False
+
+
+@pytest.mark.django_db
+def test_service_check_in_rejects_occupied_spot():
+    spot = ParkingSpot.objects.create(spot_number="S2")
+    first = Vehicle.objects.create(license_plate="FIRST1")
+    second = Vehicle.objects.create(license_plate="SECOND2")
+    check_in(vehicle_id=first.id, parking_spot_id=spot.id)
+
+    with pytest.raises(ParkingSpotUnavailableError):
+        check_in(vehicle_id=second.id, parking_spot_id=spot.id)
+    assert ParkingRecord.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_service_check_out_rejects_closed_record():
+    spot = ParkingSpot.objects.create(spot_number="S3")
+    vehicle = Vehicle.objects.create(license_plate="CLOSED1")
+    record = check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
+    check_out(record)
+
+    with pytest.raises(RecordAlreadyClosedError, match="já possui saída registrada"):
+        check_out(record)
+
+
+@pytest.mark.django_db
+def test_service_check_out_prices_the_locked_record():
+    spot = ParkingSpot.objects.create(spot_number="S4")
+    vehicle = Vehicle.objects.create(license_plate="LOCK123")
+    stale = check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
+    ParkingRecord.objects.filter(pk=stale.pk).update(
+        entry_time=timezone.now() - timedelta(minutes=90)
+    )
+
+    record = check_out(stale)
+
+    assert 90 * 60 <= record.duration_seconds < 91 * 60
+    stored = ParkingRecord.objects.get(pk=stale.pk)
+    assert (stored.exit_time, stored.duration_seconds) == (
+        record.exit_time,
+        record.duration_seconds,
+    )
+
+
+@pytest.mark.django_db
+def test_api_check_in_and_check_out(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="G1")
+    vehicle = Vehicle.objects.create(license_plate="GATE123")
+
+    response = admin_client.post(
+        "/api/v1/parking/records/check-in/",
+        {"vehicle": vehicle.id, "parking_spot": spot.id},
+        format="json",
+    )
+    assert response.status_code == 201
+    assert response.data["exit_time"] is None
+    record_id = response.data["id"]
+
+    response = admin_client.post(f"/api/v1/parking/records/{record_id}/check-out/")
+    assert response.status_code == 200
+    assert response.data["exit_time"] is not None
+    spot.refresh_from_db()
+    assert spot.is_occupied is False
+
+
+@pytest.mark.django_db
+def test_api_check_in_conflict_on_occupied_spot(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="G2", is_occupied=True)
+    vehicle = Vehicle.objects.create(license_plate="GATE456")
+
+    response = admin_client.post(
+        "/api/v1/parking/records/check-in/",
+        {"vehicle": vehicle.id, "parking_spot": spot.id},
+        format="json",
+    )
+    assert response.status_code == 409
+    assert "error" in response.data
+
+
+@pytest.mark.django_db
+def test_api_check_in_handles_invalid_vehicle(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="G3")
+    response = admin_client.post(
+        "/api/v1/parking/records/check-in/",
+        {"vehicle": 999, "parking_spot": spot.id},
+        format="json",
+    )
+    assert response.status_code == 400
     spot.refresh_from_db()
     assert spot.is_occupied is False
+
+
+@pytest.mark.django_db
+def test_api_check_out_conflict_on_closed_record(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="G4")
+    vehicle = Vehicle.objects.create(license_plate="GATE789")
+    record = ParkingRecord.objects.create(
+        parking_spot=spot, vehicle=vehicle, exit_time=timezone.now()
+    )
+    response = admin_client.post(f"/api/v1/parking/records/{record.id}/check-out/")
+    assert response.status_code == 409
+
+
+@pytest.mark.django_db
+def test_parking_record_api_list_is_cursor_paginated(admin_client):
+    for number in range(3):
+        spot = ParkingSpot.objects.create(spot_number=f"P{number}")
+        vehicle = Vehicle.objects.create(license_plate=f"PAGE{number}")
+        ParkingRecord.objects.create(parking_spot=spot, vehicle=vehicle)
+
+    response = admin_client.get("/api/v1/parking/records/?page_size=2")
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 2
+    assert response.data["next"] is not None
+
+    response = admin_client.get(response.data["next"])
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 1
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_parking_record_api_list_streams_ndjson(admin_client):
+    vehicle = Vehicle.objects.create(license_plate="STREAM1")
+    for number in range(3):
+        spot = ParkingSpot.objects.create(spot_number=f"N{number}")
+        ParkingRecord.objects.create(
+            parking_spot=spot, vehicle=vehicle, exit_time=timezone.now()
+        )
+
+    response = admin_client.get("/api/v1/parking/records/?stream=ndjson")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert len(rows) == 3
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert rows[0]["vehicle"] == vehicle.id
+
+
+@pytest.mark.django_db
+def test_api_check_in_conflict_on_vehicle_already_parked(admin_client):
+    vehicle = Vehicle.objects.create(license_plate="TWICE12")
+    first = ParkingSpot.objects.create(spot_number="T1")
+    second = ParkingSpot.objects.create(spot_number="T2")
+    check_in(vehicle_id=vehicle.id, parking_spot_id=first.id)
+
+    response = admin_client.post(
+        "/api/v1/parking/records/check-in/",
+        {"vehicle": vehicle.id, "parking_spot": second.id},
+        format="json",
+    )
+    assert response.status_code == 409
+    second.refresh_from_db()
+    assert second.is_occupied is False
+
+
+@pytest.mark.django_db
+def test_check_in_maps_open_record_constraints_to_errors():
+    spot = ParkingSpot.objects.create(spot_number="T5")
+    check_in(vehicle_id=Vehicle.objects.create(license_plate="TWICE56").id)
+    ParkingSpot.objects.filter(pk=spot.pk).update(is_occupied=False)
+
+    with pytest.raises(ParkingSpotUnavailableError):
+        check_in(
+            vehicle_id=Vehicle.objects.create(license_plate="TWICE78").id,
+            parking_spot_id=spot.id,
+        )
+    assert ParkingRecord.objects.filter(exit_time__isnull=True).count() == 1
+
+
+@pytest.mark.django_db
+def test_parking_record_api_create_rejects_vehicle_already_parked(admin_client):
+    vehicle = Vehicle.objects.create(license_plate="TWICE34")
+    first = ParkingSpot.objects.create(spot_number="T3")
+    second = ParkingSpot.objects.create(spot_number="T4")
+    check_in(vehicle_id=vehicle.id, parking_spot_id=first.id)
+
+    response = admin_client.post(
+        "/api/v1/parking/records/",
+        {"parking_spot": second.id, "vehicle": vehicle.id},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert ParkingRecord.objects.count() == 1
+
+
+@pytest.fixture
+def index_only_planner():
+    if connection.vendor != "postgresql":
+        pytest.skip("Os planos de execução são verificados apenas no PostgreSQL.")
+    spots = ParkingSpot.objects.bulk_create(
+        ParkingSpot(spot_number=f"IDX{n}", is_occupied=n % 2 == 0) for n in range(200)
+    )
+    vehicles = Vehicle.objects.bulk_create(
+        Vehicle(license_plate=f"IDX{n}", plate_normalized=f"IDX{n}") for n in range(200)
+    )
+    ParkingRecord.objects.bulk_create(
+        ParkingRecord(vehicle=vehicle, parking_spot=spot)
+        for vehicle, spot in zip(vehicles, spots, strict=True)
+        if spot.is_occupied
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ANALYZE parking_parkingspot, parking_parkingrecord, "
+            "parking_archivedparkingrecord, vehicles_vehicle"
+        )
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("build_queryset", "index_name"),
+    [
+        (
+            lambda: ParkingSpot.objects.filter(is_occupied=False),
+            "parking_spot_free_idx",
+        ),
+        (
+            lambda: ParkingRecord.objects.filter(
+                parking_spot_id=1, exit_time__isnull=True
+            ),
+            "unique_open_record_per_spot",
+        ),
+        (
+            lambda: ParkingRecord.objects.filter(vehicle_id=1, exit_time__isnull=True),
+            "unique_open_record_per_vehicle",
+        ),
+        (
+            lambda: ParkingRecord.objects.filter(vehicle_id=1).order_by("-entry_time"),
+            "parking_rec_vehicle_entry_idx",
+        ),
+        (
+            lambda: ParkingRecord.objects.filter(parking_spot_id=1).order_by(
+                "-entry_time"
+            ),
+            "parking_rec_spot_entry_idx",
+        ),
+        (
+            lambda: ParkingRecord.objects.order_by("entry_time", "id")[:50],
+            "parking_rec_entry_idx",
+        ),
+        (
+            lambda: ParkingRecordHistory.objects.order_by("entry_time", "id")[:50],
+            "archived_rec_entry_idx",
+        ),
+        (
+            lambda: Vehicle.objects.filter(plate_normalized__startswith="IDX1"),
+            "vehicle_plate_normalized_idx",
+        ),
+        (
+            lambda: Vehicle.objects.alias(
+                ocr_key=PlateOCRKey("plate_normalized")
+            ).filter(ocr_key__startswith="1DX1"),
+            "vehicle_plate_ocr_key_idx",
+        ),
+    ],
+)
+def test_hot_queries_use_indexes(index_only_planner, build_queryset, index_name):
+    plan = build_queryset().explain()
+    assert index_name in plan
+    assert "Seq Scan" not in plan
+
+
+def test_spot_occupancy_allocates_and_releases():
+    occupancy = SpotOccupancy()
+    occupancy.load([(1, False), (2, True), (3, False)])
+    assert occupancy.summary() == {"total": 3, "free": 2, "occupied": 1}
+
+    allocated = {occupancy.allocate_spot(), occupancy.allocate_spot()}
+    assert allocated == {1, 3}
+    assert occupancy.allocate_spot() is None
+
+    occupancy.release_spot(2)
+    assert occupancy.summary() == {"total": 3, "free": 1, "occupied": 2}
+    assert occupancy.allocate_spot() == 2
+
+
+def test_spot_occupancy_tracks_spot_changes():
+    occupancy = SpotOccupancy()
+    occupancy.load([(1, False), (2, False), (3, False)])
+
+    occupancy.mark_occupied(2)
+    occupancy.remove_spot(1)
+    occupancy.set_spot(4, False)
+    assert occupancy.summary() == {"total": 3, "free": 2, "occupied": 1}
+    assert {occupancy.allocate_spot(), occupancy.allocate_spot()} == {3, 4}
+    assert occupancy.allocate_spot() is None
+
+
+@pytest.mark.django_db
+def test_spot_occupancy_ignores_rolled_back_changes(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="RB1")
+    vehicle = Vehicle.objects.create(license_plate="RBK1234")
+    spot_occupancy.rebuild()
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        occupy_spot(spot.id)
+        raise RuntimeError
+
+    assert not ParkingSpot.objects.get(pk=spot.pk).is_occupied
+    assert spot_occupancy.summary()["free"] == 1
+    response = admin_client.post(
+        "/api/v1/parking/records/check-in/", {"vehicle": vehicle.id}, format="json"
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.django_db
+def test_spot_occupancy_summary_resyncs_stale_map():
+    occupancy = SpotOccupancy(resync_seconds=60)
+    spot = ParkingSpot.objects.create(spot_number="RS1")
+    occupancy.rebuild()
+    ParkingSpot.objects.filter(pk=spot.pk).update(is_occupied=True)
+
+    assert occupancy.summary()["free"] == 1
+    occupancy._loaded_at -= 61
+    assert occupancy.summary()["free"] == 0
+
+
+@pytest.mark.django_db
+def test_api_spot_availability_does_not_query_spots(
+    admin_client, django_assert_num_queries
+):
+    ParkingSpot.objects.create(spot_number="V1")
+    ParkingSpot.objects.create(spot_number="V2", is_occupied=True)
+    spot_occupancy.rebuild()
+
+    with django_assert_num_queries(0):
+        response = admin_client.get("/api/v1/parking/spots/availability/")
+    assert response.status_code == 200
+    assert response.data == {"total": 2, "free": 1, "occupied": 1}
+
+
+@pytest.mark.django_db
+def test_api_check_in_allocates_free_spot(admin_client):
+    ParkingSpot.objects.create(spot_number="F1", is_occupied=True)
+    free = ParkingSpot.objects.create(spot_number="F2")
+    vehicle = Vehicle.objects.create(license_plate="ALLOC12")
+    spot_occupancy.rebuild()
+
+    response = admin_client.post(
+        "/api/v1/parking/records/check-in/", {"vehicle": vehicle.id}, format="json"
+    )
+    assert response.status_code == 201
+    assert response.data["parking_spot"] == free.id
+    assert spot_occupancy.summary()["free"] == 0
+
+    other = Vehicle.objects.create(license_plate="ALLOC34")
+    response = admin_client.post(
+        "/api/v1/parking/records/check-in/", {"vehicle": other.id}, format="json"
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.django_db
+def test_service_check_in_recovers_from_stale_occupancy():
+    first = ParkingSpot.objects.create(spot_number="R1")
+    second = ParkingSpot.objects.create(spot_number="R2")
+    vehicle = Vehicle.objects.create(license_plate="STALE12")
+    spot_occupancy.load([(first.id, False), (second.id, False)])
+    ParkingSpot.objects.filter(pk=second.pk).update(is_occupied=True)
+
+    record = check_in(vehicle_id=vehicle.id)
+    assert record.parking_spot_id == first.id
+    assert spot_occupancy.summary() == {"total": 2, "free": 0, "occupied": 2}
+
+
+@pytest.mark.django_db
+def test_parking_spot_api_query_counts(admin_client, django_assert_max_num_queries):
+    spots = [ParkingSpot.objects.create(spot_number=f"Z{n}") for n in range(5)]
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get("/api/v1/parking/spots/")
+    assert response.status_code == 200
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get(f"/api/v1/parking/spots/{spots[0].id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_parking_record_api_query_counts_for_staff(
+    admin_client, owned_records, django_assert_max_num_queries
+):
+    owner = User.objects.create_user(username="dono", password="password")
+    records = owned_records(owner)
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get("/api/v1/parking/records/")
+    assert len(response.data["results"]) == len(records)
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get(f"/api/v1/parking/records/{records[0].id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_parking_record_api_query_counts_for_owner(
+    regular_user_client, owned_records, django_assert_max_num_queries
+):
+    client, user = regular_user_client
+    records = owned_records(user)
+
+    with django_assert_max_num_queries(1):
+        response = client.get("/api/v1/parking/records/")
+    assert len(response.data["results"]) == len(records)
+
+    with django_assert_max_num_queries(1):
+        response = client.get(f"/api/v1/parking/records/{records[0].id}/")
+    assert response.status_code == 200
+
+
+def closed_record(spot_number, plate, entry_time, exit_time):
+    record = ParkingRecord.objects.create(
+        parking_spot=ParkingSpot.objects.create(spot_number=spot_number),
+        vehicle=Vehicle.objects.create(license_plate=plate),
+        exit_time=exit_time,
+    )
+    ParkingRecord.objects.filter(pk=record.pk).update(entry_time=entry_time)
+    record.entry_time = entry_time
+    return record
+
+
+@pytest.mark.django_db
+def test_record_closed_rolls_up_hourly_stats(django_capture_on_commit_callbacks):
+    base = datetime(2025, 8, 1, 10, 0, tzinfo=dt_timezone.utc)
+    first = closed_record(
+        "H1", "HOUR001", base + timedelta(minutes=30), base + timedelta(hours=2)
+    )
+    second = closed_record(
+        "H2", "HOUR002", base + timedelta(minutes=45), base + timedelta(minutes=55)
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        record_closed(first)
+        record_closed(second)
+
+    stats = {
+        item.bucket: item
+        for item in ParkingHourlyStats.objects.filter(bucket__gte=base)
+    }
+    assert stats[base].entries == 2
+    assert stats[base].exits == 1
+    assert stats[base].dwell_seconds == 600
+    assert stats[base].occupied_seconds == 1800 + 600
+    assert stats[base + timedelta(hours=1)].occupied_seconds == 3600
+    assert stats[base + timedelta(hours=2)].exits == 1
+    assert stats[base + timedelta(hours=2)].dwell_seconds == 5400
+
+    snapshot = sorted(
+        ParkingHourlyStats.objects.values_list(
+            "bucket", "entries", "exits", "dwell_seconds", "occupied_seconds"
+        )
+    )
+    call_command("rebuild_parking_stats", stdout=None)
+    assert snapshot == sorted(
+        ParkingHourlyStats.objects.values_list(
+            "bucket", "entries", "exits", "dwell_seconds", "occupied_seconds"
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_check_out_updates_hourly_stats(django_capture_on_commit_callbacks):
+    spot = ParkingSpot.objects.create(spot_number="H3")
+    vehicle = Vehicle.objects.create(license_plate="HOUR003")
+    record = check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        check_out(record)
+
+    assert ParkingHourlyStats.objects.aggregate(total=Sum("exits"))["total"] == 1
+
+
+def _hourly_stats():
+    return list(
+        ParkingHourlyStats.objects.filter(
+            Q(entries__gt=0) | Q(exits__gt=0) | Q(occupied_seconds__gt=0)
+        ).values_list("bucket", "entries", "exits", "occupied_seconds")
+    )
+
+
+@pytest.mark.django_db
+def test_record_edits_adjust_hourly_stats(
+    admin_client, django_capture_on_commit_callbacks
+):
+    base = datetime(2025, 8, 1, 10, 0, tzinfo=dt_timezone.utc)
+    record = closed_record("H6", "HOUR006", base, base + timedelta(minutes=30))
+    with django_capture_on_commit_callbacks(execute=True):
+        record_closed(record)
+
+    url = f"/api/v1/parking/records/{record.id}/"
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.patch(
+            url, {"exit_time": base + timedelta(hours=1, minutes=30)}, format="json"
+        )
+    assert response.status_code == 200
+    assert _hourly_stats() == [
+        (base, 1, 0, 3600),
+        (base + timedelta(hours=1), 0, 1, 1800),
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.patch(url, {"exit_time": None}, format="json")
+    assert response.status_code == 200
+    assert _hourly_stats() == []
+
+
+@pytest.mark.django_db
+def test_deleting_records_unapplies_stats_and_spot(
+    admin_client, django_capture_on_commit_callbacks
+):
+    base = datetime(2025, 8, 1, 10, 0, tzinfo=dt_timezone.utc)
+    closed = closed_record("H8", "HOUR008", base, base + timedelta(minutes=30))
+    with django_capture_on_commit_callbacks(execute=True):
+        record_closed(closed)
+    spot = ParkingSpot.objects.create(spot_number="H9")
+    vehicle = Vehicle.objects.create(license_plate="HOUR009")
+    open_record = check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for record in (closed, open_record):
+            response = admin_client.delete(f"/api/v1/parking/records/{record.id}/")
+            assert response.status_code == 204
+
+    assert _hourly_stats() == []
+    spot.refresh_from_db()
+    assert not spot.is_occupied
+
+
+@pytest.mark.django_db
+def test_backfill_migration_counts_existing_history():
+    backfill = import_module(
+        "parking.migrations.0011_backfill_parking_hourly_stats"
+    ).backfill_hourly_stats
+    base = datetime(2025, 8, 1, 10, 0, tzinfo=dt_timezone.utc)
+    closed_record("H10", "HOUR010", base, base + timedelta(minutes=30))
+    ParkingHourlyStats.objects.create(bucket=base - timedelta(days=1), entries=5)
+
+    backfill(django_apps, None)
+
+    assert _hourly_stats() == [(base, 1, 1, 1800)]
+
+
+@pytest.mark.django_db
+def test_duplicate_open_record_cleanup_frees_spots():
+    close_duplicates = import_module(
+        "parking.migrations.0003_parkingrecord_indexes"
+    ).CLOSE_DUPLICATE_OPEN_RECORDS_SQL
+    with connection.cursor() as cursor:
+        cursor.execute("DROP INDEX unique_open_record_per_vehicle")
+    vehicle = Vehicle.objects.create(license_plate="DUP0001")
+    spots = [ParkingSpot.objects.create(spot_number=f"D{n}") for n in range(2)]
+    older, newer = (
+        ParkingRecord.objects.create(parking_spot=spot, vehicle=vehicle)
+        for spot in spots
+    )
+    ParkingSpot.objects.update(is_occupied=True)
+
+    with connection.cursor() as cursor:
+        cursor.execute(close_duplicates.format(column="vehicle_id"))
+
+    older.refresh_from_db()
+    assert older.exit_time == newer.entry_time
+    assert list(
+        ParkingSpot.objects.order_by("spot_number").values_list(
+            "spot_number", "is_occupied"
+        )
+    ) == [("D0", False), ("D1", True)]
+
+
+@pytest.mark.django_db
+def test_admin_edit_of_closed_record_adjusts_hourly_stats(
+    client, django_capture_on_commit_callbacks
+):
+    client.force_login(User.objects.create_superuser("gestor", password="password"))
+    base = datetime(2025, 8, 1, 10, 0, tzinfo=dt_timezone.utc)
+    record = closed_record("H7", "HOUR007", base, base + timedelta(minutes=30))
+    with django_capture_on_commit_callbacks(execute=True):
+        record_closed(record)
+
+    exit_time = timezone.localtime(base + timedelta(hours=1, minutes=30))
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            f"/parking/parkingrecord/{record.pk}/change/",
+            {
+                "vehicle": record.vehicle_id,
+                "parking_spot": record.parking_spot_id,
+                "exit_time_0": exit_time.strftime("%d/%m/%Y"),
+                "exit_time_1": exit_time.strftime("%H:%M:%S"),
+            },
+        )
+
+    assert response.status_code == 302
+    record.refresh_from_db()
+    assert record.exit_time == exit_time
+    assert _hourly_stats() == [
+        (base, 1, 0, 3600),
+        (base + timedelta(hours=1), 0, 1, 1800),
+    ]
+
+
+@pytest.mark.django_db
+def test_api_parking_report(admin_client, django_capture_on_commit_callbacks):
+    base = datetime(2025, 8, 1, 10, 0, tzinfo=dt_timezone.utc)
+    with django_capture_on_commit_callbacks(execute=True):
+        record_closed(
+            closed_record("H4", "HOUR004", base, base + timedelta(minutes=30))
+        )
+        record_closed(
+            closed_record(
+                "H5", "HOUR005", base + timedelta(minutes=10), base + timedelta(hours=1)
+            )
+        )
+    spot_occupancy.rebuild()
+
+    response = admin_client.get(
+        "/api/v1/parking/reports/",
+        {"start": base.isoformat(), "end": (base + timedelta(hours=3)).isoformat()},
+    )
+    assert response.status_code == 200
+    summary = response.data["summary"]
+    assert summary["sessions"] == 2
+    assert summary["average_dwell_seconds"] == (1800 + 3000) / 2
+    assert summary["turnover_per_spot"] == 1
+    first_bucket = response.data["buckets"][0]
+    assert first_bucket["entries"] == 2
+    assert first_bucket["occupancy_rate"] == (1800 + 3000) / (3600 * 2)
+
+    response = admin_client.get(
+        "/api/v1/parking/reports/spots/",
+        {"start": base.isoformat(), "end": (base + timedelta(hours=3)).isoformat()},
+    )
+    assert response.status_code == 200
+    assert [row["spot_number"] for row in response.data] == ["H4", "H5"]
+    assert response.data[0]["rank"] == 1
+    assert response.data[0]["average_dwell_seconds"] == 1800
+
+
+@pytest.mark.django_db
+def test_api_parking_report_requires_staff(regular_user_client):
+    client, _ = regular_user_client
+    response = client.get("/api/v1/parking/reports/")
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_parking_spot_api_list_cache_follows_check_in(
+    admin_client, django_assert_num_queries
+):
+    cache.clear()
+    spot = ParkingSpot.objects.create(spot_number="K1")
+    vehicle = Vehicle.objects.create(license_plate="CACHED1")
+    admin_client.get("/api/v1/parking/spots/")
+
+    with django_assert_num_queries(0):
+        response = admin_client.get("/api/v1/parking/spots/")
+    assert response.data["results"][0]["is_occupied"] is False
+
+    check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
+    response = admin_client.get("/api/v1/parking/spots/")
+    assert response.data["results"][0]["is_occupied"] is True
+
+
+@pytest.mark.django_db
+def test_parking_spot_api_list_cache_is_scoped_per_user(
+    admin_client, django_assert_max_num_queries
+):
+    cache.clear()
+    ParkingSpot.objects.create(spot_number="S1")
+    view_spots = Permission.objects.get(codename="view_parkingspot")
+    clients = []
+    for username in ("painel1", "painel2"):
+        user = User.objects.create_user(username=username, password="password")
+        user.user_permissions.add(view_spots)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        clients.append(client)
+
+    url = "/api/v1/parking/spots/?ordering(created_at)"
+    assert admin_client.get(url).status_code == 200
+    assert clients[0].get(url).status_code == 400
+
+    clients[0].get("/api/v1/parking/spots/")
+    with django_assert_max_num_queries(0):
+        clients[0].get("/api/v1/parking/spots/")
+    with django_assert_max_num_queries(2) as captured:
+        response = clients[1].get("/api/v1/parking/spots/")
+    assert response.status_code == 200
+    assert any("parking_parkingspot" in q["sql"] for q in captured.captured_queries)
+
+
+def test_spot_event_broker_delivers_to_subscribers():
+    broker = SpotEventBroker(max_queue_size=2)
+
+    async def scenario():
+        queue = broker.subscribe()
+        await asyncio.to_thread(broker.publish, {"id": 1, "is_occupied": True})
+        for spot_id in (2, 3):
+            broker.publish({"id": spot_id, "is_occupied": False})
+        await asyncio.sleep(0)
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+        broker.unsubscribe(queue)
+        return received
+
+    assert [event["id"] for event in asyncio.run(scenario())] == [2, 3]
+    assert broker.subscriber_count == 0
+
+
+def test_spot_event_messages_format_server_sent_events():
+    async def scenario():
+        queue = spot_events.subscribe()
+        messages = _spot_event_messages(queue, {"total": 1, "free": 1, "occupied": 0})
+        first = await messages.__anext__()
+        spot_events.publish({"id": 5, "is_occupied": True})
+        second = await messages.__anext__()
+        await messages.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == 'event: summary\ndata: {"total": 1, "free": 1, "occupied": 0}\n\n'
+    assert second == 'event: spot\ndata: {"id": 5, "is_occupied": true}\n\n'
+    assert spot_events.subscriber_count == 0
+
+
+@pytest.mark.django_db
+def test_check_in_and_check_out_publish_spot_events(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    published = []
+    monkeypatch.setattr(spot_events, "publish", published.append)
+    spot = ParkingSpot.objects.create(spot_number="E1")
+    vehicle = Vehicle.objects.create(license_plate="EVENT12")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        record = check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
+        check_out(record)
+
+    assert [event for event in published if event["id"] == spot.id] == [
+        {"id": spot.id, "is_occupied": True},
+        {"id": spot.id, "is_occupied": False},
+    ]
+
+
+def _run_async(coroutine):
+    async def run():
+        try:
+            return await coroutine
+        finally:
+            await sync_to_async(connections.close_all)()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_postgres_listener_fans_out_notifications(settings):
+    if connection.vendor != "postgresql":
+        pytest.skip("LISTEN/NOTIFY requer PostgreSQL.")
+    settings.PARKING_EVENTS_BACKEND = "postgres"
+    broker = SpotEventBroker()
+    listener = PostgresSpotEventListener(broker)
+    listener.poll_timeout = 0.1
+
+    async def scenario():
+        queue = broker.subscribe()
+        listener.start()
+        for _ in range(50):
+            await sync_to_async(publish_spot_event)(7, True)
+            try:
+                return await asyncio.wait_for(queue.get(), timeout=0.2)
+            except TimeoutError:
+                continue
+
+    try:
+        assert _run_async(scenario()) == {"id": 7, "is_occupied": True}
+    finally:
+        listener.stop()
+        listener.join(timeout=5)
+
+
+@pytest.mark.django_db
+def test_spot_event_stream_requires_authentication(client):
+    response = client.get("/api/v1/parking/spots/events/")
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+def test_spot_event_stream_accepts_jwt():
+    user = User.objects.create_user(username="painel", password="password")
+    response = _run_async(
+        AsyncClient().get(
+            "/api/v1/parking/spots/events/",
+            headers={"Authorization": f"Bearer {AccessToken.for_user(user)}"},
+        )
+    )
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/event-stream"
+
+
+@pytest.mark.django_db
+def test_spot_event_stream_is_unavailable_under_wsgi(client):
+    user = User.objects.create_user(username="painel", password="password")
+    response = client.get(
+        "/api/v1/parking/spots/events/",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+    )
+    assert response.status_code == 503
+
+
+@pytest.mark.django_db
+def test_async_spot_availability(client):
+    user = User.objects.create_user(username="gate", password="password")
+    ParkingSpot.objects.create(spot_number="AS1")
+    spot_occupancy.rebuild()
+
+    response = client.get("/api/v1/async/parking/spots/availability/")
+    assert response.status_code == 401
+
+    response = client.get(
+        "/api/v1/async/parking/spots/availability/",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+    )
+    assert response.status_code == 200
+    assert response.json() == {"total": 1, "free": 1, "occupied": 0}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_spot_availability_resyncs_aged_map(settings):
+    settings.PARKING_OCCUPANCY_RESYNC_SECONDS = 60
+    user = User.objects.create_user(username="painel-async", password="password")
+    ParkingSpot.objects.create(spot_number="AS2")
+    spot_occupancy.rebuild()
+    ParkingSpot.objects.bulk_create([ParkingSpot(spot_number="AS3")])
+    spot_occupancy._loaded_at -= 61
+
+    response = _run_async(
+        AsyncClient().get(
+            "/api/v1/async/parking/spots/availability/",
+            headers={"Authorization": f"Bearer {AccessToken.for_user(user)}"},
+        )
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"total": 2, "free": 2, "occupied": 0}
+
+
+@pytest.mark.django_db
+def test_async_parking_record_detail_matches_sync(
+    admin_client, regular_user_client, owned_records
+):
+    client, user = regular_user_client
+    record = owned_records(user, count=1)[0]
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    response = client.get(f"/api/v1/async/parking/records/{record.id}/", **headers)
+    assert response.status_code == 200
+    assert (
+        response.json()
+        == admin_client.get(f"/api/v1/parking/records/{record.id}/").json()
+    )
+
+    stranger = User.objects.create_user(username="outro", password="password")
+    response = client.get(
+        f"/api/v1/async/parking/records/{record.id}/",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(stranger)}",
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_parking_record_detail_reads_archived_records(
+    admin_client, regular_user_client, owned_records
+):
+    client, user = regular_user_client
+    record = owned_records(user, count=1)[0]
+    entry_time = timezone.now() - timedelta(days=40)
+    ParkingRecord.objects.filter(pk=record.pk).update(
+        entry_time=entry_time, exit_time=entry_time + timedelta(hours=1)
+    )
+    call_command("archive_parking_records", older_than_days=30, stdout=io.StringIO())
+    assert ArchivedParkingRecord.objects.filter(pk=record.pk).exists()
+
+    response = client.get(
+        f"/api/v1/async/parking/records/{record.id}/",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+    )
+    assert response.status_code == 200
+    assert (
+        response.json()
+        == admin_client.get(f"/api/v1/parking/records/{record.id}/").json()
+    )
+
+
+@pytest.fixture
+def instrumentation(settings):
+    settings.REQUEST_INSTRUMENTATION = True
+    settings.REQUEST_QUERY_COUNT_THRESHOLD = 50
+    settings.METRICS_TOKEN = "scrape-token"
+    request_metrics.reset()
+    yield settings
+    request_metrics.reset()
+
+
+def _scrape_metrics(client, token="scrape-token"):
+    return client.get("/metrics", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def _server_timing(response):
+    return {
+        entry.split(";")[0].strip(): entry
+        for entry in response["Server-Timing"].split(",")
+    }
+
+
+@pytest.mark.django_db
+def test_instrumentation_reports_server_timing_and_metrics(
+    instrumentation, admin_client, caplog
+):
+    ParkingSpot.objects.create(spot_number="M1")
+
+    with caplog.at_level("INFO", logger="parking_service.requests"):
+        response = admin_client.get("/api/v1/parking/records/")
+
+    assert response.status_code == 200
+    timing = _server_timing(response)
+    assert set(timing) == {"db", "view", "serialize", "total"}
+    assert 'queries"' in timing["db"]
+    assert "X-Query-Count-Exceeded" not in response
+    entry = json.loads(caplog.records[-1].getMessage())
+    assert entry["route"] == "parkingrecord-list"
+    assert entry["status"] == 200
+    assert entry["queries"] >= 1
+
+    metrics = _scrape_metrics(admin_client).content.decode()
+    labels = 'route="parkingrecord-list",method="GET"'
+    assert f"http_request_duration_seconds_count{{{labels}}} 1" in metrics
+    assert f'http_request_db_queries_bucket{{{labels},le="+Inf"}} 1' in metrics
+    assert 'http_requests_total{route="parkingrecord-list"' in metrics
+    assert 'route="metrics"' not in metrics
+
+
+@pytest.mark.django_db
+def test_instrumentation_flags_responses_above_query_threshold(
+    instrumentation, admin_client, caplog
+):
+    instrumentation.REQUEST_QUERY_COUNT_THRESHOLD = 1
+    spot = ParkingSpot.objects.create(spot_number="M2")
+    vehicle = Vehicle.objects.create(license_plate="MET1234")
+
+    with caplog.at_level("INFO", logger="parking_service.requests"):
+        response = admin_client.post(
+            "/api/v1/parking/records/check-in/",
+            {"vehicle": vehicle.id, "parking_spot": spot.id},
+            format="json",
+        )
+
+    assert response.status_code == 201
+    assert int(response["X-Query-Count-Exceeded"]) > 1
+    assert caplog.records[-1].levelname == "WARNING"
+    assert json.loads(caplog.records[-1].getMessage())["query_threshold"] == 1
+    metrics = _scrape_metrics(admin_client).content.decode()
+    assert (
+        "http_request_query_threshold_exceeded_total"
+        '{route="parkingrecord-check-in",method="POST"} 1'
+    ) in metrics
+
+
+@pytest.mark.django_db(transaction=True)
+def test_instrumentation_wraps_async_views(instrumentation):
+    user = User.objects.create_user(username="async-metrics", password="password")
+    response = _run_async(
+        AsyncClient().get(
+            "/api/v1/async/parking/spots/availability/",
+            headers={"Authorization": f"Bearer {AccessToken.for_user(user)}"},
+        )
+    )
+    assert response.status_code == 200
+    assert "total" in _server_timing(response)
+
+
+@pytest.mark.django_db
+def test_instrumentation_disabled_by_default(admin_client):
+    response = admin_client.get("/api/v1/parking/records/")
+    assert "Server-Timing" not in response
+    assert admin_client.get("/metrics").status_code == 404
+
+
+@pytest.mark.django_db
+def test_metrics_require_the_scrape_token(instrumentation, client):
+    assert client.get("/metrics").status_code == 401
+    assert _scrape_metrics(client, token="errado").status_code == 401
+    assert _scrape_metrics(client).status_code == 200
+
+    instrumentation.METRICS_TOKEN = ""
+    assert _scrape_metrics(client, token="").status_code == 404
+
+
+def gate_event(key, event_type, plate, **extra):
+    return {
+        "idempotency_key": key,
+        "event_type": event_type,
+        "license_plate": plate,
+        **extra,
+    }
+
+
+@pytest.fixture
+def gate_state():
+    cache.clear()
+    spot_occupancy.invalidate()
+    yield
+    cache.clear()
+    spot_occupancy.invalidate()
+
+
+@pytest.mark.django_db
+def test_gate_events_are_queued_once(admin_client, gate_state):
+    events = [
+        gate_event("g-1", "check_in", "GTE1A11"),
+        gate_event("g-2", "check_in", "GTE1A12"),
+    ]
+
+    response = admin_client.post("/api/v1/parking/gate-events/", events, format="json")
+    assert response.status_code == 202
+    assert response.data == {"accepted": 2, "duplicates": 0}
+
+    response = admin_client.post(
+        "/api/v1/parking/gate-events/", events[0], format="json"
+    )
+    assert response.status_code == 202
+    assert response.data == {"accepted": 0, "duplicates": 1}
+    assert GateEvent.objects.count() == 2
+    assert not ParkingRecord.objects.exists()
+
+
+@pytest.mark.django_db
+def test_gate_events_require_permission(regular_user_client):
+    client, _ = regular_user_client
+    response = client.post(
+        "/api/v1/parking/gate-events/",
+        gate_event("g-1", "check_in", "GTE1A11"),
+        format="json",
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_process_gate_events_applies_batch(
+    gate_state, django_capture_on_commit_callbacks
+):
+    first, second, requested = (
+        ParkingSpot.objects.create(spot_number=number) for number in ("G1", "G2", "G3")
+    )
+    parked = Vehicle.objects.create(license_plate="GTE0000")
+    open_record = check_in(vehicle_id=parked.id, parking_spot_id=first.id)
+    entry = timezone.now() - timedelta(hours=2)
+    enqueue_gate_events(
+        [
+            gate_event("in-1", "check_in", "GTE0001", occurred_at=entry),
+            gate_event(
+                "in-2",
+                "check_in",
+                "GTE0002",
+                parking_spot=requested.id,
+                occurred_at=entry,
+            ),
+            gate_event("out-0", "check_out", "GTE0000"),
+            gate_event(
+                "out-2", "check_out", "GTE0002", occurred_at=entry + timedelta(hours=1)
+            ),
+            gate_event("out-9", "check_out", "GTE0009"),
+        ]
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert process_gate_events(batch_size=100) == {"processed": 4, "failed": 1}
+
+    events = {event.idempotency_key: event for event in GateEvent.objects.all()}
+    assert events["out-9"].status == GateEvent.Status.FAILED
+    assert events["out-9"].error == "Nenhum registro em aberto para este veículo."
+    assert events["out-0"].record_id == open_record.id
+
+    entered = events["in-1"].record
+    assert entered.entry_time == entry
+    assert entered.exit_time is None
+    assert entered.parking_spot_id == second.id
+    closed = events["in-2"].record
+    assert closed.id == events["out-2"].record_id
+    assert closed.exit_time - closed.entry_time == timedelta(hours=1)
+    assert closed.duration_seconds == 3600
+
+    occupied = dict(ParkingSpot.objects.values_list("spot_number", "is_occupied"))
+    assert occupied == {"G1": False, "G2": True, "G3": False}
+    assert ParkingHourlyStats.objects.aggregate(exits=Sum("exits"))["exits"] == 2
+    assert process_gate_events() == {"processed": 0, "failed": 0}
+
+
+@pytest.mark.django_db
+def test_process_gate_events_rejects_without_free_spots(gate_state):
+    ParkingSpot.objects.create(spot_number="G1")
+    enqueue_gate_events(
+        [
+            gate_event("in-1", "check_in", "GTE0001"),
+            gate_event("in-2", "check_in", "GTE0002"),
+            gate_event("in-3", "check_in", "GTE0001"),
+        ]
+    )
+
+    call_command("process_gate_events", batch_size=2, stdout=io.StringIO())
+
+    statuses = dict(GateEvent.objects.values_list("idempotency_key", "error"))
+    assert statuses == {
+        "in-1": "",
+        "in-2": "Nenhuma vaga disponível no momento.",
+        "in-3": "O veículo já possui um registro em aberto.",
+    }
+    assert ParkingRecord.objects.filter(exit_time__isnull=True).count() == 1
+
+
+@pytest.mark.django_db
+def test_check_in_retry_with_idempotency_key_is_applied_once(admin_client):
+    cache.clear()
+    spot = ParkingSpot.objects.create(spot_number="ID1")
+    vehicle = Vehicle.objects.create(license_plate="IDM0001")
+    payload = {"vehicle": vehicle.id, "parking_spot": spot.id}
+    headers = {"HTTP_IDEMPOTENCY_KEY": "gate-1:001"}
+
+    responses = [
+        admin_client.post(
+            "/api/v1/parking/records/check-in/", payload, format="json", **headers
+        )
+        for _ in range(3)
+    ]
+
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert len({response.data["id"] for response in responses}) == 1
+    assert ParkingRecord.objects.count() == 1
+
+    other = admin_client.post(
+        "/api/v1/parking/records/check-in/",
+        payload,
+        format="json",
+        HTTP_IDEMPOTENCY_KEY="gate-1:002",
+    )
+    assert other.status_code == 409
+
+
+@pytest.mark.django_db
+def test_record_create_with_idempotency_key_in_progress(admin_client):
+    cache.clear()
+    spot = ParkingSpot.objects.create(spot_number="ID2")
+    vehicle = Vehicle.objects.create(license_plate="IDM0002")
+    payload = {"vehicle": vehicle.id, "parking_spot": spot.id}
+    admin = User.objects.get(username="admin")
+    key = idempotency_key(
+        SimpleNamespace(user=admin),
+        SimpleNamespace(basename="parkingrecord", action="create"),
+        "gate-2:001",
+    )
+    IdempotencyKey.objects.create(key=key, fingerprint="")
+
+    response = admin_client.post(
+        "/api/v1/parking/records/",
+        payload,
+        format="json",
+        HTTP_IDEMPOTENCY_KEY="gate-2:001",
+    )
+    assert response.status_code == 422
+
+    IdempotencyKey.objects.all().delete()
+    response = admin_client.post(
+        "/api/v1/parking/records/",
+        payload,
+        format="json",
+        HTTP_IDEMPOTENCY_KEY="gate-2:001",
+    )
+    assert response.status_code == 201
+    assert IdempotencyKey.objects.get(key=key).status == 201
+    IdempotencyKey.objects.filter(key=key).update(status=None)
+    cache.clear()
+
+    response = admin_client.post(
+        "/api/v1/parking/records/",
+        payload,
+        format="json",
+        HTTP_IDEMPOTENCY_KEY="gate-2:001",
+    )
+    assert response.status_code == 409
+    assert ParkingRecord.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_idempotency_key_is_shared_between_workers(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="ID3")
+    vehicle = Vehicle.objects.create(license_plate="IDM0003")
+    payload = {"vehicle": vehicle.id, "parking_spot": spot.id}
+    headers = {"HTTP_IDEMPOTENCY_KEY": "gate-3:001"}
+
+    first = admin_client.post(
+        "/api/v1/parking/records/check-in/", payload, format="json", **headers
+    )
+    cache.clear()
+    retry = admin_client.post(
+        "/api/v1/parking/records/check-in/", payload, format="json", **headers
+    )
+
+    assert first.status_code == retry.status_code == 201
+    assert retry["Idempotent-Replayed"] == "true"
+    assert retry.data["id"] == first.data["id"]
+    assert ParkingRecord.objects.count() == 1
+
+    IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+    call_command("purge_idempotency_keys", stdout=io.StringIO())
+    assert not IdempotencyKey.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rql_query_cache_ignores_pagination_params(admin_client):
+    vehicle = Vehicle.objects.create(license_plate="RQL0001")
+    for number in range(3):
+        ParkingRecord.objects.create(
+            parking_spot=ParkingSpot.objects.create(spot_number=f"RQ{number}"),
+            vehicle=vehicle,
+            exit_time=timezone.now(),
+        )
+    IndexedRQLFilterBackend._CACHES.clear()
+
+    response = admin_client.get(
+        "/api/v1/parking/records/?license_plate=RQL0001&page_size=2"
+    )
+    next_page = admin_client.get(response.data["next"])
+
+    assert next_page.status_code == 200
+    assert len(response.data["results"]) + len(next_page.data["results"]) == 3
+    caches = IndexedRQLFilterBackend._CACHES.values()
+    assert [len(queries) for queries in caches] == [1]
+
+
+@pytest.mark.django_db
+def test_parking_record_filters_only_allow_indexed_lookups(
+    regular_user_client, owned_records, admin_client
+):
+    client, user = regular_user_client
+    owned_records(user)
+
+    response = client.get("/api/v1/parking/records/?license_plate=OWN1")
+    assert response.status_code == 200
+    assert [r["vehicle"] for r in response.data["results"]] == [
+        Vehicle.objects.get(license_plate="OWN1").id
+    ]
+
+    for query in ("like(license_plate,OWN*)", "ordering(created_at)"):
+        response = client.get(f"/api/v1/parking/records/?{query}")
+        assert response.status_code == 400
+
+        response = admin_client.get(f"/api/v1/parking/records/?{query}")
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_rql_ordering_drives_cursor_pagination(regular_user_client, owned_records):
+    client, user = regular_user_client
+    records = owned_records(user)
+    base = timezone.now() - timedelta(days=1)
+    for hours, record in enumerate(records):
+        ParkingRecord.objects.filter(pk=record.pk).update(
+            entry_time=base + timedelta(hours=hours)
+        )
+    newest_first = [record.id for record in reversed(records)]
+
+    seen = []
+    url = "/api/v1/parking/records/?ordering(-entry_time)&page_size=2"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.data["results"]]
+        url = response.data["next"]
+    assert seen == newest_first
+
+    response = client.get(
+        "/api/v1/parking/records/?ordering(-entry_time)&stream=ndjson"
+    )
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == newest_first
+
+    customer = Customer.objects.get(user=user)
+    for month in (7, 8, 6):
+        MonthlyStatement.objects.create(customer=customer, period=date(2025, month, 1))
+    response = client.get("/api/v1/parking/statements/?ordering(period)")
+    assert [item["period"] for item in response.data["results"]] == [
+        "2025-06-01",
+        "2025-07-01",
+        "2025-08-01",
+    ]
+
+
+@pytest.mark.django_db
+def test_parking_record_filters_cache_parsed_queries(admin_client, monkeypatch):
+    parsed = []
+    apply_filters = IndexedRQLFilterClass.apply_filters
+
+    def spy(self, query, *args, **kwargs):
+        parsed.append(query)
+        return apply_filters(self, query, *args, **kwargs)
+
+    monkeypatch.setattr(IndexedRQLFilterClass, "apply_filters", spy)
+    ParkingRecord.objects.create(
+        parking_spot=ParkingSpot.objects.create(spot_number="RQL1"),
+        vehicle=Vehicle.objects.create(license_plate="RQL0001"),
+    )
+    for _ in range(3):
+        response = admin_client.get(
+            "/api/v1/parking/records/?exit_time=null()&license_plate=RQL0001"
+        )
+        assert len(response.data["results"]) == 1
+    assert parsed == ["exit_time=null()&license_plate=RQL0001"]
+
+
+@pytest.mark.django_db
+def test_archive_moves_old_closed_records_and_reads_both_tiers(admin_client):
+    now = timezone.now()
+    old = closed_record("ARC1", "ARC0001", now - timedelta(days=40, hours=2), None)
+    ParkingRecord.objects.filter(pk=old.pk).update(exit_time=now - timedelta(days=40))
+    recent = closed_record(
+        "ARC2", "ARC0002", now - timedelta(hours=3), now - timedelta(hours=1)
+    )
+    open_record = ParkingRecord.objects.create(
+        parking_spot=ParkingSpot.objects.create(spot_number="ARC3"),
+        vehicle=Vehicle.objects.create(license_plate="ARC0003"),
+    )
+    enqueue_gate_events(
+        [
+            {
+                "idempotency_key": "arc-1",
+                "event_type": GateEvent.EventType.CHECK_OUT,
+                "license_plate": "ARC0001",
+            }
+        ]
+    )
+    GateEvent.objects.update(record=old)
+
+    out = io.StringIO()
+    call_command(
+        "archive_parking_records", older_than_days=30, batch_size=1, stdout=out
+    )
+
+    assert "1 registros arquivados" in out.getvalue()
+    assert set(ParkingRecord.objects.values_list("pk", flat=True)) == {
+        recent.pk,
+        open_record.pk,
+    }
+    archived = ArchivedParkingRecord.objects.get()
+    assert (archived.pk, archived.vehicle.license_plate) == (old.pk, "ARC0001")
+    assert GateEvent.objects.get().record is None
+
+    response = admin_client.get("/api/v1/parking/records/")
+    assert [r["id"] for r in response.data["results"]] == [
+        old.pk,
+        recent.pk,
+        open_record.pk,
+    ]
+    response = admin_client.get(f"/api/v1/parking/records/{old.pk}/")
+    assert response.status_code == 200
+    assert response.data["exit_time"] is not None
+
+    response = admin_client.get(
+        "/api/v1/parking/reports/spots/",
+        {
+            "start": (now - timedelta(days=60)).isoformat(),
+            "end": now.isoformat(),
+        },
+    )
+    assert {row["spot_number"] for row in response.data} == {"ARC1", "ARC2"}
+
+
+@pytest.fixture
+def export_records():
+    customer = Customer.objects.create(name="Financeiro", cpf="123")
+    base = datetime(2025, 7, 31, 22, 0, tzinfo=dt_timezone.utc)
+    records = []
+    for number, entry_time in enumerate(
+        [base, base + timedelta(hours=3), base + timedelta(days=31, hours=3)]
+    ):
+        record = closed_record(
+            f"EXP{number}",
+            f"EXP000{number}",
+            entry_time,
+            entry_time + timedelta(hours=1),
+        )
+        Vehicle.objects.filter(pk=record.vehicle_id).update(owner=customer)
+        records.append(record)
+    return records
+
+
+def read_csv(content):
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_api_export_streams_csv_by_date_range_and_rql(admin_client, export_records):
+    response = admin_client.get(
+        "/api/v1/parking/records/export/",
+        {"start": "2025-08-01T00:00:00Z", "end": "2025-09-01T00:00:00Z"},
+    )
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"].startswith("text/csv")
+    rows = read_csv(b"".join(response.streaming_content).decode())
+    assert [row["license_plate"] for row in rows] == ["EXP0001"]
+    assert rows[0]["customer_name"] == "Financeiro"
+    assert rows[0]["spot_number"] == "EXP1"
+
+    response = admin_client.get(
+        "/api/v1/parking/records/export/?in(license_plate,(EXP0000,EXP0002))"
+    )
+    rows = read_csv(b"".join(response.streaming_content).decode())
+    assert [row["record_id"] for row in rows] == [
+        str(export_records[0].pk),
+        str(export_records[2].pk),
+    ]
+
+
+@pytest.mark.django_db
+def test_api_export_streams_parquet(admin_client, export_records):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    response = admin_client.get("/api/v1/parking/records/export/?output=parquet")
+
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+    assert table.num_rows == 3
+    assert table.column("license_plate").to_pylist() == [
+        "EXP0000",
+        "EXP0001",
+        "EXP0002",
+    ]
+
+
+@pytest.mark.django_db
+def test_export_command_writes_csv(export_records, tmp_path):
+    path = tmp_path / "export.csv"
+
+    call_command(
+        "export_parking_records",
+        "--start=2025-08-01",
+        "--filter=license_plate=EXP0002",
+        f"--output={path}",
+    )
+
+    rows = read_csv(path.read_text())
+    assert [row["license_plate"] for row in rows] == ["EXP0002"]
+
+
+@pytest.mark.django_db
+def test_api_bulk_provisions_spot_ranges(
+    admin_client, django_assert_max_num_queries, django_capture_on_commit_callbacks
+):
+    spot_occupancy.rebuild()
+
+    with (
+        django_assert_max_num_queries(12),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        response = admin_client.post(
+            "/api/v1/parking/spots/bulk/",
+            {"ranges": ["b001-B250", "C01-10"], "level": "2", "zone": "B"},
+            format="json",
+        )
+
+    assert response.status_code == 201
+    assert response.data == {"created": 260, "updated": 0}
+    zone = ParkingZone.objects.get()
+    assert (zone.level, zone.name) == ("2", "B")
+    assert zone.spots.count() == 260
+    assert ParkingSpot.objects.filter(spot_number__in=["B001", "B250", "C10"]).count()
+    assert spot_occupancy.summary()["free"] == 260
+
+    response = admin_client.post(
+        "/api/v1/parking/spots/bulk/", {"ranges": ["B250-B251"]}, format="json"
+    )
+    assert response.status_code == 409
+    assert response.data["spot_numbers"] == ["B250"]
+    assert not ParkingSpot.objects.filter(spot_number="B251").exists()
+
+
+@pytest.mark.django_db
+def test_api_bulk_upserts_csv_layout(admin_client):
+    spot = ParkingSpot.objects.create(spot_number="L1", is_occupied=True)
+    layout = io.BytesIO(b"spot_number,level,zone\nL1,1,Norte\nL2,1,Norte\nL3,2,Sul\n")
+    layout.name = "layout.csv"
+
+    response = admin_client.post(
+        "/api/v1/parking/spots/bulk/",
+        {"layout": layout, "upsert": True},
+        format="multipart",
+    )
+
+    assert response.status_code == 201
+    assert response.data == {"created": 2, "updated": 1}
+    spot.refresh_from_db()
+    assert spot.is_occupied
+    assert str(spot.zone) == "Nível 1 - Zona Norte"
+    assert ParkingZone.objects.count() == 2
+
+    response = admin_client.post(
+        "/api/v1/parking/spots/bulk/", {"ranges": ["X10-X01"]}, format="json"
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_api_bulk_reports_layout_rows_over_column_limits(admin_client):
+    layout = io.BytesIO(
+        b"spot_number,level,zone\nM1,1,Norte\nM2," + b"9" * 30 + b",Norte\n"
+        b"M3,1," + b"Z" * 60 + b"\n"
+    )
+    layout.name = "layout.csv"
+
+    response = admin_client.post(
+        "/api/v1/parking/spots/bulk/", {"layout": layout}, format="multipart"
+    )
+
+    assert response.status_code == 400
+    assert [(row["row"], row["spot_number"]) for row in response.data["rows"]] == [
+        (2, "M2"),
+        (3, "M3"),
+    ]
+    assert not ParkingSpot.objects.exists()
+
+
+@pytest.mark.django_db
+def test_upsert_keeps_zone_of_rows_without_one():
+    zone = ParkingZone.objects.create(level="1", name="Norte")
+    ParkingSpot.objects.create(spot_number="K1", zone=zone)
+
+    result = provision_spots(
+        [
+            {"spot_number": "K1", "level": "", "zone": ""},
+            {"spot_number": "K2", "level": "1", "zone": "Norte"},
+        ],
+        upsert=True,
+    )
+
+    assert result == {"created": 1, "updated": 1}
+    assert ParkingSpot.objects.get(spot_number="K1").zone == zone
+    zone.refresh_from_db()
+    assert zone.total_spots == 2
+
+
+@pytest.mark.django_db
+def test_import_spots_command(tmp_path):
+    out = io.StringIO()
+    call_command("import_spots", "A001-A005", level="1", zone="A", stdout=out)
+    assert "5 vagas criadas" in out.getvalue()
+
+    layout = tmp_path / "layout.csv"
+    layout.write_text("spot_number,level,zone\nA005,1,B\nA006,1,B\n")
+    with pytest.raises(CommandError):
+        call_command("import_spots", csv=str(layout))
+
+    call_command("import_spots", csv=str(layout), upsert=True, stdout=out)
+    assert "1 vagas criadas, 1 atualizadas" in out.getvalue()
+    assert ParkingSpot.objects.get(spot_number="A005").zone.name == "B"
+
+
+@pytest.mark.django_db
+def test_zone_counters_follow_check_in_and_check_out(admin_client):
+    zone = ParkingZone.objects.create(level="1", name="A")
+    spots = [
+        ParkingSpot.objects.create(spot_number=f"Z{i}", zone=zone) for i in range(3)
+    ]
+    vehicle = Vehicle.objects.create(license_plate="ZON1234")
+    zone.refresh_from_db()
+    assert (zone.total_spots, zone.free_spots) == (3, 3)
+
+    record = check_in(vehicle_id=vehicle.id, parking_spot_id=spots[0].pk)
+    zone.refresh_from_db()
+    assert zone.free_spots == 2
+
+    check_out(record)
+    zone.refresh_from_db()
+    assert zone.free_spots == 3
+
+    spots[1].zone = None
+    spots[1].save()
+    zone.refresh_from_db()
+    assert (zone.total_spots, zone.free_spots) == (2, 2)
+
+
+@pytest.mark.django_db
+def test_api_zone_availability_reads_counter_rows(
+    admin_client, django_assert_num_queries
+):
+    admin_client.post(
+        "/api/v1/parking/spots/bulk/",
+        {"ranges": ["A01-A04"], "level": "1", "zone": "A"},
+        format="json",
+    )
+    admin_client.post(
+        "/api/v1/parking/spots/bulk/",
+        {"ranges": ["B01-B02"], "level": "2", "zone": "B"},
+        format="json",
+    )
+    check_in(
+        vehicle_id=Vehicle.objects.create(license_plate="ZON5678").id,
+        parking_spot_id=ParkingSpot.objects.get(spot_number="A01").pk,
+    )
+
+    with django_assert_num_queries(1):
+        response = admin_client.get("/api/v1/parking/spots/zones/?level=1")
+
+    assert response.status_code == 200
+    zone = ParkingZone.objects.get(name="A")
+    assert response.data == [
+        {
+            "level": "1",
+            "total": 4,
+            "free": 3,
+            "zones": [{"id": zone.pk, "name": "A", "total": 4, "free": 3}],
+        }
+    ]
+    assert len(admin_client.get("/api/v1/parking/spots/zones/").data) == 2
+
+
+def hourly_tariff(vehicle_type=None, name="Padrão"):
+    tariff = Tariff.objects.create(
+        vehicle_type=vehicle_type,
+        name=name,
+        grace_minutes=15,
+        daily_cap=Decimal("40.00"),
+    )
+    tariff.bands.create(start_minute=0, end_minute=60, price=Decimal("10.00"))
+    tariff.bands.create(start_minute=60, block_minutes=30, price=Decimal("5.00"))
+    return tariff
+
+
+@pytest.mark.parametrize(
+    "minutes, amount",
+    [
+        (10, "0.00"),
+        (50, "10.00"),
+        (61, "15.00"),
+        (180, "30.00"),
+        (600, "40.00"),
+        (25 * 60, "50.00"),
+    ],
+)
+def test_tariff_plan_applies_bands_grace_and_daily_cap(minutes, amount):
+    plan = TariffPlan(
+        15,
+        Decimal("40.00"),
+        [(60, None, 30, Decimal("5.00")), (0, 60, 60, Decimal("10.00"))],
+    )
+    assert plan.amount(minutes * 60) == Decimal(amount)
+
+
+@pytest.mark.django_db
+def test_check_out_persists_duration_and_amount():
+    motorcycle = VehicleType.objects.create(name="Moto")
+    hourly_tariff()
+    tariff = hourly_tariff(motorcycle, name="Moto")
+    tariff.bands.filter(start_minute=0).update(price=Decimal("4.00"))
+    spot = ParkingSpot.objects.create(spot_number="P1")
+    vehicle = Vehicle.objects.create(license_plate="PRC1234", vehicle_type=motorcycle)
+    record = check_in(vehicle_id=vehicle.id, parking_spot_id=spot.id)
+    ParkingRecord.objects.filter(pk=record.pk).update(
+        entry_time=timezone.now() - timedelta(minutes=90)
+    )
+    record.refresh_from_db()
+
+    check_out(record)
+
+    record.refresh_from_db()
+    assert 90 * 60 <= record.duration_seconds < 91 * 60
+    assert record.amount == Decimal("9.00")
+
+
+@pytest.mark.django_db
+def test_reprice_command_updates_hot_and_archived_records():
+    base = timezone.now() - timedelta(days=400)
+    old = closed_record("R1", "RPC0001", base, base + timedelta(hours=2))
+    recent = closed_record(
+        "R2", "RPC0002", base + timedelta(days=399), base + timedelta(days=399, hours=1)
+    )
+    assert ParkingRecord.objects.get(pk=old.pk).amount is None
+    call_command("archive_parking_records", older_than_days=30, stdout=io.StringIO())
+    hourly_tariff()
+
+    out = io.StringIO()
+    call_command("reprice_parking_records", batch_size=1, stdout=out)
+
+    assert "2 registros reprecificados" in out.getvalue()
+    archived = ArchivedParkingRecord.objects.get()
+    assert (archived.pk, archived.duration_seconds) == (old.pk, 7200)
+    assert archived.amount == Decimal("20.00")
+    assert ParkingRecord.objects.get(pk=recent.pk).amount == Decimal("10.00")
+    assert ParkingRecordHistory.objects.aggregate(total=Sum("amount")) == {
+        "total": Decimal("30.00")
+    }
+
+
+@pytest.fixture
+def statement_records():
+    august = datetime(2025, 8, 10, 10, 0, tzinfo=dt_timezone.utc)
+    owners = [Customer.objects.create(name=name) for name in ("Ana", "Bruno")]
+    spot = ParkingSpot.objects.create(spot_number="S1")
+    vehicles = [
+        Vehicle.objects.create(license_plate=f"STM000{i}", owner=owner)
+        for i, owner in enumerate([*owners, None])
+    ]
+    rows = [
+        (vehicles[0], august, 3600, "10.00"),
+        (vehicles[0], august + timedelta(days=5), 1800, "5.00"),
+        (vehicles[1], august, 600, None),
+        (vehicles[1], august + timedelta(days=30), 7200, "20.00"),
+        (vehicles[2], august, 3600, "10.00"),
+    ]
+    ParkingRecord.objects.bulk_create(
+        ParkingRecord(
+            vehicle=vehicle,
+            parking_spot=spot,
+            entry_time=entry_time,
+            exit_time=entry_time + timedelta(seconds=seconds),
+            duration_seconds=seconds,
+            amount=amount,
+        )
+        for vehicle, entry_time, seconds, amount in rows
+    )
+    return owners
+
+
+@pytest.mark.django_db
+def test_generate_statements_aggregates_per_customer(
+    statement_records, django_assert_max_num_queries
+):
+    ana, bruno = statement_records
+    MonthlyStatement.objects.create(
+        customer=Customer.objects.create(name="Sem uso"), period=date(2025, 8, 1)
+    )
+
+    with django_assert_max_num_queries(8) as captured:
+        assert generate_statements(date(2025, 8, 20), workers=1, batch_size=1) == 2
+    history_scans = [
+        query
+        for query in captured.captured_queries
+        if "parking_parkingrecord_history" in query["sql"]
+    ]
+    assert len(history_scans) == 1
+
+    statements = {
+        statement.customer_id: statement
+        for statement in MonthlyStatement.objects.filter(period=date(2025, 8, 1))
+    }
+    assert set(statements) == {ana.id, bruno.id}
+    assert (statements[ana.id].records, statements[ana.id].duration_seconds) == (
+        2,
+        5400,
+    )
+    assert statements[ana.id].amount == Decimal("15.00")
+    assert statements[bruno.id].records == 1
+    assert statements[bruno.id].amount == Decimal("0.00")
+
+    out = io.StringIO()
+    call_command("generate_statements", "--month=2025-09", workers=1, stdout=out)
+    assert "1 extratos gerados para 09/2025" in out.getvalue()
+    assert MonthlyStatement.objects.count() == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_statements_fans_out_batches_to_workers(statement_records):
+    ana, bruno = statement_records
+
+    assert generate_statements(date(2025, 8, 1), workers=2, batch_size=1) == 2
+    assert generate_statements(date(2025, 8, 1), workers=2, batch_size=1) == 2
+    assert dict(MonthlyStatement.objects.values_list("customer", "records")) == {
+        ana.id: 2,
+        bruno.id: 1,
+    }
+
+
+@pytest.mark.django_db
+def test_api_statements_are_scoped_to_customer(regular_user_client, admin_client):
+    client, user = regular_user_client
+    own = Customer.objects.create(name="Cliente", user=user)
+    other = Customer.objects.create(name="Outro")
+    for customer in (own, other):
+        MonthlyStatement.objects.create(
+            customer=customer, period=date(2025, 8, 1), records=1
+        )
+    MonthlyStatement.objects.create(customer=own, period=date(2025, 7, 1))
+
+    response = client.get("/api/v1/parking/statements/")
+    assert response.status_code == 200
+    assert [
+        (item["customer"], item["period"]) for item in response.data["results"]
+    ] == [(own.id, "2025-08-01"), (own.id, "2025-07-01")]
+
+    response = client.get("/api/v1/parking/statements/?period=2025-07-01")
+    assert [item["period"] for item in response.data["results"]] == ["2025-07-01"]
+
+    response = admin_client.get(f"/api/v1/parking/statements/?customer={other.id}")
+    assert [item["customer"] for item in response.data["results"]] == [other.id]
+    assert APIClient().get("/api/v1/parking/statements/").status_code in (401, 403)
@@ -1,12 +1,35 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import ParkingRecordViewSet, ParkingSpotViewSet
+from .views import (
+    GateEventViewSet,
+    MonthlyStatementViewSet,
+    ParkingRecordViewSet,
+    ParkingReportViewSet,
+    ParkingSpotViewSet,
+    parking_record_detail_async,
+    spot_availability_async,
+    spot_event_stream,
+)
 
 router = DefaultRouter()
 router.register("parking/spots", ParkingSpotViewSet)
 router.register("parking/records", ParkingRecordViewSet)
+router.register("parking/gate-events", GateEventViewSet)
+router.register("parking/statements", MonthlyStatementViewSet)
+router.register("parking/reports", ParkingReportViewSet, basename="parking-report")
 
 urlpatterns = [
+    path("parking/spots/events/", spot_event_stream, name="parking-spot-events"),
+    path(
+        "async/parking/spots/availability/",
+        spot_availability_async,
+        name="parking-spot-availability-async",
+    ),
+    path(
+        "async/parking/records/<int:pk>/",
+        parking_record_detail_async,
+        name="parking-record-detail-async",
+    ),
     path("", include(router.urls)),
 ]
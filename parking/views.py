@@ -1,28 +1,383 @@
-from rest_framework import viewsets
-from rest_framework.permissions import DjangoModelPermissions
+import asyncio
+import json
 
-from parking_service.permissions import IsOwnerOfVehicleOrRecord
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
-from .filters import ParkingRecordFilterClass, ParkingSpotFilterClass
-from .models import ParkingRecord, ParkingSpot
-from .serializers import ParkingRecordSerializer, ParkingSpotSerializer
+from parking_service.authentication import (
+    aauthenticate,
+    not_authenticated_response,
+    owner_filter,
+)
+from parking_service.cache import CachedListMixin
+from parking_service.filters import OpsRQLFilterMixin
+from parking_service.idempotency import IdempotentCreateMixin, idempotent
+from parking_service.permissions import (
+    CachedDjangoModelPermissions,
+    IsOwnerOfVehicleOrRecord,
+)
+from parking_service.streaming import NDJSONStreamingListMixin
 
+from .events import ensure_event_listener, spot_events
+from .exports import (
+    EXPORT_FORMATS,
+    ExportFormatUnavailable,
+    check_export_format,
+    export_queryset,
+)
+from .filters import (
+    MonthlyStatementFilterClass,
+    MonthlyStatementOpsFilterClass,
+    ParkingRecordFilterClass,
+    ParkingRecordOpsFilterClass,
+    ParkingSpotFilterClass,
+    ParkingSpotOpsFilterClass,
+)
+from .ingestion import enqueue_gate_events
+from .models import (
+    GateEvent,
+    MonthlyStatement,
+    ParkingRecord,
+    ParkingRecordHistory,
+    ParkingSpot,
+)
+from .occupancy import spot_occupancy
+from .pagination import (
+    MonthlyStatementCursorPagination,
+    ParkingRecordCursorPagination,
+)
+from .provisioning import (
+    SpotLayoutError,
+    SpotNumberConflictError,
+    parse_spot_layout,
+    provision_spots,
+    spots_from_ranges,
+)
+from .reports import occupancy_report, spot_turnover_report, summary_report
+from .serializers import (
+    BulkSpotProvisioningSerializer,
+    CheckInSerializer,
+    ExportQuerySerializer,
+    GateEventSerializer,
+    MonthlyStatementSerializer,
+    ParkingRecordSerializer,
+    ParkingSpotSerializer,
+    ReportQuerySerializer,
+)
+from .services import (
+    ParkingSpotUnavailableError,
+    RecordAlreadyClosedError,
+    VehicleAlreadyParkedError,
+    apply_record_changes,
+    check_in,
+    check_out,
+)
+from .zones import zone_availability
 
-class ParkingSpotViewSet(viewsets.ModelViewSet):
+
+class ParkingSpotViewSet(OpsRQLFilterMixin, CachedListMixin, viewsets.ModelViewSet):
     queryset = ParkingSpot.objects.all()
     serializer_class = ParkingSpotSerializer
     rql_filter_class = ParkingSpotFilterClass
-    permission_classes = [DjangoModelPermissions]
+    ops_rql_filter_class = ParkingSpotOpsFilterClass
+    permission_classes = [CachedDjangoModelPermissions]
+
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        return Response(spot_occupancy.summary(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def zones(self, request):
+        return Response(
+            zone_availability(request.query_params.get("level")),
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        serializer = BulkSpotProvisioningSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            if data.get("ranges"):
+                spots = spots_from_ranges(data["ranges"], data["level"], data["zone"])
+            elif data.get("layout"):
+                spots = parse_spot_layout(data["layout"].read())
+            else:
+                spots = data["spots"]
+            result = provision_spots(spots, upsert=data["upsert"])
+        except SpotNumberConflictError as e:
+            return Response(
+                {"error": str(e), "spot_numbers": e.spot_numbers[:100]},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except SpotLayoutError as e:
+            return Response(
+                {"error": str(e), "rows": e.errors[:100]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(result, status=status.HTTP_201_CREATED)
 
 
-class ParkingRecordViewSet(viewsets.ModelViewSet):
+class ParkingRecordViewSet(
+    OpsRQLFilterMixin,
+    IdempotentCreateMixin,
+    NDJSONStreamingListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ParkingRecord.objects.all()
     serializer_class = ParkingRecordSerializer
     rql_filter_class = ParkingRecordFilterClass
-    permission_classes = [DjangoModelPermissions, IsOwnerOfVehicleOrRecord]
+    ops_rql_filter_class = ParkingRecordOpsFilterClass
+    pagination_class = ParkingRecordCursorPagination
+    permission_classes = [CachedDjangoModelPermissions, IsOwnerOfVehicleOrRecord]
+
+    history_actions = {"list", "retrieve", "export"}
+
+    def get_queryset(self):
+        user = self.request.user
+        model = (
+            ParkingRecordHistory
+            if self.action in self.history_actions
+            else ParkingRecord
+        )
+        if user.is_staff:
+            return model.objects.all()
+        return model.objects.filter(
+            owner_filter(user, "vehicle__owner")
+        ).select_related("vehicle__owner")
+
+    def perform_create(self, serializer):
+        self._save_and_apply_changes(serializer, previous_spot_id=None, was_open=False)
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        self._save_and_apply_changes(
+            serializer,
+            previous_spot_id=instance.parking_spot_id,
+            was_open=instance.exit_time is None,
+            previous_times=(instance.entry_time, instance.exit_time),
+        )
+
+    def _save_and_apply_changes(
+        self, serializer, previous_spot_id, was_open, previous_times=None
+    ):
+        try:
+            with transaction.atomic():
+                record = serializer.save()
+                apply_record_changes(record, previous_spot_id, was_open, previous_times)
+        except ParkingSpotUnavailableError as e:
+            raise serializers.ValidationError({"parking_spot": [str(e)]}) from e
+        except IntegrityError as e:
+            raise serializers.ValidationError(
+                "Já existe um registro em aberto para este veículo ou vaga."
+            ) from e
+
+    @action(detail=False, methods=["post"], url_path="check-in")
+    @idempotent
+    def check_in(self, request):
+        input_serializer = CheckInSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+
+        try:
+            record = check_in(
+                vehicle_id=input_serializer.validated_data["vehicle"].pk,
+                parking_spot_id=input_serializer.validated_data.get("parking_spot"),
+            )
+        except (ParkingSpotUnavailableError, VehicleAlreadyParkedError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+
+        serializer = self.get_serializer(record)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data["output"]
+        try:
+            check_export_format(output)
+        except ExportFormatUnavailable as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = export_queryset(
+            self.filter_queryset(self.get_queryset()),
+            start=params.validated_data.get("start"),
+            end=params.validated_data.get("end"),
+        )
+        stream, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(stream(rows), content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="parking-records.{output}"'
+        )
+        response["Cache-Control"] = "no-store"
+        return response
+
+    @action(detail=True, methods=["post"], url_path="check-out")
+    def check_out(self, request, pk=None):
+        record = self.get_object()
+
+        try:
+            record = check_out(record)
+        except RecordAlreadyClosedError as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+
+        serializer = self.get_serializer(record)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class GateEventViewSet(viewsets.GenericViewSet):
+    queryset = GateEvent.objects.all()
+    serializer_class = GateEventSerializer
+    permission_classes = [CachedDjangoModelPermissions]
+
+    def create(self, request):
+        many = isinstance(request.data, list)
+        serializer = self.get_serializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        events = serializer.validated_data if many else [serializer.validated_data]
+        if not events:
+            return Response(
+                {"error": "Informe ao menos um evento."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(enqueue_gate_events(events), status=status.HTTP_202_ACCEPTED)
+
+
+class MonthlyStatementViewSet(OpsRQLFilterMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = MonthlyStatement.objects.all()
+    serializer_class = MonthlyStatementSerializer
+    rql_filter_class = MonthlyStatementFilterClass
+    ops_rql_filter_class = MonthlyStatementOpsFilterClass
+    pagination_class = MonthlyStatementCursorPagination
+    permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.is_staff:
-            return ParkingRecord.objects.all()
-        return ParkingRecord.objects.filter(vehicle__owner__user=user)
+            return MonthlyStatement.objects.all()
+        return MonthlyStatement.objects.filter(owner_filter(user, "customer"))
+
+
+class ParkingReportViewSet(viewsets.ViewSet):
+    permission_classes = [IsAdminUser]
+
+    def _get_params(self, request):
+        serializer = ReportQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def list(self, request):
+        params = self._get_params(request)
+        total_spots = spot_occupancy.summary()["total"]
+        return Response(
+            {
+                "start": params["start"],
+                "end": params["end"],
+                "interval": params["interval"],
+                "summary": summary_report(
+                    params["start"], params["end"], total_spots=total_spots
+                ),
+                "buckets": list(
+                    occupancy_report(
+                        params["start"],
+                        params["end"],
+                        interval=params["interval"],
+                        total_spots=total_spots,
+                    )
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"])
+    def spots(self, request):
+        params = self._get_params(request)
+        return Response(
+            list(
+                spot_turnover_report(
+                    params["start"], params["end"], limit=params["limit"]
+                )
+            ),
+            status=status.HTTP_200_OK,
+        )
+
+
+def _format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _spot_event_messages(queue, summary, heartbeat_seconds=15):
+    try:
+        yield _format_sse("summary", summary)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _format_sse("spot", event)
+    finally:
+        spot_events.unsubscribe(queue)
+
+
+async def _get_occupancy_summary():
+    summary = spot_occupancy.snapshot()
+    if summary is None:
+        summary = await sync_to_async(spot_occupancy.summary)()
+    return summary
+
+
+@require_GET
+async def spot_event_stream(request):
+    user = await aauthenticate(request)
+    if user is None:
+        return not_authenticated_response()
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "O stream de eventos requer o servidor ASGI."}, status=503
+        )
+
+    ensure_event_listener()
+    queue = spot_events.subscribe()
+    summary = await _get_occupancy_summary()
+    response = StreamingHttpResponse(
+        _spot_event_messages(queue, summary), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@require_GET
+async def spot_availability_async(request):
+    user = await aauthenticate(request)
+    if user is None:
+        return not_authenticated_response()
+    return JsonResponse(await _get_occupancy_summary())
+
+
+@require_GET
+async def parking_record_detail_async(request, pk):
+    user = await aauthenticate(request)
+    if user is None:
+        return not_authenticated_response()
+
+    queryset = ParkingRecordHistory.objects.filter(pk=pk)
+    if not user.is_staff:
+        queryset = queryset.filter(owner_filter(user, "vehicle__owner"))
+    record = await queryset.afirst()
+    if record is None:
+        return JsonResponse({"detail": "Não encontrado."}, status=404)
+    return JsonResponse(ParkingRecordSerializer(record).data)
@@ -0,0 +1,52 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import ParkingSpot, ParkingZone
+
+
+def adjust_zone_free_spots(parking_spot_id: int, delta: int) -> None:
+    ParkingZone.objects.filter(spots=parking_spot_id).update(
+        free_spots=F("free_spots") + delta
+    )
+
+
+def _count_spots(spots):
+    return Coalesce(
+        Subquery(
+            spots.order_by().values("zone").annotate(count=Count("pk")).values("count")
+        ),
+        0,
+    )
+
+
+def refresh_zone_counters(zone_ids=None) -> int:
+    zones = ParkingZone.objects.all()
+    if zone_ids is not None:
+        zone_ids = {zone_id for zone_id in zone_ids if zone_id is not None}
+        if not zone_ids:
+            return 0
+        zones = zones.filter(pk__in=zone_ids)
+    spots = ParkingSpot.objects.filter(zone=OuterRef("pk"))
+    return zones.update(
+        total_spots=_count_spots(spots),
+        free_spots=_count_spots(spots.filter(is_occupied=False)),
+    )
+
+
+def zone_availability(level: str = None) -> list[dict]:
+    zones = ParkingZone.objects.order_by("level", "name")
+    if level is not None:
+        zones = zones.filter(level=level)
+    levels = {}
+    for zone_id, zone_level, name, total, free in zones.values_list(
+        "id", "level", "name", "total_spots", "free_spots"
+    ):
+        entry = levels.setdefault(
+            zone_level, {"level": zone_level, "total": 0, "free": 0, "zones": []}
+        )
+        entry["total"] += total
+        entry["free"] += free
+        entry["zones"].append(
+            {"id": zone_id, "name": name, "total": total, "free": free}
+        )
+    return list(levels.values())
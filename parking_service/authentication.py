@@ -0,0 +1,148 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.http import JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from authentication.models import AuthVersion
+
+AUTH_VERSION_CLAIM = "auth_version"
+
+
+def _auth_version_key(user_id) -> str:
+    return f"auth-version:user:{user_id}"
+
+
+def _cache_auth_version(user_id, version) -> None:
+    cache.set(
+        _auth_version_key(user_id),
+        version,
+        timeout=settings.AUTH_VERSION_CACHE_TIMEOUT,
+    )
+
+
+def get_auth_version(user_id):
+    version = cache.get(_auth_version_key(user_id))
+    if version is None:
+        version = (
+            AuthVersion.objects.filter(user_id=user_id)
+            .values_list("version", flat=True)
+            .first()
+        )
+        if version is not None:
+            _cache_auth_version(user_id, version)
+    return version
+
+
+def issue_auth_version(user_id) -> int:
+    version = get_auth_version(user_id)
+    if version is None:
+        version = AuthVersion.objects.get_or_create(
+            user_id=user_id, defaults={"version": time.time_ns()}
+        )[0].version
+        _cache_auth_version(user_id, version)
+    return version
+
+
+def _permissions_key(user_id) -> str:
+    return f"auth-permissions:user:{user_id}"
+
+
+def get_cached_permissions(user) -> set:
+    key = _permissions_key(user.pk)
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = user.get_all_permissions()
+        cache.set(key, permissions, timeout=settings.AUTH_PERMISSIONS_CACHE_TIMEOUT)
+    return permissions
+
+
+def _forget_auth_versions(user_ids) -> None:
+    cache.delete_many(
+        [_permissions_key(user_id) for user_id in user_ids]
+        + [_auth_version_key(user_id) for user_id in user_ids]
+    )
+
+
+def bump_auth_version(*user_ids) -> None:
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if not user_ids:
+        return
+    version = time.time_ns()
+    AuthVersion.objects.bulk_create(
+        [AuthVersion(user_id=user_id, version=version) for user_id in user_ids],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["version", "updated_at"],
+    )
+    _forget_auth_versions(user_ids)
+    transaction.on_commit(lambda: _forget_auth_versions(user_ids))
+
+
+class ClaimsUser(TokenUser):
+    @property
+    def customer_id(self):
+        return self.token.get("customer_id")
+
+    def get_all_permissions(self, obj=None) -> set:
+        return set(self.token.get("perms", []))
+
+    def has_perm(self, perm, obj=None) -> bool:
+        return self.is_superuser or perm in self.get_all_permissions()
+
+    def has_perms(self, perm_list, obj=None) -> bool:
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+    def has_module_perms(self, module) -> bool:
+        return self.is_superuser or any(
+            perm.startswith(f"{module}.") for perm in self.get_all_permissions()
+        )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if AUTH_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        current = get_auth_version(validated_token[api_settings.USER_ID_CLAIM])
+        if current is None:
+            return super().get_user(validated_token)
+        if current != validated_token[AUTH_VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                "O token foi revogado. Autentique-se novamente.",
+                code="token_revoked",
+            )
+        return ClaimsUser(validated_token)
+
+
+def owner_filter(user, owner_field: str = "owner") -> Q:
+    if isinstance(user, ClaimsUser):
+        if user.customer_id is None:
+            return Q(pk__in=[])
+        return Q(**{f"{owner_field}_id": user.customer_id})
+    return Q(**{f"{owner_field}__user_id": user.id})
+
+
+async def aauthenticate(request):
+    try:
+        result = await sync_to_async(ClaimsJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        return None
+    if result:
+        return result[0]
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def not_authenticated_response():
+    return JsonResponse(
+        {"detail": "As credenciais de autenticação não foram fornecidas."},
+        status=401,
+    )
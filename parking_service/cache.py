@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+
+def _version_key(model) -> str:
+    return f"cache-version:{model._meta.label_lower}"
+
+
+def get_model_cache_version(model) -> int:
+    return cache.get_or_set(_version_key(model), 1, timeout=None)
+
+
+def _bump_version(model) -> None:
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def bump_model_cache_version(model) -> None:
+    _bump_version(model)
+    transaction.on_commit(lambda: _bump_version(model))
+
+
+def model_cache_key(model, *parts) -> str:
+    version = get_model_cache_version(model)
+    suffix = ":".join(str(part) for part in parts)
+    return f"{model._meta.label_lower}:v{version}:{suffix}"
+
+
+def _invalidate_model_cache(sender, **kwargs):
+    bump_model_cache_version(sender)
+
+
+def connect_cache_invalidation(*models) -> None:
+    for model in models:
+        dispatch_uid = f"cache-invalidation:{model._meta.label_lower}"
+        post_save.connect(
+            _invalidate_model_cache, sender=model, dispatch_uid=dispatch_uid
+        )
+        post_delete.connect(
+            _invalidate_model_cache, sender=model, dispatch_uid=dispatch_uid
+        )
+
+
+class CachedListMixin:
+    list_cache_timeout = None
+
+    def get_list_cache_scope(self, request):
+        # Staff and regular users get different filter classes and querysets,
+        # and a regular user's listing may be scoped to their own rows, so
+        # entries are never shared across roles or between regular users.
+        user = request.user
+        if user.is_staff:
+            return "staff"
+        return f"user-{user.pk}"
+
+    def list(self, request, *args, **kwargs):
+        key = model_cache_key(
+            self.get_queryset().model,
+            "list",
+            self.get_list_cache_scope(request),
+            request.build_absolute_uri(),
+        )
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and isinstance(response, Response):
+            timeout = self.list_cache_timeout
+            if timeout is None:
+                timeout = settings.API_LIST_CACHE_TIMEOUT
+            cache.set(key, response.data, timeout=timeout)
+        return response
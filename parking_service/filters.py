@@ -0,0 +1,91 @@
+from urllib.parse import unquote
+
+from cachetools import LRUCache
+from dj_rql.drf import RQLFilterBackend
+from dj_rql.filter_cls import RQLFilterClass
+from django.conf import settings
+from py_rql.constants import RQL_SEARCH_PARAM, FilterLookups
+from py_rql.exceptions import RQLFilterError, RQLFilterLookupError
+from rest_framework.exceptions import ParseError
+
+EXACT_LOOKUPS = {FilterLookups.EQ, FilterLookups.IN}
+RANGE_LOOKUPS = EXACT_LOOKUPS | {
+    FilterLookups.GT,
+    FilterLookups.GE,
+    FilterLookups.LT,
+    FilterLookups.LE,
+}
+
+
+class IndexedRQLFilterClass(RQLFilterClass):
+    MAX_ORDERING_LENGTH_IN_QUERY = 2
+    QUERIES_CACHE_BACKEND = LRUCache
+    QUERIES_CACHE_SIZE = settings.RQL_QUERIES_CACHE_SIZE
+
+    def build_q_for_filter(self, data):
+        # dj_rql ignores names it does not know, which would turn a filter on a
+        # field outside this class (e.g. an ops-only field for a non-staff user)
+        # into an unfiltered listing.
+        if data.filter_name != RQL_SEARCH_PARAM and not self.get_filter_base_item(
+            data.filter_name
+        ):
+            raise RQLFilterLookupError(
+                details={"error": f"Filtro desconhecido: {data.filter_name}."}
+            )
+        return super().build_q_for_filter(data)
+
+
+class OpsRQLFilterMixin:
+    ops_rql_filter_class = None
+
+    def get_rql_filter_class(self):
+        if self.ops_rql_filter_class is not None and self.request.user.is_staff:
+            return self.ops_rql_filter_class
+        return self.rql_filter_class
+
+
+class IndexedRQLFilterBackend(RQLFilterBackend):
+    paginator_query_params = (
+        "cursor_query_param",
+        "page_query_param",
+        "page_size_query_param",
+        "limit_query_param",
+        "offset_query_param",
+    )
+    # Plain query parameters read by the views themselves (the export range and
+    # format), which are not RQL filters.
+    view_query_params = ("output", "start", "end")
+
+    @classmethod
+    def get_query(cls, filter_instance, request, view):
+        # The parsed query is cached by its text, so pagination and streaming
+        # switches are dropped to let every page of a listing share one entry.
+        # The view's own parameters are dropped too, as any name left in the
+        # query must be a known filter.
+        ignored = cls._non_rql_params(view)
+        params = []
+        for param in request._request.META.get("QUERY_STRING", "").split("&"):
+            name, _, value = unquote(param).partition("=")
+            if name in ignored:
+                continue
+            # DRF rebuilds the next/previous links as key=value pairs, turning a
+            # bare expression such as ordering(-entry_time) into "...)=".
+            params.append(name if name.endswith(")") and not value else unquote(param))
+        return "&".join(params)
+
+    @classmethod
+    def _non_rql_params(cls, view):
+        paginator = getattr(view, "paginator", None)
+        params = {getattr(paginator, name, None) for name in cls.paginator_query_params}
+        params.add(getattr(view, "stream_query_param", None))
+        params.update(cls.view_query_params)
+        params.discard(None)
+        return params
+
+    def filter_queryset(self, request, queryset, view):
+        try:
+            return super().filter_queryset(request, queryset, view)
+        except RQLFilterError as e:
+            raise ParseError(
+                {"error": "Filtro inválido ou não permitido.", "details": e.details}
+            ) from e
@@ -0,0 +1,131 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def idempotency_key(request, view, key: str) -> str:
+    scope = f"{view.basename}:{view.action}"
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"idempotency:{request.user.pk}:{scope}:{digest}"
+
+
+def _fingerprint(request) -> str:
+    payload = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.path}:{payload}".encode()).hexdigest()
+
+
+def _replay(entry, fingerprint):
+    if entry.fingerprint != fingerprint:
+        return Response(
+            {"error": "Esta Idempotency-Key já foi usada com outra requisição."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if entry.status is None:
+        return Response(
+            {
+                "error": "Uma requisição com esta Idempotency-Key ainda está "
+                "em processamento."
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+    return Response(
+        json.loads(entry.response),
+        status=entry.status,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _is_expired(entry) -> bool:
+    ttl = (
+        settings.IDEMPOTENCY_LOCK_TIMEOUT
+        if entry.status is None
+        else settings.IDEMPOTENCY_KEY_TTL
+    )
+    return entry.created_at < timezone.now() - timedelta(seconds=ttl)
+
+
+def _claim(key, fingerprint):
+    while True:
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(key=key, fingerprint=fingerprint)
+            return None
+        except IntegrityError:
+            entry = IdempotencyKey.objects.filter(key=key).first()
+        if entry is None:
+            continue
+        if not _is_expired(entry):
+            return entry
+        IdempotencyKey.objects.filter(pk=entry.pk, created_at=entry.created_at).delete()
+
+
+def idempotent(method):
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"error": "A Idempotency-Key deve ter no máximo 255 caracteres."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        storage_key = idempotency_key(request, self, key)
+        fingerprint = _fingerprint(request)
+        completed = cache.get(storage_key)
+        if completed is not None:
+            return _replay(completed, fingerprint)
+        # The claim, the create and the stored response commit together, so a
+        # failed or interrupted create never leaves the key pending. A concurrent
+        # duplicate blocks on the claim's unique index until this one finishes
+        # and then replays its response.
+        with transaction.atomic():
+            entry = _claim(storage_key, fingerprint)
+            if entry is not None:
+                if entry.status is not None:
+                    cache.set(storage_key, entry, timeout=settings.IDEMPOTENCY_KEY_TTL)
+                return _replay(entry, fingerprint)
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code >= 500 or not isinstance(response, Response):
+                IdempotencyKey.objects.filter(key=storage_key).delete()
+                return response
+
+            entry = IdempotencyKey(
+                key=storage_key,
+                fingerprint=fingerprint,
+                status=response.status_code,
+                response=json.dumps(response.data, cls=DjangoJSONEncoder),
+            )
+            IdempotencyKey.objects.filter(key=storage_key).update(
+                status=entry.status, response=entry.response
+            )
+            transaction.on_commit(
+                lambda: cache.set(
+                    storage_key, entry, timeout=settings.IDEMPOTENCY_KEY_TTL
+                )
+            )
+        return response
+
+    return wrapper
+
+
+class IdempotentCreateMixin:
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
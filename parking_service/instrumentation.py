@@ -0,0 +1,313 @@
+import hmac
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from rest_framework.serializers import BaseSerializer
+
+from .authentication import not_authenticated_response
+
+logger = logging.getLogger("parking_service.requests")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+_current_metrics = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.render_seconds = 0.0
+        self.view_started = None
+        self.view_seconds = None
+        self._serializing = False
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - started
+
+    def capture_queries(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self.execute_wrapper))
+        return stack
+
+    def end_view(self):
+        if self.view_started is not None and self.view_seconds is None:
+            self.view_seconds = time.perf_counter() - self.view_started
+
+
+def _timed_serializer_data(getter):
+    def data(self):
+        metrics = _current_metrics.get()
+        if metrics is None or metrics._serializing:
+            return getter(self)
+        metrics._serializing = True
+        started = time.perf_counter()
+        try:
+            return getter(self)
+        finally:
+            metrics.serializer_seconds += time.perf_counter() - started
+            metrics._serializing = False
+
+    data._timed = True
+    return property(data)
+
+
+def install_serializer_timing() -> None:
+    getter = BaseSerializer.data.fget
+    if not getattr(getter, "_timed", False):
+        BaseSerializer.data = _timed_serializer_data(getter)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            total += count
+            yield bound, total
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(
+        f'{name}="{_escape_label(value)}"' for name, value in labels.items()
+    )
+
+
+class MetricsRegistry:
+    histograms = {
+        "http_request_duration_seconds": (
+            "Duração das requisições HTTP por rota.",
+            DURATION_BUCKETS,
+        ),
+        "http_request_db_seconds": (
+            "Tempo gasto em SQL por requisição e rota.",
+            DURATION_BUCKETS,
+        ),
+        "http_request_db_queries": (
+            "Número de queries SQL por requisição e rota.",
+            QUERY_BUCKETS,
+        ),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {name: {} for name in self.histograms}
+            self._requests = {}
+            self._threshold_exceeded = {}
+
+    def observe(self, route, method, status, duration, queries, sql_seconds, flagged):
+        key = (route, method)
+        values = {
+            "http_request_duration_seconds": duration,
+            "http_request_db_seconds": sql_seconds,
+            "http_request_db_queries": queries,
+        }
+        with self._lock:
+            for name, value in values.items():
+                histogram = self._histograms[name].get(key)
+                if histogram is None:
+                    histogram = self._histograms[name][key] = Histogram(
+                        self.histograms[name][1]
+                    )
+                histogram.observe(value)
+            request_key = (route, method, status)
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            if flagged:
+                self._threshold_exceeded[key] = self._threshold_exceeded.get(key, 0) + 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append(
+                "# HELP http_requests_total Requisições HTTP por rota e status."
+            )
+            lines.append("# TYPE http_requests_total counter")
+            for (route, method, status), count in sorted(self._requests.items()):
+                labels = _labels(route=route, method=method, status=status)
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+
+            for name, (description, _) in self.histograms.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (route, method), histogram in sorted(
+                    self._histograms[name].items()
+                ):
+                    labels = _labels(route=route, method=method)
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            lines.append(
+                "# HELP http_request_query_threshold_exceeded_total "
+                "Respostas acima do limite de queries por rota."
+            )
+            lines.append("# TYPE http_request_query_threshold_exceeded_total counter")
+            for (route, method), count in sorted(self._threshold_exceeded.items()):
+                labels = _labels(route=route, method=method)
+                lines.append(
+                    f"http_request_query_threshold_exceeded_total{{{labels}}} {count}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = MetricsRegistry()
+
+
+def metrics_view(request):
+    if not settings.REQUEST_INSTRUMENTATION or not settings.METRICS_TOKEN:
+        raise Http404
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), expected.encode()
+    ):
+        return not_authenticated_response()
+    return HttpResponse(
+        request_metrics.render(), content_type="text/plain; version=0.0.4"
+    )
+
+
+def _milliseconds(seconds) -> float:
+    return round(seconds * 1000, 3)
+
+
+class RequestInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_serializer_timing()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with metrics.capture_queries():
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with metrics.capture_queries():
+                response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self._finish(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.end_view()
+            render_started = time.perf_counter()
+
+            def record_render(rendered):
+                metrics.render_seconds += time.perf_counter() - render_started
+
+            response.add_post_render_callback(record_render)
+        return response
+
+    def _finish(self, request, response, metrics):
+        metrics.end_view()
+        duration = time.perf_counter() - metrics.started
+        match = getattr(request, "resolver_match", None)
+        route = match.view_name if match else "unmatched"
+        threshold = settings.REQUEST_QUERY_COUNT_THRESHOLD
+        flagged = bool(threshold) and metrics.queries > threshold
+
+        timings = {
+            "db": metrics.sql_seconds,
+            "view": metrics.view_seconds or 0.0,
+            "serialize": metrics.serializer_seconds + metrics.render_seconds,
+            "total": duration,
+        }
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={_milliseconds(timings["db"])};desc="{metrics.queries} queries"',
+                *(
+                    f"{name};dur={_milliseconds(timings[name])}"
+                    for name in ("view", "serialize", "total")
+                ),
+            ]
+        )
+        if flagged:
+            response["X-Query-Count-Exceeded"] = str(metrics.queries)
+
+        if route != "metrics":
+            request_metrics.observe(
+                route,
+                request.method,
+                response.status_code,
+                duration,
+                metrics.queries,
+                metrics.sql_seconds,
+                flagged,
+            )
+
+        entry = {
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "status": response.status_code,
+            "queries": metrics.queries,
+            **{f"{name}_ms": _milliseconds(value) for name, value in timings.items()},
+        }
+        if flagged:
+            entry["query_threshold"] = threshold
+            logger.warning(json.dumps(entry))
+        else:
+            logger.info(json.dumps(entry))
+        return response
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from parking_service.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Remove chaves de idempotência mais antigas que IDEMPOTENCY_KEY_TTL."
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=before).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} chaves de idempotência removidas.")
+        )
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(max_length=255, unique=True, verbose_name="Chave"),
+                ),
+                (
+                    "fingerprint",
+                    models.CharField(max_length=64, verbose_name="Assinatura"),
+                ),
+                (
+                    "status",
+                    models.PositiveSmallIntegerField(
+                        blank=True, null=True, verbose_name="Status da Resposta"
+                    ),
+                ),
+                ("response", models.TextField(blank=True, verbose_name="Resposta")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Criado em"),
+                ),
+            ],
+            options={
+                "verbose_name": "Chave de Idempotência",
+                "verbose_name_plural": "Chaves de Idempotência",
+                "indexes": [
+                    models.Index(fields=["created_at"], name="idempotency_created_idx")
+                ],
+            },
+        ),
+    ]
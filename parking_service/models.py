@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=255, unique=True, verbose_name="Chave")
+    fingerprint = models.CharField(max_length=64, verbose_name="Assinatura")
+    status = models.PositiveSmallIntegerField(
+        blank=True, null=True, verbose_name="Status da Resposta"
+    )
+    response = models.TextField(blank=True, verbose_name="Resposta")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+
+    class Meta:
+        verbose_name = "Chave de Idempotência"
+        verbose_name_plural = "Chaves de Idempotência"
+        indexes = [
+            models.Index(fields=["created_at"], name="idempotency_created_idx"),
+        ]
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,17 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = ("id",)
+
+    def get_ordering(self, request, queryset, view):
+        # An RQL ordering() reaches here already applied to the queryset; the
+        # cursor follows it, with id as a tiebreaker so pages stay stable.
+        rql_ordering = tuple(queryset.query.order_by)
+        if not rql_ordering:
+            return super().get_ordering(request, queryset, view)
+        if {"id", "-id"}.isdisjoint(rql_ordering):
+            rql_ordering += ("id",)
+        return rql_ordering
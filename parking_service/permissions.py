@@ -1,14 +1,51 @@
 from rest_framework import permissions
 
+from .authentication import ClaimsUser, get_cached_permissions
+
+
+class CachedDjangoModelPermissions(permissions.DjangoModelPermissions):
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or (not user.is_authenticated and self.authenticated_users_only):
+            return False
+
+        if getattr(view, "_ignore_model_permissions", False):
+            return True
+
+        queryset = self._queryset(view)
+        perms = self.get_required_permissions(request.method, queryset.model)
+        if not perms:
+            return True
+        if isinstance(user, ClaimsUser):
+            return user.has_perms(perms)
+        if not user.is_active:
+            return False
+        if user.is_superuser:
+            return True
+        return set(perms) <= get_cached_permissions(user)
+
 
 class IsOwnerOfVehicleOrRecord(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         user = request.user
 
-        if hasattr(obj, "owner"):
-            return obj.owner and obj.owner.user == user
+        if user.is_staff:
+            return True
+
+        if not user.is_authenticated:
+            return False
 
-        if hasattr(obj, "vehicle") and hasattr(obj.vehicle, "owner"):
-            return obj.vehicle.owner and obj.vehicle.owner.user == user
+        if hasattr(obj, "owner_id"):
+            return obj.owner_id is not None and self._owns(user, obj.owner_id, obj)
+
+        if hasattr(obj, "vehicle_id"):
+            owner_id = obj.vehicle.owner_id
+            return owner_id is not None and self._owns(user, owner_id, obj.vehicle)
 
         return False
+
+    @staticmethod
+    def _owns(user, owner_id, vehicle):
+        if isinstance(user, ClaimsUser):
+            return owner_id == user.customer_id
+        return vehicle.owner.user_id == user.id
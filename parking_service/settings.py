@@ -52,9 +52,11 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "drf_spectacular",
+    "parking_service",
     "authentication",
     "customers",
     "vehicles",
@@ -62,6 +64,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "parking_service.instrumentation.RequestInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -98,6 +101,30 @@ WSGI_APPLICATION = "parking_service.wsgi.application"
 DATABASES = {"default": dj_database_url.config(default=config("DATABASE_URL"))}
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHE_BACKEND = config(
+    "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+)
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": config("CACHE_LOCATION", default="parking-service"),
+        "KEY_PREFIX": "parking",
+    }
+}
+# The in-process cache culls a third of its keys once it is full; size it for
+# the list caches, permissions and auth versions it holds (Django's default
+# is only 300 entries).
+if CACHE_BACKEND.endswith("LocMemCache"):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=100000, cast=int)
+    }
+
+API_LIST_CACHE_TIMEOUT = config("API_LIST_CACHE_TIMEOUT", default=300, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -172,12 +199,90 @@ JAZZMIN_SETTINGS = {
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "parking_service.authentication.ClaimsJWTAuthentication",
     ],
-    "DEFAULT_FILTER_BACKENDS": ["dj_rql.drf.RQLFilterBackend"],
+    "DEFAULT_FILTER_BACKENDS": ["parking_service.filters.IndexedRQLFilterBackend"],
+    "DEFAULT_PAGINATION_CLASS": "parking_service.pagination.DefaultCursorPagination",
+    "PAGE_SIZE": config("API_PAGE_SIZE", default=50, cast=int),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Access tokens carry the user's staff flag, customer and permissions, so API
+# requests are authorized without loading the user. A per-user version stored
+# in the database revokes them as soon as the user, its groups or permissions
+# change.
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "authentication.serializers.ClaimsTokenObtainPairSerializer"
+    ),
+    "TOKEN_USER_CLASS": "parking_service.authentication.ClaimsUser",
+}
+
+# Each process caches token auth versions this long, which bounds how late a
+# revocation is seen by workers that do not share the cache.
+AUTH_VERSION_CACHE_TIMEOUT = config("AUTH_VERSION_CACHE_TIMEOUT", default=30, cast=int)
+
+# Resolved model permissions of session users are cached and dropped whenever
+# their groups or permissions change.
+AUTH_PERMISSIONS_CACHE_TIMEOUT = config(
+    "AUTH_PERMISSIONS_CACHE_TIMEOUT", default=3600, cast=int
+)
+
+# Responses to POSTs sent with an Idempotency-Key header are stored in the
+# database this long and replayed to retries; a key claimed by a request that
+# never finished is taken over after the lock timeout.
+IDEMPOTENCY_KEY_TTL = config("IDEMPOTENCY_KEY_TTL", default=86400, cast=int)
+IDEMPOTENCY_LOCK_TIMEOUT = config("IDEMPOTENCY_LOCK_TIMEOUT", default=60, cast=int)
+
+# API filters only expose indexed fields (staff get the full set); parsed RQL
+# queries are kept per view in an LRU of this size.
+RQL_QUERIES_CACHE_SIZE = config("RQL_QUERIES_CACHE_SIZE", default=256, cast=int)
+
+# Closed parking records older than this are moved to the archive table by
+# the archive_parking_records command; listings and reports read both tables.
+PARKING_ARCHIVE_AFTER_DAYS = config("PARKING_ARCHIVE_AFTER_DAYS", default=180, cast=int)
+
+# Monthly statements are totalled by a single grouped scan of the month; this
+# many workers then upsert the resulting batches concurrently.
+PARKING_STATEMENT_WORKERS = config("PARKING_STATEMENT_WORKERS", default=4, cast=int)
+
+PARKING_OCCUPANCY_RESYNC_SECONDS = config(
+    "PARKING_OCCUPANCY_RESYNC_SECONDS", default=300, cast=int
+)
+
+VEHICLE_DETAILS_BACKEND = config(
+    "VEHICLE_DETAILS_BACKEND",
+    default="vehicles.enrichment.FakerVehicleDetailsBackend",
+)
+
+# "local" delivers spot events within one process; "postgres" fans them out to
+# every worker through LISTEN/NOTIFY.
+PARKING_EVENTS_BACKEND = config("PARKING_EVENTS_BACKEND", default="local")
+
+# Records query count, SQL, view and serializer time per request, exposed through
+# the Server-Timing header, structured logs and the /metrics endpoint.
+REQUEST_INSTRUMENTATION = config("REQUEST_INSTRUMENTATION", default=False, cast=bool)
+REQUEST_QUERY_COUNT_THRESHOLD = config(
+    "REQUEST_QUERY_COUNT_THRESHOLD", default=20, cast=int
+)
+# Bearer token Prometheus must send to scrape /metrics; the endpoint stays
+# disabled while it is empty.
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "parking_service.requests": {
+            "handlers": ["console"],
+            "level": config("REQUEST_LOG_LEVEL", default="INFO"),
+        },
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Parking Service API",
     "DESCRIPTION": "API do Parking Service.",
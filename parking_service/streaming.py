@@ -0,0 +1,31 @@
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONStreamingListMixin:
+    stream_query_param = "stream"
+    stream_chunk_size = 2000
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.stream_query_param) != "ndjson":
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            ordering = self.paginator.get_ordering(request, queryset, self)
+            queryset = queryset.order_by(*ordering)
+
+        serializer = self.get_serializer()
+        response = StreamingHttpResponse(
+            self._stream_rows(queryset, serializer),
+            content_type="application/x-ndjson",
+        )
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def _stream_rows(self, queryset, serializer):
+        for obj in queryset.iterator(chunk_size=self.stream_chunk_size):
+            row = serializer.to_representation(obj)
+            yield json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + "\n"
@@ -6,6 +6,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from .instrumentation import metrics_view
+
 urlpatterns = [
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -20,5 +22,6 @@ urlpatterns = [
     path("api/v1/", include("customers.urls")),
     path("api/v1/", include("parking.urls")),
     path("api/v1/", include("vehicles.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path("", admin.site.urls),
 ]
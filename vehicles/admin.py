@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Vehicle, VehicleType
+from .plates import normalize_plate
 
 
 @admin.register(VehicleType)
@@ -12,8 +13,15 @@ class VehicleTypeAdmin(admin.ModelAdmin):
 @admin.register(Vehicle)
 class VehicleAdmin(admin.ModelAdmin):
     list_display = ["license_plate", "brand", "model", "color", "owner"]
-    search_fields = ["license_plate", "model"]
+    search_fields = ["license_plate"]
+    search_help_text = "Busca pelo início da placa, com ou sem hífen."
     list_filter = ["vehicle_type"]
 
+    def get_search_results(self, request, queryset, search_term):
+        normalized = normalize_plate(search_term)
+        if not normalized:
+            return queryset, False
+        return queryset.filter(plate_normalized__startswith=normalized), False
+
     class Media:
         js = ("js/vehicle_admin.js",)
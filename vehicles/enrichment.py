@@ -0,0 +1,79 @@
+from collections import deque
+from threading import Lock
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from faker import Faker
+from faker_vehicle import VehicleProvider
+
+DEFAULT_BACKEND = "vehicles.enrichment.FakerVehicleDetailsBackend"
+
+
+class VehicleDetails(NamedTuple):
+    brand: str
+    model: str
+    color: str
+
+
+class FakerVehicleDetailsBackend:
+    def __init__(self, locale: str = "pt_BR", batch_size: int = 256):
+        self._fake = Faker(locale)
+        self._fake.add_provider(VehicleProvider)
+        self._batch_size = batch_size
+        self._buffer = deque()
+        self._lock = Lock()
+
+    def _generate(self, count: int) -> list[VehicleDetails]:
+        return [
+            VehicleDetails(
+                brand=self._fake.vehicle_make(),
+                model=self._fake.vehicle_model(),
+                color=self._fake.safe_color_name(),
+            )
+            for _ in range(count)
+        ]
+
+    def prefill(self, count: int) -> None:
+        with self._lock:
+            missing = count - len(self._buffer)
+            if missing > 0:
+                self._buffer.extend(self._generate(missing))
+
+    def get_details(self, license_plates: list[str]) -> list[VehicleDetails]:
+        count = len(license_plates)
+        with self._lock:
+            if len(self._buffer) < count:
+                refill = max(self._batch_size, count - len(self._buffer))
+                self._buffer.extend(self._generate(refill))
+            return [self._buffer.popleft() for _ in range(count)]
+
+
+_backend = None
+_backend_lock = Lock()
+
+
+def get_vehicle_details_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_path = getattr(
+                    settings, "VEHICLE_DETAILS_BACKEND", DEFAULT_BACKEND
+                )
+                _backend = import_string(backend_path)()
+    return _backend
+
+
+def get_vehicle_details(license_plates: list[str]) -> list[VehicleDetails]:
+    return get_vehicle_details_backend().get_details(license_plates)
+
+
+@receiver(setting_changed)
+def reset_vehicle_details_backend(setting, **kwargs):
+    global _backend
+    if setting == "VEHICLE_DETAILS_BACKEND":
+        with _backend_lock:
+            _backend = None
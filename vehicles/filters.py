@@ -1,11 +1,46 @@
-from dj_rql.filter_cls import AutoRQLFilterClass
+from parking_service.filters import EXACT_LOOKUPS, IndexedRQLFilterClass
 
 from .models import Vehicle, VehicleType
 
 
-class VehicleTypeFilterClass(AutoRQLFilterClass):
+class VehicleTypeFilterClass(IndexedRQLFilterClass):
     MODEL = VehicleType
+    FILTERS = (
+        {"filter": "id", "lookups": EXACT_LOOKUPS},
+        {"filter": "name", "lookups": EXACT_LOOKUPS, "ordering": True},
+    )
 
 
-class VehicleFilterClass(AutoRQLFilterClass):
+class VehicleTypeOpsFilterClass(VehicleTypeFilterClass):
+    FILTERS = (
+        *VehicleTypeFilterClass.FILTERS,
+        "description",
+        {"filter": "created_at", "ordering": True},
+    )
+
+
+class VehicleFilterClass(IndexedRQLFilterClass):
+    MODEL = Vehicle
+    FILTERS = (
+        {"filter": "id", "lookups": EXACT_LOOKUPS},
+        {"filter": "license_plate", "lookups": EXACT_LOOKUPS, "ordering": True},
+        {"filter": "owner", "source": "owner__id", "lookups": EXACT_LOOKUPS},
+        {
+            "filter": "vehicle_type",
+            "source": "vehicle_type__id",
+            "lookups": EXACT_LOOKUPS,
+        },
+    )
+
+
+class VehicleOpsFilterClass(IndexedRQLFilterClass):
     MODEL = Vehicle
+    FILTERS = (
+        *VehicleFilterClass.FILTERS[:1],
+        {"filter": "license_plate", "ordering": True},
+        *VehicleFilterClass.FILTERS[2:],
+        "brand",
+        "model",
+        "color",
+        {"filter": "created_at", "ordering": True},
+    )
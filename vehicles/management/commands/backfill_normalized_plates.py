@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from vehicles.services import backfill_normalized_plates
+
+
+class Command(BaseCommand):
+    help = "Preenche a placa normalizada dos veículos em lotes por faixa de id."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        updated = backfill_normalized_plates(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{updated} placas normalizadas."))
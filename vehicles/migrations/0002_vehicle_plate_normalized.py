@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:41
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+import vehicles.plates
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("customers", "0001_initial"),
+        ("vehicles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vehicle",
+            name="plate_normalized",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=10,
+                verbose_name="Placa normalizada",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vehicle",
+            index=models.Index(
+                fields=["plate_normalized"],
+                name="vehicle_plate_normalized_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vehicle",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    vehicles.plates.PlateOCRKey("plate_normalized"),
+                    name="text_pattern_ops",
+                ),
+                name="vehicle_plate_ocr_key_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,10 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
 
 from customers.models import Customer
 
+from .plates import PlateOCRKey, normalize_plate
+
 
 class VehicleType(models.Model):
     name = models.CharField(
@@ -39,6 +42,13 @@ class Vehicle(models.Model):
         unique=True,
         verbose_name="Placa",
     )
+    plate_normalized = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Placa normalizada",
+    )
     brand = models.CharField(
         max_length=50,
         blank=True,
@@ -68,6 +78,24 @@ class Vehicle(models.Model):
     class Meta:
         verbose_name = "Veículo"
         verbose_name_plural = "Veículos"
+        indexes = [
+            models.Index(
+                fields=["plate_normalized"],
+                name="vehicle_plate_normalized_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                OpClass(PlateOCRKey("plate_normalized"), name="text_pattern_ops"),
+                name="vehicle_plate_ocr_key_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.license_plate} - {self.brand} {self.model}"
+
+    def save(self, *args, **kwargs):
+        self.plate_normalized = normalize_plate(self.license_plate)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "license_plate" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "plate_normalized"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,27 @@
+import re
+
+from django.db import models
+
+OCR_CONFUSABLE = "OQDILSBZG"
+OCR_CANONICAL = "000115826"
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9A-Z]")
+_OCR_TABLE = str.maketrans(OCR_CONFUSABLE, OCR_CANONICAL)
+
+
+def normalize_plate(license_plate: str) -> str:
+    return _NON_ALPHANUMERIC.sub("", (license_plate or "").upper())
+
+
+def plate_ocr_key(license_plate: str) -> str:
+    return normalize_plate(license_plate).translate(_OCR_TABLE)
+
+
+class NormalizedPlate(models.Func):
+    template = "UPPER(REGEXP_REPLACE(%(expressions)s, '[^A-Za-z0-9]', '', 'g'))"
+    output_field = models.CharField()
+
+
+class PlateOCRKey(models.Func):
+    template = f"TRANSLATE(%(expressions)s, '{OCR_CONFUSABLE}', '{OCR_CANONICAL}')"
+    output_field = models.CharField()
@@ -30,3 +30,23 @@ class VehicleSerializer(serializers.ModelSerializer):
 
     def get_admin_url(self, obj):
         return reverse("admin:vehicles_vehicle_changelist")
+
+
+class BulkPlateLookupSerializer(serializers.Serializer):
+    license_plates = serializers.ListField(
+        child=serializers.CharField(max_length=10),
+        allow_empty=False,
+        max_length=1000,
+    )
+
+
+class PlateSearchQuerySerializer(serializers.Serializer):
+    plate = serializers.CharField(max_length=20)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class PlateSearchResultSerializer(VehicleSerializer):
+    score = serializers.FloatField(source="rank", read_only=True)
+
+    class Meta(VehicleSerializer.Meta):
+        fields = [*VehicleSerializer.Meta.fields, "score"]
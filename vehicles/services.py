@@ -1,9 +1,28 @@
-from faker import Faker
-from faker_vehicle import VehicleProvider
+import functools
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, FloatField, Max, Q, Value, When
 
 from customers.models import Customer
+from parking_service.cache import model_cache_key
 
+from .enrichment import get_vehicle_details
 from .models import Vehicle, VehicleType
+from .plates import NormalizedPlate, PlateOCRKey, normalize_plate, plate_ocr_key
+
+PLATE_SEARCH_MIN_LENGTH = 3
+
+
+def get_vehicle_type(vehicle_type_id: int) -> VehicleType:
+    key = model_cache_key(VehicleType, "pk", vehicle_type_id)
+    vehicle_type = cache.get(key)
+    if vehicle_type is None:
+        vehicle_type = VehicleType.objects.get(pk=vehicle_type_id)
+        cache.set(key, vehicle_type, timeout=settings.API_LIST_CACHE_TIMEOUT)
+    return vehicle_type
 
 
 def get_or_create_vehicle_with_details(
@@ -16,7 +35,7 @@ def get_or_create_vehicle_with_details(
     if owner_id:
         defaults["owner"] = Customer.objects.get(pk=owner_id)
     if vehicle_type_id:
-        defaults["vehicle_type"] = VehicleType.objects.get(pk=vehicle_type_id)
+        defaults["vehicle_type"] = get_vehicle_type(vehicle_type_id)
 
     vehicle, created = Vehicle.objects.get_or_create(
         license_plate=license_plate, defaults=defaults
@@ -24,12 +43,11 @@ def get_or_create_vehicle_with_details(
 
     if created:
         if not vehicle.brand and not vehicle.model:
-            fake = Faker("pt_BR")
-            fake.add_provider(VehicleProvider)
-            vehicle.brand = fake.vehicle_make()
-            vehicle.model = fake.vehicle_model()
-            vehicle.color = fake.safe_color_name()
-            vehicle.save()
+            details = get_vehicle_details([license_plate])[0]
+            vehicle.brand = details.brand
+            vehicle.model = details.model
+            vehicle.color = details.color
+            vehicle.save(update_fields=["brand", "model", "color", "updated_at"])
     else:
         updated = False
         if owner_id and vehicle.owner_id != owner_id:
@@ -42,3 +60,88 @@ def get_or_create_vehicle_with_details(
             vehicle.save(update_fields=["owner", "vehicle_type", "updated_at"])
 
     return vehicle
+
+
+def get_or_create_vehicles_by_plates(license_plates: list[str]) -> list[Vehicle]:
+    plates = list(dict.fromkeys(plate for plate in license_plates if plate))
+    if not plates:
+        raise ValueError("Informe ao menos uma placa.")
+
+    vehicles = {
+        vehicle.license_plate: vehicle
+        for vehicle in Vehicle.objects.filter(license_plate__in=plates)
+    }
+
+    missing = [plate for plate in plates if plate not in vehicles]
+    if missing:
+        Vehicle.objects.bulk_create(
+            [
+                Vehicle(
+                    license_plate=plate,
+                    plate_normalized=normalize_plate(plate),
+                    **details._asdict(),
+                )
+                for plate, details in zip(
+                    missing, get_vehicle_details(missing), strict=True
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        vehicles.update(
+            (vehicle.license_plate, vehicle)
+            for vehicle in Vehicle.objects.filter(license_plate__in=missing)
+        )
+
+    return [vehicles[plate] for plate in plates]
+
+
+@functools.cache
+def has_trigram_search() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def search_vehicles_by_plate(queryset, plate: str, limit: int = 10):
+    normalized = normalize_plate(plate)
+    if len(normalized) < PLATE_SEARCH_MIN_LENGTH:
+        raise ValueError(
+            f"Informe ao menos {PLATE_SEARCH_MIN_LENGTH} caracteres da placa."
+        )
+    ocr_key = plate_ocr_key(normalized)
+
+    queryset = queryset.alias(plate_ocr_key=PlateOCRKey("plate_normalized"))
+    matches = Q(plate_normalized__startswith=normalized) | Q(
+        plate_ocr_key__startswith=ocr_key
+    )
+    fuzzy_rank = Value(0.0)
+    if has_trigram_search():
+        matches |= Q(plate_normalized__trigram_similar=normalized)
+        fuzzy_rank = TrigramSimilarity("plate_normalized", normalized) * 0.6
+
+    return (
+        queryset.filter(matches)
+        .annotate(
+            rank=Case(
+                When(plate_normalized=normalized, then=Value(1.0)),
+                When(plate_ocr_key=ocr_key, then=Value(0.9)),
+                When(plate_normalized__startswith=normalized, then=Value(0.8)),
+                When(plate_ocr_key__startswith=ocr_key, then=Value(0.7)),
+                default=fuzzy_rank,
+                output_field=FloatField(),
+            )
+        )
+        .order_by("-rank", "plate_normalized")[:limit]
+    )
+
+
+def backfill_normalized_plates(batch_size: int = 5000) -> int:
+    last_id = Vehicle.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    updated = 0
+    for start in range(0, last_id + 1, batch_size):
+        updated += (
+            Vehicle.objects.filter(id__gte=start, id__lt=start + batch_size)
+            .exclude(plate_normalized=NormalizedPlate("license_plate"))
+            .update(plate_normalized=NormalizedPlate("license_plate"))
+        )
+    return updated
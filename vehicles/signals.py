@@ -0,0 +1,5 @@
+from parking_service.cache import connect_cache_invalidation
+
+from .models import VehicleType
+
+connect_cache_invalidation(VehicleType)
@@ -1,12 +1,27 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 from customers.models import Customer
-
+from parking_service.models import IdempotencyKey
+
+from .enrichment import (
+    FakerVehicleDetailsBackend,
+    VehicleDetails,
+    get_vehicle_details,
+    get_vehicle_details_backend,
+)
 from .models import Vehicle, VehicleType
-from .services import get_or_create_vehicle_with_details
+from .plates import normalize_plate, plate_ocr_key
+from .services import (
+    backfill_normalized_plates,
+    get_or_create_vehicle_with_details,
+    get_or_create_vehicles_by_plates,
+)
+from .views import VehicleViewSet
 
 
 @pytest.fixture
@@ -133,8 +148,8 @@ def test_regular_user_can_only_see_their_vehicles(regular_user_client):
     response_list = client.get("/api/v1/vehicles/")
 
     assert response_list.status_code == 200
-    assert len(response_list.data) == 1
-    assert response_list.data[0]["license_plate"] == "MEU123"
+    assert len(response_list.data["results"]) == 1
+    assert response_list.data["results"][0]["license_plate"] == "MEU123"
 
 
 @pytest.mark.django_db
@@ -146,3 +161,354 @@ def test_api_get_by_plate_handles_invalid_owner_id(admin_client):
     )
     assert response.status_code == 404
     assert "não foi encontrado" in response.data["error"]
+
+
+@pytest.mark.django_db
+def test_service_bulk_resolves_existing_and_creates_missing(
+    django_assert_num_queries,
+):
+    existing = Vehicle.objects.create(license_plate="BULK001", brand="Original")
+    plates = ["BULK002", "BULK001", "BULK003", "BULK002"]
+
+    with django_assert_num_queries(3):
+        vehicles = get_or_create_vehicles_by_plates(plates)
+
+    assert [vehicle.license_plate for vehicle in vehicles] == [
+        "BULK002",
+        "BULK001",
+        "BULK003",
+    ]
+    assert vehicles[1].id == existing.id
+    assert vehicles[1].brand == "Original"
+    assert all(vehicle.id and vehicle.brand for vehicle in vehicles)
+    assert Vehicle.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_service_bulk_requires_plates():
+    with pytest.raises(ValueError, match="Informe ao menos uma placa."):
+        get_or_create_vehicles_by_plates(["", ""])
+
+
+@pytest.mark.django_db
+def test_api_get_by_plate_bulk(admin_client, django_assert_max_num_queries):
+    Vehicle.objects.create(license_plate="LPR0000")
+    plates = [f"LPR{number:04d}" for number in range(200)]
+
+    with django_assert_max_num_queries(6):
+        response = admin_client.post(
+            "/api/v1/vehicles/get-by-plate/bulk/",
+            {"license_plates": plates},
+            format="json",
+        )
+    assert response.status_code == 200
+    assert [item["license_plate"] for item in response.data] == plates
+    assert Vehicle.objects.count() == 200
+
+
+@pytest.mark.django_db
+def test_api_get_by_plate_bulk_validates_payload(admin_client):
+    response = admin_client.post(
+        "/api/v1/vehicles/get-by-plate/bulk/",
+        {"license_plates": ["PLACA-LONGA-DEMAIS"]},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert "license_plates" in response.data
+
+
+class StaticVehicleDetailsBackend:
+    def get_details(self, license_plates):
+        return [VehicleDetails("Marca Fixa", "Modelo Fixo", "Preto")] * len(
+            license_plates
+        )
+
+
+def test_vehicle_details_backend_is_cached():
+    assert get_vehicle_details_backend() is get_vehicle_details_backend()
+
+
+def test_faker_backend_generates_details_in_batches():
+    backend = FakerVehicleDetailsBackend(batch_size=10)
+    backend.prefill(25)
+
+    details = backend.get_details(["A", "B", "C"])
+    assert len(details) == 3
+    assert all(isinstance(item, VehicleDetails) and item.brand for item in details)
+    assert len(backend._buffer) == 22
+
+    assert len(backend.get_details(["X"] * 30)) == 30
+    assert len(backend._buffer) == 2
+
+
+def test_vehicle_details_backend_is_pluggable(settings):
+    settings.VEHICLE_DETAILS_BACKEND = "vehicles.tests.StaticVehicleDetailsBackend"
+    assert get_vehicle_details(["ABC1D23"]) == [
+        VehicleDetails("Marca Fixa", "Modelo Fixo", "Preto")
+    ]
+
+
+@pytest.mark.django_db
+def test_service_uses_configured_vehicle_details_backend(settings):
+    settings.VEHICLE_DETAILS_BACKEND = "vehicles.tests.StaticVehicleDetailsBackend"
+    vehicle = get_or_create_vehicle_with_details(license_plate="STATIC1")
+    vehicles = get_or_create_vehicles_by_plates(["STATIC2", "STATIC3"])
+
+    vehicle.refresh_from_db()
+    assert vehicle.brand == "Marca Fixa"
+    assert {item.model for item in vehicles} == {"Modelo Fixo"}
+
+
+@pytest.mark.django_db
+def test_vehicle_type_api_query_counts(admin_client, django_assert_max_num_queries):
+    types = [VehicleType.objects.create(name=f"Tipo {n}") for n in range(5)]
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get("/api/v1/vehicles/type/")
+    assert response.status_code == 200
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get(f"/api/v1/vehicles/type/{types[0].id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_vehicle_api_query_counts_for_staff(
+    admin_client, django_assert_max_num_queries
+):
+    owner = Customer.objects.create(name="Dono")
+    vehicles = [
+        Vehicle.objects.create(license_plate=f"QRY{n}", owner=owner) for n in range(5)
+    ]
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get("/api/v1/vehicles/")
+    assert len(response.data["results"]) == 5
+
+    with django_assert_max_num_queries(1):
+        response = admin_client.get(f"/api/v1/vehicles/{vehicles[0].id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_vehicle_api_query_counts_for_owner(
+    regular_user_client, django_assert_max_num_queries
+):
+    client, user = regular_user_client
+    owner = Customer.objects.create(name="Eu", user=user)
+    vehicles = [
+        Vehicle.objects.create(license_plate=f"MINE{n}", owner=owner) for n in range(5)
+    ]
+
+    with django_assert_max_num_queries(1):
+        response = client.get("/api/v1/vehicles/")
+    assert len(response.data["results"]) == 5
+
+    with django_assert_max_num_queries(1):
+        response = client.get(f"/api/v1/vehicles/{vehicles[0].id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_vehicle_type_api_list_is_cached_and_invalidated(
+    admin_client, django_assert_num_queries
+):
+    cache.clear()
+    VehicleType.objects.create(name="Carro")
+    response = admin_client.get("/api/v1/vehicles/type/")
+    assert [item["name"] for item in response.data["results"]] == ["Carro"]
+
+    with django_assert_num_queries(0):
+        response = admin_client.get("/api/v1/vehicles/type/")
+    assert [item["name"] for item in response.data["results"]] == ["Carro"]
+
+    VehicleType.objects.create(name="Moto")
+    response = admin_client.get("/api/v1/vehicles/type/")
+    assert len(response.data["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_service_caches_vehicle_type(django_assert_num_queries):
+    cache.clear()
+    vtype = VehicleType.objects.create(name="Utilitário")
+    vehicle = get_or_create_vehicle_with_details(
+        license_plate="CACHE12", vehicle_type_id=vtype.id
+    )
+
+    with django_assert_num_queries(1):
+        cached = get_or_create_vehicle_with_details(
+            license_plate="CACHE12", vehicle_type_id=vtype.id
+        )
+    assert cached.id == vehicle.id
+
+
+@pytest.mark.django_db
+def test_service_ignores_stale_plate_cache():
+    cache.clear()
+    vehicle = get_or_create_vehicle_with_details(license_plate="OLD1234")
+    vehicle.license_plate = "NEW1234"
+    vehicle.save()
+
+    recreated = get_or_create_vehicle_with_details(license_plate="OLD1234")
+    assert recreated.id != vehicle.id
+    assert recreated.license_plate == "OLD1234"
+
+
+@pytest.mark.django_db
+def test_async_vehicle_by_plate(client):
+    user = User.objects.create_user(username="dono", password="password")
+    owner = Customer.objects.create(name="Dono", user=user)
+    Vehicle.objects.create(license_plate="ASY-1234", owner=owner, brand="Fiat")
+    Vehicle.objects.create(license_plate="ASY-9999")
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    response = client.get("/api/v1/async/vehicles/by-plate/ASY-1234/", **headers)
+    assert response.status_code == 200
+    assert response.json()["brand"] == "Fiat"
+
+    response = client.get("/api/v1/async/vehicles/by-plate/ASY-9999/", **headers)
+    assert response.status_code == 404
+
+    response = client.get("/api/v1/async/vehicles/by-plate/ASY-1234/")
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_vehicle_create_replays_idempotent_retries(
+    admin_client, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    headers = {"HTTP_IDEMPOTENCY_KEY": "gate-7:req-1"}
+    payload = {"license_plate": "IDM1234"}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = admin_client.post(
+            "/api/v1/vehicles/", payload, format="json", **headers
+        )
+    with django_assert_num_queries(0):
+        retry = admin_client.post(
+            "/api/v1/vehicles/", payload, format="json", **headers
+        )
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.data == first.data
+    assert retry["Idempotent-Replayed"] == "true"
+    assert Vehicle.objects.filter(license_plate="IDM1234").count() == 1
+
+    response = admin_client.post(
+        "/api/v1/vehicles/", {"license_plate": "IDM5678"}, format="json", **headers
+    )
+    assert response.status_code == 422
+
+
+def test_plate_normalization_and_ocr_key():
+    assert normalize_plate(" abc-1d23 ") == "ABC1D23"
+    assert plate_ocr_key("ABC-1D23") == plate_ocr_key("A8C1023")
+
+
+@pytest.mark.django_db
+def test_vehicle_save_and_backfill_fill_normalized_plate():
+    vehicle = Vehicle.objects.create(license_plate="abc-1d23")
+    assert vehicle.plate_normalized == "ABC1D23"
+
+    vehicle.license_plate = "xyz-9876"
+    vehicle.save(update_fields=["license_plate"])
+    vehicle.refresh_from_db()
+    assert vehicle.plate_normalized == "XYZ9876"
+
+    Vehicle.objects.bulk_create(
+        Vehicle(license_plate=plate) for plate in ["bkf-0001", "BKF0002", "b.k.f 3"]
+    )
+    assert backfill_normalized_plates(batch_size=2) == 3
+    assert backfill_normalized_plates(batch_size=2) == 0
+    assert set(
+        Vehicle.objects.filter(plate_normalized__startswith="BKF").values_list(
+            "plate_normalized", flat=True
+        )
+    ) == {"BKF0001", "BKF0002", "BKF3"}
+
+
+@pytest.mark.django_db
+def test_api_vehicle_search_ranks_plate_matches(admin_client):
+    for plate in ["ABC1D23", "ABC1D24", "A8C-1023", "XYZ9999", "ABC1D2"]:
+        Vehicle.objects.create(license_plate=plate)
+
+    response = admin_client.get("/api/v1/vehicles/search/?plate=abc-1d23")
+
+    assert response.status_code == 200
+    assert [(r["license_plate"], r["score"]) for r in response.data["results"]] == [
+        ("ABC1D23", 1.0),
+        ("A8C-1023", 0.9),
+    ]
+
+    response = admin_client.get("/api/v1/vehicles/search/?plate=abc1d2&limit=2")
+    assert [r["license_plate"] for r in response.data["results"]] == [
+        "ABC1D2",
+        "ABC1D23",
+    ]
+
+    response = admin_client.get("/api/v1/vehicles/search/?plate=a-b")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_api_vehicle_search_is_scoped_to_owner(regular_user_client):
+    client, user = regular_user_client
+    customer = Customer.objects.create(name="Eu", user=user)
+    Vehicle.objects.create(license_plate="SRC1234", owner=customer)
+    Vehicle.objects.create(license_plate="SRC1235")
+
+    response = client.get("/api/v1/vehicles/search/?plate=SRC123")
+
+    assert response.status_code == 200
+    assert [r["license_plate"] for r in response.data["results"]] == ["SRC1234"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["brand=Fiat", "color=Azul", "nonexistent=1"])
+def test_api_vehicle_list_rejects_unknown_filters_for_owner(regular_user_client, query):
+    client, user = regular_user_client
+    owner = Customer.objects.create(name="Eu", user=user)
+    Vehicle.objects.create(license_plate="FLT0001", owner=owner, brand="Fiat")
+
+    response = client.get(f"/api/v1/vehicles/?{query}")
+
+    assert response.status_code == 400
+    assert response.data["error"] == "Filtro inválido ou não permitido."
+
+
+@pytest.mark.django_db
+def test_api_vehicle_list_applies_ops_filters_for_staff(admin_client):
+    owner = Customer.objects.create(name="Dono")
+    fiat = Vehicle.objects.create(license_plate="FLT0001", owner=owner, brand="Fiat")
+    Vehicle.objects.create(license_plate="FLT0002", owner=owner, brand="Ford")
+
+    response = admin_client.get("/api/v1/vehicles/?brand=Fiat&page_size=10")
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data["results"]] == [fiat.id]
+
+
+@pytest.mark.django_db
+def test_vehicle_create_failure_releases_idempotency_key(admin_client, monkeypatch):
+    cache.clear()
+    headers = {"HTTP_IDEMPOTENCY_KEY": "gate-7:req-2"}
+    payload = {"license_plate": "IDM9012"}
+    claims = []
+
+    def failing_create(self, serializer):
+        claims.append(IdempotencyKey.objects.filter(status__isnull=True).count())
+        serializer.save()
+        raise RuntimeError("falha ao gravar")
+
+    monkeypatch.setattr(VehicleViewSet, "perform_create", failing_create)
+    with pytest.raises(RuntimeError):
+        admin_client.post("/api/v1/vehicles/", payload, format="json", **headers)
+    assert claims == [1]
+    assert not IdempotencyKey.objects.exists()
+    assert not Vehicle.objects.filter(license_plate="IDM9012").exists()
+
+    monkeypatch.undo()
+    response = admin_client.post("/api/v1/vehicles/", payload, format="json", **headers)
+    assert response.status_code == 201
+    assert IdempotencyKey.objects.get().status == 201
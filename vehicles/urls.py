@@ -1,12 +1,17 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import VehicleTypeViewSet, VehicleViewSet
+from .views import VehicleTypeViewSet, VehicleViewSet, vehicle_by_plate_async
 
 router = DefaultRouter()
 router.register("vehicles/type", VehicleTypeViewSet)
 router.register("vehicles", VehicleViewSet)
 
 urlpatterns = [
+    path(
+        "async/vehicles/by-plate/<str:license_plate>/",
+        vehicle_by_plate_async,
+        name="vehicle-by-plate-async",
+    ),
     path("", include(router.urls)),
 ]
@@ -1,35 +1,71 @@
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.permissions import DjangoModelPermissions, IsAdminUser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
-from parking_service.permissions import IsOwnerOfVehicleOrRecord
+from parking_service.authentication import (
+    aauthenticate,
+    not_authenticated_response,
+    owner_filter,
+)
+from parking_service.cache import CachedListMixin
+from parking_service.filters import OpsRQLFilterMixin
+from parking_service.idempotency import IdempotentCreateMixin
+from parking_service.permissions import (
+    CachedDjangoModelPermissions,
+    IsOwnerOfVehicleOrRecord,
+)
+from parking_service.streaming import NDJSONStreamingListMixin
 
-from .filters import VehicleFilterClass, VehicleTypeFilterClass
+from .filters import (
+    VehicleFilterClass,
+    VehicleOpsFilterClass,
+    VehicleTypeFilterClass,
+    VehicleTypeOpsFilterClass,
+)
 from .models import Vehicle, VehicleType
-from .serializers import VehicleSerializer, VehicleTypeSerializer
-from .services import get_or_create_vehicle_with_details
+from .serializers import (
+    BulkPlateLookupSerializer,
+    PlateSearchQuerySerializer,
+    PlateSearchResultSerializer,
+    VehicleSerializer,
+    VehicleTypeSerializer,
+)
+from .services import (
+    get_or_create_vehicle_with_details,
+    get_or_create_vehicles_by_plates,
+    search_vehicles_by_plate,
+)
 
 
-class VehicleTypeViewSet(viewsets.ModelViewSet):
+class VehicleTypeViewSet(OpsRQLFilterMixin, CachedListMixin, viewsets.ModelViewSet):
     queryset = VehicleType.objects.all()
     serializer_class = VehicleTypeSerializer
     rql_filter_class = VehicleTypeFilterClass
-    permission_classes = [DjangoModelPermissions, IsAdminUser]
+    ops_rql_filter_class = VehicleTypeOpsFilterClass
+    permission_classes = [CachedDjangoModelPermissions, IsAdminUser]
 
 
-class VehicleViewSet(viewsets.ModelViewSet):
+class VehicleViewSet(
+    OpsRQLFilterMixin,
+    IdempotentCreateMixin,
+    NDJSONStreamingListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Vehicle.objects.all()
     serializer_class = VehicleSerializer
     rql_filter_class = VehicleFilterClass
-    permission_classes = [DjangoModelPermissions, IsOwnerOfVehicleOrRecord]
+    ops_rql_filter_class = VehicleOpsFilterClass
+    permission_classes = [CachedDjangoModelPermissions, IsOwnerOfVehicleOrRecord]
 
     def get_queryset(self):
         user = self.request.user
         if user.is_staff:
             return Vehicle.objects.all()
-        return Vehicle.objects.filter(owner__user=user)
+        return Vehicle.objects.filter(owner_filter(user)).select_related("owner")
 
     @action(detail=False, methods=["post"], url_path="get-by-plate")
     def get_by_plate(self, request):
@@ -59,3 +95,52 @@ class VehicleViewSet(viewsets.ModelViewSet):
                 {"error": "Ocorreu um erro interno ao processar a solicitação."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+    @action(detail=False, methods=["post"], url_path="get-by-plate/bulk")
+    def get_by_plate_bulk(self, request):
+        input_serializer = BulkPlateLookupSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+
+        try:
+            vehicles = get_or_create_vehicles_by_plates(
+                input_serializer.validated_data["license_plates"]
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(vehicles, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        query = PlateSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        try:
+            vehicles = search_vehicles_by_plate(
+                self.get_queryset(),
+                query.validated_data["plate"],
+                limit=query.validated_data["limit"],
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = PlateSearchResultSerializer(
+            vehicles, many=True, context=self.get_serializer_context()
+        )
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
+
+
+@require_GET
+async def vehicle_by_plate_async(request, license_plate):
+    user = await aauthenticate(request)
+    if user is None:
+        return not_authenticated_response()
+
+    queryset = Vehicle.objects.filter(license_plate=license_plate)
+    if not user.is_staff:
+        queryset = queryset.filter(owner_filter(user))
+    vehicle = await queryset.afirst()
+    if vehicle is None:
+        return JsonResponse({"error": "Veículo não encontrado."}, status=404)
+    return JsonResponse(VehicleSerializer(vehicle).data)